@@ -0,0 +1,128 @@
+"""
+Signal 626 - Multi-pattern alias matcher
+=========================================
+
+Aho-Corasick automaton over a table of place aliases (country and region
+names). It is built once at import time by the geocoders and finds every
+alias occurring in a location string in a single left-to-right pass, so the
+cost per record depends on the length of the string, not on how many aliases
+the table holds.
+
+Matching is case-insensitive and on whole words only: "UK" matches
+"Leeds (UK/England)" but not "Ukraine", and "Oman" does not match "Romania".
+"""
+
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class AliasMatcher(Generic[T]):
+    """Compiled matcher mapping aliases to values.
+
+    >>> m = AliasMatcher({'Ireland': 1, 'Northern Ireland': 2})
+    >>> m.longest('Belfast, Northern Ireland')
+    ('Northern Ireland', 2)
+    """
+
+    def __init__(self, aliases: Dict[str, T]):
+        self._aliases: List[str] = []
+        self._values: List[T] = []
+        self._lengths: List[int] = []
+
+        # Trie as parallel lists indexed by state number
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [-1]   # alias id ending exactly at this state
+        self._link: List[int] = [0]   # next state on the fail chain with an output
+
+        for alias, value in aliases.items():
+            key = alias.strip().lower()
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(-1)
+                    self._link.append(0)
+                state = nxt
+            if self._out[state] == -1:
+                self._out[state] = len(self._aliases)
+                self._aliases.append(alias)
+                self._values.append(value)
+                self._lengths.append(len(key))
+
+        self._build_links()
+
+    def _build_links(self):
+        """Breadth-first pass computing failure and output links."""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                fail = self._fail[nxt]
+                self._link[nxt] = fail if self._out[fail] != -1 else self._link[fail]
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def find_all(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """Yield (start, end, alias_id) for every whole-word alias in text."""
+        if not text:
+            return
+        lowered = text.lower()
+        goto, fail, out, link, lengths = (
+            self._goto, self._fail, self._out, self._link, self._lengths
+        )
+        n = len(lowered)
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not state:
+                continue
+
+            end = i + 1
+            if end < n and _is_word_char(lowered[end]):
+                continue
+
+            hit = state if out[state] != -1 else link[state]
+            while hit:
+                alias_id = out[hit]
+                start = end - lengths[alias_id]
+                if start == 0 or not _is_word_char(lowered[start - 1]):
+                    yield start, end, alias_id
+                hit = link[hit]
+
+    def longest(self, text: str) -> Optional[Tuple[str, T]]:
+        """Return (alias, value) of the longest alias in text, or None.
+
+        Ties go to the alias that appears first.
+        """
+        best_id = -1
+        best_len = 0
+        for _start, end, alias_id in self.find_all(text):
+            length = self._lengths[alias_id]
+            if length > best_len:
+                best_id, best_len = alias_id, length
+        if best_id == -1:
+            return None
+        return self._aliases[best_id], self._values[best_id]
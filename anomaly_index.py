@@ -0,0 +1,233 @@
+"""
+Signal 626 - Batch anomaly index
+=================================
+
+Precomputes the Global Anomaly Index (src/lib/anomalyIndex.ts) for every
+(year, shape) pair in one vectorized pass, into the sighting_anomaly table:
+
+    year           occurrence year
+    shape          reported shape, 'All' for every shape, '' when missing
+    count          geocoded sightings in the year (of that shape)
+    anomaly_index  0-100 composite
+    status         LOW / ELEVATED / HIGH / CRITICAL
+    delta          year-over-year change, %
+    hotspot_lat    mean position of the densest 5 deg cell
+    hotspot_lng
+
+The inputs are the ones the panel passes to computeAnomalyIndex: the count
+for the year's (shape-filtered) points, the all-shape year series for the
+median and previous year, and the points themselves for the hotspot. So a
+stored row matches what the browser would compute, and the panel can look it
+up instead of sorting the series and gridding the year's points on every
+year change.
+
+Everything is array arithmetic: the median comes from the sorted year
+counts, and the densest cell per (year, shape) from one np.unique /
+np.bincount over combined (group, cell) ids. The median depends on every
+year, so each run recomputes all pairs; only rows whose values changed are
+written, and pairs that no longer occur are deleted.
+
+Usage:
+    python anomaly_index.py
+    python anomaly_index.py --dry-run
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from rollup_stats import utc_now
+from sighting_points import Points, load_points
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+ANOMALY_TABLE = 'sighting_anomaly'
+ALL_SHAPES = 'All'
+GRID_SIZE = 5  # degrees, as in anomalyIndex.ts
+GRID_ROWS = 180 // GRID_SIZE + 1
+GRID_COLS = 360 // GRID_SIZE + 1
+VALUE_COLUMNS = ('count', 'anomaly_index', 'status', 'delta', 'hotspot_lat', 'hotspot_lng')
+
+
+def js_round(x: np.ndarray, digits: int = 1) -> np.ndarray:
+    """Math.round(x * 10 ** digits) / 10 ** digits (halves round up, unlike np.round)."""
+    scale = 10 ** digits
+    return np.floor(np.asarray(x, dtype=np.float64) * scale + 0.5) / scale
+
+
+def anomaly_status(index: np.ndarray) -> np.ndarray:
+    return np.select([index >= 75, index >= 50, index >= 25], ['CRITICAL', 'HIGH', 'ELEVATED'], 'LOW')
+
+
+def hotspots(groups: np.ndarray, lat: np.ndarray, lng: np.ndarray,
+             n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Densest 5 deg cell per group: (points in it, mean lat, mean lng).
+
+    Ties go to the cell whose first point comes first, like the insertion
+    order of the grid object in anomalyIndex.ts.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    row = np.floor(lat / GRID_SIZE).astype(np.int64) + GRID_ROWS // 2
+    col = np.floor(lng / GRID_SIZE).astype(np.int64) + GRID_COLS // 2
+    keys, first, inverse = np.unique((groups * GRID_ROWS + row) * GRID_COLS + col,
+                                     return_index=True, return_inverse=True)
+    counts = np.bincount(inverse)
+    sum_lat = np.bincount(inverse, weights=lat)
+    sum_lng = np.bincount(inverse, weights=lng)
+
+    cell_group = keys // (GRID_ROWS * GRID_COLS)
+    order = np.lexsort((first, -counts, cell_group))
+    best = order[np.r_[True, cell_group[order][1:] != cell_group[order][:-1]]]
+
+    max_cell = np.zeros(n_groups, dtype=np.int64)
+    hot_lat = np.full(n_groups, np.nan)
+    hot_lng = np.full(n_groups, np.nan)
+    max_cell[cell_group[best]] = counts[best]
+    hot_lat[cell_group[best]] = sum_lat[best] / counts[best]
+    hot_lng[cell_group[best]] = sum_lng[best] / counts[best]
+    return max_cell, hot_lat, hot_lng
+
+
+def compute_anomaly(points: Points) -> List[dict]:
+    """One row per (year, shape) present in points, plus (year, 'All')."""
+    if not len(points):
+        return []
+    years, year_idx = np.unique(points.year.astype(np.int64), return_inverse=True)
+    shapes, shape_idx = np.unique(points.shape.astype(str), return_inverse=True)
+    n_shapes = len(shapes) + 1  # slot 0 is 'All'
+
+    # Each point counts towards its year's 'All' group and its shape's group
+    groups = np.concatenate([year_idx * n_shapes, year_idx * n_shapes + shape_idx + 1])
+    lat = np.concatenate([points.lat, points.lat])
+    lng = np.concatenate([points.lng, points.lng])
+    n_groups = len(years) * n_shapes
+    count = np.bincount(groups, minlength=n_groups)
+    max_cell, hot_lat, hot_lng = hotspots(groups, lat, lng, n_groups)
+
+    # The historical series is always the all-shape year counts
+    year_counts = count[::n_shapes]
+    median = max(int(np.sort(year_counts)[len(year_counts) // 2]), 1)
+    prev_pos = np.searchsorted(years, years - 1)
+    has_prev = (prev_pos < len(years)) & (years[np.minimum(prev_pos, len(years) - 1)] == years - 1)
+    prev_count = np.where(has_prev, year_counts[np.minimum(prev_pos, len(years) - 1)], 0)
+
+    group_year = np.repeat(np.arange(len(years)), n_shapes)
+    prev = prev_count[group_year].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.where(prev > 0, (count - prev) / prev * 100, 0.0)
+        cluster_score = np.where(count > 0, max_cell / count, 0.0)
+
+    # Composite, weights spike 35% / magnitude 40% / clustering 25%
+    raw = (np.minimum(np.abs(delta) / 100, 1) * 35
+           + np.minimum(count / median / 3, 1) * 40
+           + np.minimum(cluster_score * 4, 1) * 25)
+    index = np.minimum(js_round(raw), 100)
+    status = anomaly_status(index)
+    delta = js_round(delta)
+
+    labels = [ALL_SHAPES] + shapes.tolist()
+    now = utc_now()
+    rows = []
+    for g in np.flatnonzero(count):
+        rows.append({
+            'year': int(years[g // n_shapes]),
+            'shape': labels[g % n_shapes],
+            'count': int(count[g]),
+            'anomaly_index': float(index[g]),
+            'status': str(status[g]),
+            'delta': float(delta[g]),
+            'hotspot_lat': round(float(hot_lat[g]), 5),
+            'hotspot_lng': round(float(hot_lng[g]), 5),
+            'updated_at': now,
+        })
+    return rows
+
+
+def existing_rows(client: Client) -> Dict[Tuple[int, str], dict]:
+    rows, offset = {}, 0
+    while True:
+        result = (client.table(ANOMALY_TABLE).select('year, shape, ' + ', '.join(VALUE_COLUMNS))
+                  .order('year').order('shape').range(offset, offset + 999).execute())
+        rows.update(((r['year'], r['shape']), r) for r in result.data)
+        if len(result.data) < 1000:
+            return rows
+        offset += 1000
+
+
+def write_anomaly(client: Client, rows: List[dict], batch_size: int = 1000) -> Tuple[int, int]:
+    """Upsert rows whose values changed and delete pairs that no longer occur.
+
+    Returns (rows upserted, rows deleted).
+    """
+    old = existing_rows(client)
+    changed = [r for r in rows
+               if any(old.get((r['year'], r['shape']), {}).get(c) != r[c] for c in VALUE_COLUMNS)]
+    for i in range(0, len(changed), batch_size):
+        client.table(ANOMALY_TABLE).upsert(changed[i:i + batch_size], on_conflict='year,shape').execute()
+
+    current = {(r['year'], r['shape']) for r in rows}
+    stale: Dict[int, List[str]] = {}
+    for year, shape in old:
+        if (year, shape) not in current:
+            stale.setdefault(year, []).append(shape)
+    for year, shapes in stale.items():
+        client.table(ANOMALY_TABLE).delete().eq('year', year).in_('shape', shapes).execute()
+    return len(changed), sum(len(s) for s in stale.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the anomaly index for every (year, shape)')
+    parser.add_argument('--dry-run', action='store_true', help='Compute and print, no writes')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Signal 626 - Anomaly Index")
+    logger.info("=" * 60)
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    start = time.time()
+    points = load_points(client, workers=args.fetch_workers, columns='id, latitude, longitude, occurred, shape')
+    compute_start = time.perf_counter()
+    rows = compute_anomaly(points)
+    compute_seconds = time.perf_counter() - compute_start
+
+    upserted = deleted = 0
+    if not args.dry_run:
+        upserted, deleted = write_anomaly(client, rows)
+
+    overall = [r for r in rows if r['shape'] == ALL_SHAPES]
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE! ({time.time() - start:.1f}s, computing {compute_seconds:.2f}s)")
+    logger.info(f"  Points: {len(points):,}")
+    logger.info(f"  Rows: {len(rows):,} (year, shape) pairs over {len(overall)} years")
+    if not args.dry_run:
+        logger.info(f"  Written: {upserted:,} changed, {deleted:,} stale removed")
+    logger.info("  Highest years:")
+    for r in sorted(overall, key=lambda r: -r['anomaly_index'])[:10]:
+        logger.info(f"    {r['year']}  {r['anomaly_index']:5.1f} {r['status']:<9} "
+                    f"{r['delta']:+7.1f}%  ({r['hotspot_lat']:.2f}, {r['hotspot_lng']:.2f})")
+    logger.info("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
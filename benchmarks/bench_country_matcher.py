@@ -0,0 +1,90 @@
+"""
+Signal 626 - Country matcher benchmark
+======================================
+
+Compares the compiled AliasMatcher against the old per-alias substring loop
+while the alias table grows from the real country list to thousands of
+entries. Per-record cost of the matcher should stay flat; the loop grows
+linearly with the table.
+
+Usage:
+    python benchmarks/bench_country_matcher.py
+    python benchmarks/bench_country_matcher.py --records 20000 --sizes 150,1000,5000
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alias_matcher import AliasMatcher  # noqa: E402
+from gazetteer import COUNTRY_COORDS  # noqa: E402
+
+SAMPLE_LOCATIONS = [
+    'Phoenix, AZ, USA', 'Leeds (UK/England), , ', 'Belfast, , Northern Ireland',
+    'Santo Domingo, , Dominican Republic', 'Toronto, ON, Canada',
+    'Kyiv, , Ukraine', 'Bucharest, , Romania', 'Somewhere over the ocean, ,',
+    'Perth (Western Australia), , Australia', 'Mexico City, , Mexico',
+]
+
+
+def synthetic_aliases(count: int, rng: random.Random) -> dict:
+    """Real country table padded with random pseudo-place names."""
+    aliases = dict(COUNTRY_COORDS)
+    while len(aliases) < count:
+        words = rng.randint(1, 3)
+        name = ' '.join(
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))).capitalize()
+            for _ in range(words)
+        )
+        aliases[name] = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+    return aliases
+
+
+def naive_match(aliases: dict, text: str):
+    lowered = text.lower()
+    for cname, coords in aliases.items():
+        if cname.lower() in lowered:
+            return cname, coords
+    return None
+
+
+def time_per_record(fn, texts) -> float:
+    start = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark country alias matching')
+    parser.add_argument('--records', type=int, default=10000, help='Location strings per run')
+    parser.add_argument('--sizes', type=str, default='150,500,1000,2500,5000',
+                        help='Comma-separated alias table sizes')
+    parser.add_argument('--seed', type=int, default=626)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [rng.choice(SAMPLE_LOCATIONS) for _ in range(args.records)]
+
+    print(f"{'aliases':>8} | {'build ms':>9} | {'matcher us/rec':>14} | {'loop us/rec':>11}")
+    print('-' * 52)
+    for size in (int(s) for s in args.sizes.split(',')):
+        aliases = synthetic_aliases(size, rng)
+
+        start = time.perf_counter()
+        matcher = AliasMatcher(aliases)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        matcher_us = time_per_record(matcher.longest, texts)
+        loop_us = time_per_record(lambda t: naive_match(aliases, t), texts)
+        print(f"{len(aliases):>8} | {build_ms:>9.1f} | {matcher_us:>14.2f} | {loop_us:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
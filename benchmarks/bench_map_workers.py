@@ -0,0 +1,67 @@
+"""
+Signal 626 - Importer mapping benchmark
+=======================================
+
+Times the Hugging Face importer's mapping stage (map_row over every row) on
+the seeded corpus from bench_parsers.py, in the main process and through
+map_parallel with 2, 4 and 8 worker processes, ordered and unordered.
+Throughput should scale with cores until the parent, which chunks the rows
+and pickles them to the workers, becomes the limit.
+
+Usage:
+    python benchmarks/bench_map_workers.py
+    python benchmarks/bench_map_workers.py --records 150000 --workers 1,2,4,8,16
+"""
+
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_parsers import hf_row_corpus  # noqa: E402
+from import_huggingface import MAP_CHUNK, chunked, map_chunk, map_parallel  # noqa: E402
+
+
+def run(rows: list, workers: int, chunk_size: int, ordered: bool) -> tuple:
+    """Map every row; returns (seconds, records mapped)."""
+    start = time.perf_counter()
+    if workers > 1:
+        chunks = map_parallel(iter(rows), workers, chunk_size=chunk_size, ordered=ordered)
+    else:
+        chunks = (map_chunk(chunk) for chunk in chunked(rows, chunk_size))
+    mapped = sum(len(tuples) for _, tuples in chunks)
+    return time.perf_counter() - start, mapped
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark process-pool record mapping')
+    parser.add_argument('--records', type=int, default=60000, help='Corpus size')
+    parser.add_argument('--workers', type=str, default='1,2,4,8', help='Comma-separated worker counts')
+    parser.add_argument('--chunk', type=int, default=MAP_CHUNK, help='Rows per worker task')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes (best is reported)')
+    parser.add_argument('--seed', type=int, default=626)
+    args = parser.parse_args()
+
+    rows = hf_row_corpus(args.records, random.Random(args.seed))
+    print(f"{args.records:,} rows, {os.cpu_count()} CPUs, {args.chunk} rows per task")
+
+    print(f"{'workers':>7} | {'order':>9} | {'rec/s':>10} | {'speedup':>7}")
+    print('-' * 43)
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(',')):
+        for ordered in ((True,) if workers <= 1 else (True, False)):
+            best, mapped = min(run(rows, workers, args.chunk, ordered) for _ in range(args.repeat))
+            rate = mapped / best
+            baseline = baseline or rate
+            print(f"{workers:>7} | {'ordered' if ordered else 'unordered':>9} | {rate:>10,.0f} | "
+                  f"{rate / baseline:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""
+Signal 626 - Parser micro-benchmarks
+====================================
+
+Times the per-record hot paths of the pipeline scripts on a synthetic,
+seeded corpus of NUFORC-style input:
+
+    fast_geocode.parse_location          "City, ST, USA", "City (UK/England), , ",
+    geocode_remaining.parse_location     parenthetical notes, typos, junk
+    import_huggingface.parse_datetime    mixed date formats and timezone suffixes
+    import_huggingface._map_record       Hugging Face dataset rows
+    firecrawl_scraper_v2.parse_markdown  rendered sighting pages
+
+For each it reports records/sec (best of --repeat timed passes) and, from a
+separate pass under tracemalloc, the peak traced memory and the number of
+memory blocks the pass allocated: the difference between tracemalloc
+snapshots taken before and after it, with every result kept alive, so it
+counts what the parser's outputs and caches hold (temporaries show up in the
+peak instead).
+
+Results are compared against a baseline stored with --save-baseline; a
+throughput drop or memory growth beyond --threshold is flagged and the
+script exits non-zero. Throughput depends on the machine, so the baseline is
+not committed: a run without one exits non-zero rather than passing
+vacuously.
+
+Usage:
+    python benchmarks/bench_parsers.py --save-baseline     # on this machine, before a change
+    python benchmarks/bench_parsers.py                     # compare to baseline
+    python benchmarks/bench_parsers.py --records 50000 --only parse_location
+"""
+
+import gc
+import json
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gazetteer import CA_CITIES, COUNTRY_COORDS, INTL_CITIES, US_CITIES  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsers_baseline.json')
+
+SHAPES = ['Light', 'Circle', 'Triangle', 'Fireball', 'Sphere', 'Disk', 'Orb', 'Cigar', 'Unknown', 'Other']
+TIMEZONES = ['', ' Local', ' Pacific', ' Eastern', ' Central', ' Mountain', ' UTC']
+NOTES = ['near', 'outside', 'north of', 'on I-95', 'approx', 'rural area', 'over lake']
+UK_REGIONS = ['England', 'Scotland', 'Wales', 'Northern Ireland']
+JUNK = ['', ', ,', ', , ', 'Unspecified', ', , Unspecified', '???, , ', 'In flight, , ']
+
+
+# -- corpus -------------------------------------------------------------
+
+def _typo(name: str, rng: random.Random) -> str:
+    i = rng.randrange(1, max(2, len(name) - 1))
+    return name[:i] + name[i + 1:]
+
+
+def _town(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10))).capitalize()
+
+
+def location_corpus(count: int, rng: random.Random) -> list:
+    """Realistic mix of NUFORC location strings."""
+    us = list(US_CITIES)
+    ca = list(CA_CITIES)
+    intl = list(INTL_CITIES)
+    countries = list(COUNTRY_COORDS)
+    out = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.45:
+            city, state = rng.choice(us)
+            out.append(f"{city}, {state}, USA")
+        elif kind < 0.55:
+            city, state = rng.choice(us)
+            out.append(f"{_town(rng)}, {state}, USA")
+        elif kind < 0.62:
+            city, state = rng.choice(us)
+            out.append(f"{city} ({rng.choice(NOTES)}), {state}, USA")
+        elif kind < 0.67:
+            city, prov = rng.choice(ca)
+            out.append(f"{city}, {prov}, Canada")
+        elif kind < 0.75:
+            out.append(f"{rng.choice(intl)} (UK/{rng.choice(UK_REGIONS)}), , ")
+        elif kind < 0.83:
+            out.append(f"{rng.choice(intl)}, , {rng.choice(countries)}")
+        elif kind < 0.88:
+            out.append(f"{_typo(rng.choice(intl), rng)}, , ")
+        elif kind < 0.94:
+            out.append(f"{_town(rng)}, , {rng.choice(countries)}")
+        else:
+            out.append(rng.choice(JUNK))
+    return out
+
+
+def datetime_corpus(count: int, rng: random.Random) -> list:
+    out = []
+    for _ in range(count):
+        y, m, d = rng.randint(1950, 2025), rng.randint(1, 12), rng.randint(1, 28)
+        hh, mm = rng.randint(0, 23), rng.randint(0, 59)
+        fmt = rng.random()
+        if fmt < 0.4:
+            raw = f"{y}-{m:02d}-{d:02d} {hh:02d}:{mm:02d}:00"
+        elif fmt < 0.6:
+            raw = f"{y}-{m:02d}-{d:02d} {hh:02d}:{mm:02d}"
+        elif fmt < 0.8:
+            raw = f"{m}/{d}/{y} {hh:02d}:{mm:02d}"
+        elif fmt < 0.95:
+            raw = f"{m}/{d}/{y}"
+        else:
+            raw = rng.choice(['', 'unknown', 'sometime in the 80s'])
+        out.append(raw + (rng.choice(TIMEZONES) if raw else ''))
+    return out
+
+
+def _text(rng: random.Random, words: int) -> str:
+    vocab = ['bright', 'light', 'moving', 'slowly', 'red', 'white', 'orange', 'object', 'sky', 'hovered',
+             'then', 'disappeared', 'color', 'was', 'silent', 'over', 'the', 'trees', 'glow', 'fast']
+    return ' '.join(rng.choice(vocab) for _ in range(words)).capitalize() + '.'
+
+
+def hf_row_corpus(count: int, rng: random.Random) -> list:
+    locations = location_corpus(count, rng)
+    dates = datetime_corpus(count * 2, rng)
+    rows = []
+    for i in range(count):
+        rows.append({
+            'Sighting': 100000 + i,
+            'Occurred': dates[2 * i],
+            'Reported': dates[2 * i + 1],
+            'Duration': f"{rng.randint(1, 30)} minutes",
+            'No of observers': str(rng.randint(1, 5)),
+            'Location': locations[i],
+            'Shape': rng.choice(SHAPES),
+            'Characteristics': rng.sample(['Lights on object', 'Aura or haze', 'Left a trail', 'Changed color'],
+                                          rng.randint(0, 2)),
+            'Summary': _text(rng, 8),
+            'Text': _text(rng, rng.randint(20, 120)),
+        })
+    return rows
+
+
+def markdown_corpus(count: int, rng: random.Random) -> list:
+    locations = location_corpus(count, rng)
+    dates = datetime_corpus(count, rng)
+    pages = []
+    for i in range(count):
+        pages.append((200000 + i, (
+            "[Skip to content](#main)\n\n# NUFORC Sighting {id}\n\n"
+            "**Occurred:** {occurred}\n\n**Reported:** {reported}\n\n**Duration:** {duration}\n\n"
+            "**No of observers:** {observers}\n\n**Location:** {location}\n\n"
+            "**Location details:** {details}\n\n**Shape:** {shape}\n\n**Color:** {color}\n\n"
+            "**Estimated Size:** Large\n\n**Viewed From:** Outdoors\n\n"
+            "**Direction from Viewer:** North\n\n**Angle of Elevation:** 45\n\n"
+            "**Closest Distance:** Unknown\n\n**Estimated Speed:** Slow\n\n"
+            "**Characteristics:** Lights on object\n\n{summary}\n\n_Posted 2024-01-01_\n\n"
+            "[Scroll to top](#top)\n"
+        ).format(
+            id=200000 + i, occurred=dates[i] or '2020-01-01 21:00', reported='2020-01-02 10:00',
+            duration=f"{rng.randint(1, 30)} minutes", observers=rng.randint(1, 5),
+            location=locations[i] or 'Phoenix, AZ, USA', details=rng.choice(NOTES), shape=rng.choice(SHAPES),
+            color=rng.choice(['Red', 'White', 'Orange', 'Unknown']), summary=_text(rng, rng.randint(20, 120)),
+        )))
+    return pages
+
+
+# -- runner -------------------------------------------------------------
+
+def load_targets():
+    """Return [(name, fn(item), corpus builder)], skipping modules whose dependencies are missing."""
+    targets, skipped = [], []
+
+    import fast_geocode
+    import geocode_remaining
+    targets.append(('fast_geocode.parse_location', fast_geocode.parse_location, location_corpus))
+    targets.append(('geocode_remaining.parse_location', geocode_remaining.parse_location, location_corpus))
+
+    try:
+        import import_huggingface
+        importer = import_huggingface.HuggingFaceImporter.__new__(import_huggingface.HuggingFaceImporter)
+        targets.append(('import_huggingface.parse_datetime', import_huggingface.parse_datetime, datetime_corpus))
+        targets.append(('import_huggingface._map_record', importer._map_record, hf_row_corpus))
+    except ImportError as e:
+        skipped.append(('import_huggingface', str(e)))
+
+    try:
+        import firecrawl_scraper_v2
+        targets.append(('firecrawl_scraper_v2.parse_markdown',
+                        lambda page: firecrawl_scraper_v2.parse_markdown(*page), markdown_corpus))
+    except ImportError as e:
+        skipped.append(('firecrawl_scraper_v2', str(e)))
+
+    return targets, skipped
+
+
+def allocated_blocks(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> int:
+    """Blocks allocated between two snapshots and still alive at the second."""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]  # the snapshots themselves
+    after = after.filter_traces(ignore)
+    return sum(max(stat.count_diff, 0) for stat in after.compare_to(before.filter_traces(ignore), 'lineno'))
+
+
+def measure(fn, corpus: list, repeat: int) -> dict:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for item in corpus:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    outputs = [None] * len(corpus)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i, item in enumerate(corpus):
+        outputs[i] = fn(item)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = allocated_blocks(before, after)
+    del outputs
+
+    return {
+        'records_per_sec': round(len(corpus) / best, 1),
+        'us_per_record': round(1e6 * best / len(corpus), 3),
+        'peak_kib': round(peak / 1024, 1),
+        'alloc_blocks': blocks,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return regression messages for results worse than baseline by more than threshold."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if r['records_per_sec'] < base['records_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {r['records_per_sec']:,.0f} rec/s vs baseline "
+                               f"{base['records_per_sec']:,.0f} ({r['records_per_sec'] / base['records_per_sec'] - 1:+.1%})")
+        if base['peak_kib'] and r['peak_kib'] > base['peak_kib'] * (1 + threshold) + 64:
+            regressions.append(f"{name}: peak {r['peak_kib']:,.0f} KiB vs baseline {base['peak_kib']:,.0f} KiB")
+        base_blocks = base.get('alloc_blocks')
+        if base_blocks is not None and r['alloc_blocks'] > base_blocks * (1 + threshold) + 100:
+            regressions.append(f"{name}: {r['alloc_blocks']:,} allocated blocks vs baseline {base_blocks:,}")
+    return regressions
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the per-record parsers')
+    parser.add_argument('--records', type=int, default=20000, help='Corpus size per benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes (best is reported)')
+    parser.add_argument('--seed', type=int, default=626)
+    parser.add_argument('--only', type=str, default=None, help='Run benchmarks whose name contains this')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Allowed fractional slowdown / memory growth before flagging a regression')
+    args = parser.parse_args()
+
+    targets, skipped = load_targets()
+    for module, reason in skipped:
+        print(f"skipped {module}: {reason}")
+
+    results = {}
+    print(f"{'benchmark':<38} | {'rec/s':>10} | {'us/rec':>8} | {'peak KiB':>9} | {'blocks':>8}")
+    print('-' * 86)
+    for name, fn, build in targets:
+        if args.only and args.only not in name:
+            continue
+        corpus = build(args.records, random.Random(args.seed))
+        r = measure(fn, corpus, args.repeat)
+        results[name] = r
+        print(f"{name:<38} | {r['records_per_sec']:>10,.0f} | {r['us_per_record']:>8.2f} | "
+              f"{r['peak_kib']:>9,.1f} | {r['alloc_blocks']:>8,}")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}: run with --save-baseline first")
+        sys.exit(2)
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nREGRESSIONS (threshold {args.threshold:.0%}):")
+        for msg in regressions:
+            print(f"  {msg}")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Signal 626 - Geocoding checkpoint
+==================================
+
+Resume state for fast_geocode.py / geocode_remaining.py, kept in a small JSON
+file:
+
+    high_water     every record with id <= high_water has been resolved and
+                   its coordinates are committed
+    unresolvable   location strings no tier could resolve
+    failed         pages (lo, hi] with rows the writer gave up on
+
+Pages of the table scan finish out of order (several id ranges are fetched
+at once and writes complete asynchronously), so the high-water mark only
+advances over the contiguous prefix of pages whose rows are all committed.
+After a crash, --resume restarts the scan just above it and loses at most
+the pages that were still in flight. A page with a rejected row (e.g. after
+retries ran out during an outage) never counts as committed, so the
+high-water mark stays below it and --resume scans it again.
+
+The file is replaced atomically (write to a temp file, then os.replace), so
+a crash mid-save leaves the previous checkpoint intact.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geocode_checkpoint.json')
+
+
+class Checkpoint:
+    """High-water mark over committed pages plus known-unresolvable strings."""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, save_interval: float = 1.0):
+        self.path = path
+        self.save_interval = save_interval
+        self.high_water: Optional[int] = None
+        self.unresolvable: Set[str] = set()
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.done: Dict[int, int] = {}        # lo -> hi of committed pages above high_water
+        self.failed: Dict[int, int] = {}      # lo -> hi of pages with rejected rows
+        self.pages: Dict[int, list] = {}      # lo -> [hi, rows still being written, any rejected]
+        self.row_page: Dict[int, int] = {}    # id -> lo of its page
+        self.last_save = 0.0
+
+    def load(self) -> bool:
+        """Read the checkpoint file. Returns False if there is none."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.high_water = data.get('high_water')
+        self.unresolvable = set(data.get('unresolvable', []))
+        self.failed = {lo: hi for lo, hi in data.get('failed', [])}
+        return True
+
+    def save(self):
+        with self.save_lock:
+            with self.lock:
+                data = {
+                    'high_water': self.high_water,
+                    'unresolvable': sorted(self.unresolvable),
+                    'failed': sorted([lo, hi] for lo, hi in self.failed.items()),
+                    'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                self.last_save = time.monotonic()
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+    def start(self, high_water: int):
+        """Begin tracking a scan whose first page starts just above high_water."""
+        with self.lock:
+            self.high_water = high_water
+            self.done.clear()
+            self.failed.clear()
+            self.pages.clear()
+            self.row_page.clear()
+
+    def add_unresolvable(self, locations: Iterable[str]):
+        with self.lock:
+            self.unresolvable.update(locations)
+
+    def begin_page(self, lo: int, hi: int, pending_ids: Iterable[int]):
+        """Register page (lo, hi] whose rows pending_ids are about to be written."""
+        with self.lock:
+            ids = list(pending_ids)
+            if not ids:
+                self._page_done(lo, hi)
+            else:
+                self.pages[lo] = [hi, len(ids), False]
+                for i in ids:
+                    self.row_page[i] = lo
+        self._maybe_save()
+
+    def rows_done(self, rows: list):
+        """Mark rows as committed; called from writer threads."""
+        self._settle(rows, rejected=False)
+
+    def rows_failed(self, rows: list):
+        """Mark rows the writer gave up on: their pages stay below the high-water mark."""
+        self._settle(rows, rejected=True)
+
+    def failed_pages(self) -> List[Tuple[int, int]]:
+        with self.lock:
+            return sorted(self.failed.items())
+
+    def _settle(self, rows: list, rejected: bool):
+        with self.lock:
+            for row in rows:
+                lo = self.row_page.pop(row['id'], None)
+                if lo is None:
+                    continue
+                page = self.pages[lo]
+                page[1] -= 1
+                page[2] = page[2] or rejected
+                if page[1] == 0:
+                    del self.pages[lo]
+                    if page[2]:
+                        self.failed[lo] = page[0]
+                    else:
+                        self._page_done(lo, page[0])
+        self._maybe_save()
+
+    def _page_done(self, lo: int, hi: int):
+        self.done[lo] = hi
+        while self.high_water in self.done:
+            self.high_water = self.done.pop(self.high_water)
+
+    def _maybe_save(self):
+        if time.monotonic() - self.last_save >= self.save_interval:
+            self.save()
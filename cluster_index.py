@@ -0,0 +1,213 @@
+"""
+Signal 626 - Offline cluster index
+===================================
+
+Precomputes the map's cluster hierarchy for every year, so clusters for a
+viewport can be served without touching the raw points (see
+/api/clusters). The map currently re-clusters in the browser each time a
+year loads.
+
+Clustering follows supercluster's parameters (radius 60 px at a 512 px tile
+extent, matching CLUSTER_RADIUS), but uses a grid instead of a KD-tree
+greedy pass. At each zoom from 16 down to 0, the previous level's clusters
+are bucketed into cells of one cluster radius in Web Mercator space and
+merged per cell with np.unique / np.bincount (count-weighted centers). That
+costs one sort per level, and the whole table builds in seconds.
+
+Each zoom level is stored as columns sorted by latitude, so a viewport query
+is a binary search on lat and a filter on lng:
+
+    lng, lat   float32   count-weighted center
+    count      uint32    points in the cluster
+    parent     uint32    index of the enclosing cluster one zoom out
+                         (0xFFFFFFFF at zoom 0)
+    id         uint32    sighting id when count == 1, else 0
+    expand     uint8     zoom at which the cluster first splits (17 for a
+                         single point), for click-to-zoom
+
+public/clusters/{year}.bin holds one gzip member per zoom, and manifest.json
+records their byte offsets. As with the point packs, --changed rebuilds only
+the years whose rollup was refreshed since their last build.
+
+Usage:
+    python cluster_index.py                  # every year
+    python cluster_index.py --changed
+    python cluster_index.py --years 2014
+"""
+
+import argparse
+import gzip
+import hashlib
+import logging
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from sighting_points import load_points, split_years
+from static_artifacts import build_years, changed_since_build, load_manifest
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLUSTER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'clusters')
+INDEX_VERSION = 1
+DEFAULT_RADIUS = 60   # px, CLUSTER_RADIUS in src/lib/constants.ts
+EXTENT = 512
+MAX_ZOOM = 16
+NO_PARENT = 0xFFFFFFFF
+CLUSTER_COLUMNS = [('lng', '<f4'), ('lat', '<f4'), ('count', '<u4'), ('parent', '<u4'), ('id', '<u4'),
+                   ('expand', 'u1')]
+
+
+class Level(NamedTuple):
+    """One zoom level; x, y are Web Mercator in [0, 1]."""
+    x: np.ndarray
+    y: np.ndarray
+    count: np.ndarray
+    parent: np.ndarray
+    id: np.ndarray
+    expand: np.ndarray
+
+
+def mercator(lat: np.ndarray, lng: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -85.05112878, 85.05112878)
+    x = np.asarray(lng, dtype=np.float64) / 360.0 + 0.5
+    s = np.sin(np.radians(lat))
+    y = 0.5 - 0.25 * np.log((1 + s) / (1 - s)) / np.pi
+    return np.clip(x, 0.0, 1.0), np.clip(y, 0.0, 1.0)
+
+
+def unmercator(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    lat = np.degrees(2 * np.arctan(np.exp((0.5 - y) * 2 * np.pi)) - np.pi / 2)
+    return lat, (x - 0.5) * 360.0
+
+
+def build_levels(lat: np.ndarray, lng: np.ndarray, ids: np.ndarray, radius: float = DEFAULT_RADIUS,
+                 extent: int = EXTENT, max_zoom: int = MAX_ZOOM) -> List[Level]:
+    """Cluster hierarchy for one set of points; levels[z] is zoom z."""
+    x, y = mercator(lat, lng)
+    count = np.ones(len(x), dtype=np.int64)
+    point_id = np.asarray(ids, dtype=np.uint32)
+    expand = np.full(len(x), max_zoom + 1, dtype=np.uint8)
+    levels: List[Optional[Level]] = [None] * (max_zoom + 1)
+
+    for z in range(max_zoom, -1, -1):
+        r = radius / (extent * 2 ** z)
+        cells = int(np.ceil(1 / r))
+        cx = np.minimum((x / r).astype(np.int64), cells - 1)
+        cy = np.minimum((y / r).astype(np.int64), cells - 1)
+        _, inverse, children = np.unique(cy * cells + cx, return_inverse=True, return_counts=True)
+
+        total = np.bincount(inverse, weights=count)
+        cluster_x = np.bincount(inverse, weights=x * count) / total
+        cluster_y = np.bincount(inverse, weights=y * count) / total
+        child = np.empty(len(total), dtype=np.int64)
+        child[inverse] = np.arange(len(inverse))  # any child; the only one where children == 1
+        cluster_expand = np.where(children >= 2, z + 1, expand[child]).astype(np.uint8)
+        cluster_id = np.where(total == 1, point_id[child], 0).astype(np.uint32)
+
+        # Store by ascending latitude (descending y) for viewport queries
+        order = np.argsort(-cluster_y, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        if z < max_zoom:
+            levels[z + 1] = levels[z + 1]._replace(parent=rank[inverse].astype(np.uint32))
+
+        x, y = cluster_x[order], cluster_y[order]
+        count = total[order].astype(np.int64)
+        point_id, expand = cluster_id[order], cluster_expand[order]
+        levels[z] = Level(x, y, count.astype(np.uint32), np.full(len(x), NO_PARENT, dtype=np.uint32),
+                          point_id, expand)
+    return levels
+
+
+def encode_level(level: Level) -> bytes:
+    lat, lng = unmercator(level.x, level.y)
+    columns = {'lng': lng, 'lat': lat, 'count': level.count, 'parent': level.parent, 'id': level.id,
+               'expand': level.expand}
+    return b''.join(np.ascontiguousarray(columns[name], dtype=dtype).tobytes() for name, dtype in CLUSTER_COLUMNS)
+
+
+def build_year(lat: np.ndarray, lng: np.ndarray, ids: np.ndarray, radius: float = DEFAULT_RADIUS,
+               level: int = 6) -> Tuple[bytes, dict]:
+    parts, zooms, offset = [], [], 0
+    for zoom in build_levels(lat, lng, ids, radius):
+        data = gzip.compress(encode_level(zoom), compresslevel=level, mtime=0)
+        zooms.append([offset, len(data), len(zoom.x)])
+        parts.append(data)
+        offset += len(data)
+    blob = b''.join(parts)
+    return blob, {'count': len(ids), 'bytes': len(blob), 'sha1': hashlib.sha1(blob).hexdigest(), 'zooms': zooms}
+
+
+def index_manifest(out_dir: str, radius: float) -> dict:
+    return load_manifest(out_dir, INDEX_VERSION, {'radius': radius, 'extent': EXTENT, 'max_zoom': MAX_ZOOM,
+                                                  'columns': [name for name, _ in CLUSTER_COLUMNS]})
+
+
+def build_index(client: Client, out_dir: str = DEFAULT_CLUSTER_DIR, years: Optional[List[int]] = None,
+                radius: float = DEFAULT_RADIUS, workers: int = 4) -> Dict[str, float]:
+    """Build the given years (None = all) and update the manifest."""
+    manifest = index_manifest(out_dir, radius)
+    points = load_points(client, years, workers=workers, columns='id, latitude, longitude, occurred')
+    counts = build_years(out_dir, manifest, split_years(points), years,
+                         lambda pts: build_year(pts.lat, pts.lng, pts.id, radius), 'built_at')
+    counts['points'] = len(points)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute per-year cluster hierarchies (zoom 0-16)')
+    parser.add_argument('--out', type=str, default=DEFAULT_CLUSTER_DIR, help='Output directory')
+    parser.add_argument('--years', type=str, default=None, help='Comma-separated years to build')
+    parser.add_argument('--changed', action='store_true',
+                        help='Only years whose rollup was refreshed since their last build')
+    parser.add_argument('--radius', type=float, default=DEFAULT_RADIUS, help='Cluster radius in pixels')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Signal 626 - Cluster Index")
+    logger.info(f"Output: {args.out} (radius {args.radius:g}px, zoom 0-{MAX_ZOOM})")
+    logger.info("=" * 60)
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    years = None
+    if args.years:
+        years = sorted({int(y) for y in args.years.split(',') if y.strip()})
+    elif args.changed:
+        years = changed_since_build(client, index_manifest(args.out, args.radius), 'built_at')
+        if not years:
+            logger.info("No years changed since the last build")
+            return
+        logger.info(f"Changed years: {', '.join(map(str, years))}")
+
+    start = time.time()
+    counts = build_index(client, args.out, years, radius=args.radius, workers=args.fetch_workers)
+
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE! ({time.time() - start:.1f}s, clustering {counts['seconds']:.2f}s)")
+    logger.info(f"  Points: {counts['points']:,}")
+    logger.info(f"  Years written: {counts['written']} ({counts['unchanged']} unchanged, "
+                f"{counts['removed']} removed)")
+    logger.info(f"  Index size: {counts['bytes'] / 1024:,.0f} KiB")
+    logger.info("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
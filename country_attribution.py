@@ -0,0 +1,349 @@
+"""
+Signal 626 - Country attribution
+=================================
+
+Batch stage run after geocoding: attributes every sighting with coordinates
+to a country by point-in-polygon against the Natural Earth polygons the map
+already ships (public/ne_countries.geojson), and stores the ISO-2 code in the
+indexed country_code column. The country panel can then filter on that code
+instead of bounding boxes plus location-string heuristics.
+
+Polygons are bucketed on a uniform grid (1 degree cells) by bounding box.
+Points are grouped by cell and each candidate polygon is tested with a
+vectorized even-odd ray cast against only the edges that cross the cell's
+latitude band. The 110m polygons smooth away small islands and capes (Key
+West, Nantucket, the Alaska panhandle), so points outside every polygon are
+snapped to the nearest one within --snap degrees; anything further out is
+stored as 'ZZ' (unknown), so incremental runs don't pick it up again.
+
+Countries the app lists (src/lib/countries.ts) that have no 110m polygon
+(Singapore, Malta, Bahrain) are matched by their app bounds instead, ahead
+of both the polygons and snapping, so their points aren't handed to a
+neighbour (Singapore lies inside Malaysia's smoothed outline).
+
+At the end the summary rollups (rollup_stats.py) are refreshed for the years
+of the records whose code changed, so the exports that rebuild from the
+rollup (export_point_packs.py --changed) pick up the new codes.
+
+Usage:
+    python country_attribution.py              # rows with coordinates but no country_code
+    python country_attribution.py --all        # recompute all, write only changes
+    python country_attribution.py --dry-run    # counts per country, no writes
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from rollup_stats import refresh_rollup, year_of
+from table_scanner import TableScanner
+from upsert_writer import DEFAULT_DEAD_LETTER_PATH, BatchWriter
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEOJSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'ne_countries.geojson')
+DEFAULT_COUNTRY_LIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'lib', 'countries.ts')
+GRID_DEGREES = 1.0
+UNKNOWN_CODE = 'ZZ'
+
+# Natural Earth leaves ISO_A2 as -99 for these
+NE_ISO2_FIXES = {'France': 'FR', 'Norway': 'NO', 'Kosovo': 'XK', 'N. Cyprus': 'CY', 'Somaliland': 'SO'}
+
+# { code: 'SG', name: 'Singapore', bounds: [[1.2, 103.6], [1.5, 104.1]], ... }
+_COUNTRY_BOUNDS_RE = re.compile(
+    r"code:\s*'([A-Z]{2})'.*?bounds:\s*\[\[\s*([-\d.]+)\s*,\s*([-\d.]+)\s*\]\s*,"
+    r"\s*\[\s*([-\d.]+)\s*,\s*([-\d.]+)\s*\]\]")
+
+
+def iso2(code: str) -> str:
+    """Normalise a Natural Earth ISO_A2 value ('CN-TW' -> 'TW')."""
+    return code.rsplit('-', 1)[-1] if '-' in code else code
+
+
+def load_country_bounds(path: str = DEFAULT_COUNTRY_LIST) -> Dict[str, Tuple[float, float, float, float]]:
+    """The app's country bounding boxes, code -> (south, west, north, east)."""
+    if not os.path.exists(path):
+        logger.warning(f"No country list at {path}, countries without a polygon can't be matched")
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return {code: tuple(float(v) for v in box) for code, *box in _COUNTRY_BOUNDS_RE.findall(f.read())}
+
+
+class CountryIndex:
+    """Uniform-grid index over country polygons for bulk point-in-polygon."""
+
+    def __init__(self, geojson_path: str = DEFAULT_GEOJSON, cell: float = GRID_DEGREES,
+                 country_list: str = DEFAULT_COUNTRY_LIST):
+        self.cell = cell
+        self.codes: List[str] = []
+        self.boxes: List[Tuple[int, Tuple[float, float, float, float]]] = []  # (country, bounds) without polygons
+        self.part_country: List[int] = []
+        self.part_edges: List[np.ndarray] = []  # (E, 4) x1, y1, x2, y2 over all rings
+        self.grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.band_edges: Dict[Tuple[int, int, int], np.ndarray] = {}
+
+        with open(geojson_path, 'r') as f:
+            features = json.load(f)['features']
+
+        for feature in features:
+            props = feature['properties']
+            code = props.get('ISO_A2')
+            if not code or code == '-99':
+                code = NE_ISO2_FIXES.get(props.get('NAME'))
+            else:
+                code = iso2(code)
+            if not code:
+                continue
+            geometry = feature['geometry']
+            polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+            country = len(self.codes)
+            self.codes.append(code)
+            for rings in polygons:
+                self._add_part(country, rings)
+
+        for code, box in load_country_bounds(country_list).items():
+            if code not in self.codes:
+                self.boxes.append((len(self.codes), box))
+                self.codes.append(code)
+
+    def _add_part(self, country: int, rings: list):
+        edges = []
+        for ring in rings:
+            pts = np.asarray(ring, dtype=np.float64)[:, :2]
+            edges.append(np.hstack([pts[:-1], pts[1:]]))
+        edges = np.vstack(edges)
+        part = len(self.part_edges)
+        self.part_country.append(country)
+        self.part_edges.append(edges)
+
+        xs = np.concatenate([edges[:, 0], edges[:, 2]])
+        ys = np.concatenate([edges[:, 1], edges[:, 3]])
+        for gy in range(self._cell(ys.min()), self._cell(ys.max()) + 1):
+            for gx in range(self._cell(xs.min()), self._cell(xs.max()) + 1):
+                self.grid[(gy, gx)].append(part)
+
+    def _cell(self, value: float) -> int:
+        return int(np.floor(value / self.cell))
+
+    def _edges_for(self, part: int, gy: int, gx: int) -> np.ndarray:
+        """Edges of part that a rightward ray from inside cell (gy, gx) can cross."""
+        key = (part, gy, gx)
+        edges = self.band_edges.get(key)
+        if edges is None:
+            e = self.part_edges[part]
+            lo, hi = gy * self.cell, (gy + 1) * self.cell
+            keep = ((np.maximum(e[:, 1], e[:, 3]) >= lo) & (np.minimum(e[:, 1], e[:, 3]) <= hi)
+                    & (np.maximum(e[:, 0], e[:, 2]) >= gx * self.cell))
+            edges = self.band_edges[key] = e[keep]
+        return edges
+
+    @staticmethod
+    def _inside(edges: np.ndarray, lng: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Even-odd ray cast of many points against one polygon's edges."""
+        inside = np.zeros(len(lng), dtype=bool)
+        if not len(edges):
+            return inside
+        step = max(1, 4_000_000 // len(edges))
+        x1, y1, x2, y2 = (edges[:, i:i + 1] for i in range(4))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for start in range(0, len(lng), step):
+                px, py = lng[start:start + step], lat[start:start + step]
+                straddles = (y1 > py) != (y2 > py)
+                x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+                inside[start:start + step] = (np.count_nonzero(straddles & (px < x_cross), axis=0) & 1) == 1
+        return inside
+
+    def locate(self, lat: np.ndarray, lng: np.ndarray, snap: float = 1.0) -> np.ndarray:
+        """Country index per point (-1 where none)."""
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        result = np.full(len(lat), -1, dtype=np.int32)
+
+        # Countries too small for a 110m polygon own everything in their bounds
+        for country, (south, west, north, east) in self.boxes:
+            result[(lat >= south) & (lat <= north) & (lng >= west) & (lng <= east) & (result < 0)] = country
+
+        # Group points by cell, then test each cell's candidate polygons
+        for (cy, cx), idx in self._groups(lat, lng):
+            for part in self.grid.get((cy, cx), ()):
+                pending = idx[result[idx] < 0]
+                if not len(pending):
+                    break
+                hit = self._inside(self._edges_for(part, cy, cx), lng[pending], lat[pending])
+                result[pending[hit]] = self.part_country[part]
+
+        if snap > 0:
+            self._snap(result, lat, lng, snap)
+        return result
+
+    def _groups(self, lat: np.ndarray, lng: np.ndarray):
+        """Yield (cell, point indices) for the points in each occupied grid cell."""
+        gy = np.floor(lat / self.cell).astype(np.int64)
+        gx = np.floor(lng / self.cell).astype(np.int64)
+        order = np.lexsort((gx, gy))
+        keys = np.stack([gy[order], gx[order]], axis=1)
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+        ends = np.r_[starts[1:], len(order)]
+        for s, e in zip(starts, ends):
+            yield (int(keys[s, 0]), int(keys[s, 1])), order[s:e]
+
+    def _snap(self, result: np.ndarray, lat: np.ndarray, lng: np.ndarray, snap: float):
+        """Give unmatched points the country of the closest edge within snap degrees."""
+        missing = np.flatnonzero(result < 0)
+        if not len(missing):
+            return
+        reach = int(np.ceil(snap / self.cell))
+        cells = ((cell, missing[idx[i:i + 2048]])
+                 for cell, idx in self._groups(lat[missing], lng[missing]) for i in range(0, len(idx), 2048))
+        for (cy, cx), idx in cells:
+            py, px = lat[idx][None, :], lng[idx][None, :]
+            scale = np.maximum(np.cos(np.radians(py)), 0.1)
+            parts = {p for dy in range(-reach, reach + 1) for dx in range(-reach, reach + 1)
+                     for p in self.grid.get((cy + dy, cx + dx), ())}
+            best = np.full(len(idx), snap)
+            for part in sorted(parts):
+                e = self.part_edges[part]
+                near = ((np.maximum(e[:, 1], e[:, 3]) >= cy * self.cell - snap)
+                        & (np.minimum(e[:, 1], e[:, 3]) <= (cy + 1) * self.cell + snap)
+                        & (np.maximum(e[:, 0], e[:, 2]) >= cx * self.cell - snap / 0.1)
+                        & (np.minimum(e[:, 0], e[:, 2]) <= (cx + 1) * self.cell + snap / 0.1))
+                e = e[near]
+                if not len(e):
+                    continue
+                ax, ay = (e[:, 0:1] - px) * scale, e[:, 1:2] - py
+                bx, by = (e[:, 2:3] - px) * scale, e[:, 3:4] - py
+                dx, dy = bx - ax, by - ay
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    t = np.clip(np.nan_to_num(-(ax * dx + ay * dy) / (dx * dx + dy * dy)), 0, 1)
+                dist = np.hypot(ax + t * dx, ay + t * dy).min(axis=0)
+                closer = dist < best
+                best[closer] = dist[closer]
+                result[idx[closer]] = self.part_country[part]
+
+    def country_codes(self, lat: np.ndarray, lng: np.ndarray, snap: float = 1.0) -> List[str]:
+        """ISO-2 code per point (UNKNOWN_CODE outside every polygon)."""
+        codes = np.array(self.codes + [UNKNOWN_CODE], dtype=object)
+        return codes[self.locate(lat, lng, snap)].tolist()
+
+
+def attribute_chunk(index: CountryIndex, rows: list, snap: float, counts: Counter) -> list:
+    """Return country_code upserts for rows whose code changes."""
+    lat = np.fromiter((r['latitude'] for r in rows), dtype=np.float64, count=len(rows))
+    lng = np.fromiter((r['longitude'] for r in rows), dtype=np.float64, count=len(rows))
+    updates = []
+    for r, code in zip(rows, index.country_codes(lat, lng, snap)):
+        counts[code] += 1
+        if r.get('country_code') != code:
+            updates.append({'id': r['id'], 'country_code': code})
+    return updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attribute sightings to countries by point-in-polygon')
+    parser.add_argument('--geojson', type=str, default=DEFAULT_GEOJSON, help='Country polygons (GeoJSON)')
+    parser.add_argument('--country-list', type=str, default=DEFAULT_COUNTRY_LIST,
+                        help="The app's country list; bounds of countries without a polygon are used instead")
+    parser.add_argument('--all', action='store_true', help='Recompute rows that already have a country_code')
+    parser.add_argument('--dry-run', action='store_true', help='Count only, no updates')
+    parser.add_argument('--snap', type=float, default=1.0,
+                        help='Attach points within this many degrees of a border to that country')
+    parser.add_argument('--chunk', type=int, default=20000, help='Points attributed per vectorized pass')
+    parser.add_argument('--batch-size', type=int, default=500, help='Update batch size')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    parser.add_argument('--writers', type=int, default=8, help='Upsert batches in flight at once')
+    parser.add_argument('--dead-letter', type=str, default=DEFAULT_DEAD_LETTER_PATH,
+                        help='JSONL file for rows that fail on their own (with the error text)')
+    parser.add_argument('--skip-rollup', action='store_true',
+                        help='Do not refresh the summary rollups for the years this run changed')
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Signal 626 - Country Attribution")
+    logger.info("=" * 60)
+
+    start = time.time()
+    index = CountryIndex(args.geojson, country_list=args.country_list)
+    logger.info(f"Indexed {len(index.codes)} countries ({len(index.part_edges)} polygons, "
+                f"{len(index.grid)} grid cells, {len(index.boxes)} by bounds) in {time.time() - start:.2f}s")
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    def filters(query):
+        query = query.not_.is_('latitude', 'null').not_.is_('longitude', 'null')
+        if not args.all:
+            query = query.is_('country_code', 'null')
+        return query
+
+    scanner = TableScanner(client, 'id, latitude, longitude, country_code, occurred', filters=filters,
+                           workers=args.fetch_workers)
+    counts = Counter()
+    scanned = changed = 0
+    touched_years = set()
+    attribute_seconds = 0.0
+    writer = None if args.dry_run else BatchWriter(client, batch_size=args.batch_size, in_flight=args.writers,
+                                                   dead_letter=args.dead_letter)
+
+    def process(rows):
+        nonlocal changed, attribute_seconds
+        t = time.perf_counter()
+        updates = attribute_chunk(index, rows, args.snap, counts)
+        attribute_seconds += time.perf_counter() - t
+        changed += len(updates)
+        updated = {u['id'] for u in updates}
+        touched_years.update(year_of(r.get('occurred')) for r in rows if r['id'] in updated)
+        if writer:
+            writer.add_many(updates)
+        logger.info(f"  Attributed {scanned} records ({changed} changed)")
+
+    chunk = []
+    try:
+        for page in scanner.pages():
+            chunk.extend(page.rows)
+            scanned += len(page.rows)
+            if len(chunk) >= args.chunk:
+                process(chunk)
+                chunk = []
+        if chunk:
+            process(chunk)
+    finally:
+        if writer:
+            writer.close()
+
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE!")
+    logger.info(f"  Records: {scanned} ({changed} {'would change' if args.dry_run else 'changed'})")
+    logger.info(f"  Point-in-polygon: {attribute_seconds:.2f}s "
+                f"({scanned / max(attribute_seconds, 1e-9):,.0f} points/s)")
+    if writer:
+        logger.info(f"  Writes: {writer.stats.summary()}")
+    logger.info(f"  Unknown ({UNKNOWN_CODE}): {counts[UNKNOWN_CODE]}")
+    for code, count in counts.most_common(15):
+        logger.info(f"    {code}  {count}")
+    logger.info("=" * 60)
+
+    if writer and touched_years and not args.skip_rollup:
+        refresh_rollup(client, touched_years, workers=args.fetch_workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Signal 626 - Static point packs
+================================
+
+Exports the geocoded sightings as one compact binary file per year under
+public/packs/, so the map and Signal Replay fetch a year as a single static
+object instead of paging /api/sightings 1000 rows at a time.
+
+Each {year}.bin is a concatenation of gzip members:
+
+    locations      JSON array of the year's distinct location strings
+    one per shape  the year's points of that shape, sorted by (day, time,
+                   id), as columns: lat float32[n], lng float32[n],
+                   id uint32[n], loc uint32[n] (index into locations),
+                   doy uint16[n], minute uint16[n] (minutes after midnight,
+                   0xFFFF when unknown), country uint8[n] (index into
+                   manifest countries)
+
+All little-endian. manifest.json records every member's byte offset and
+length, so a client can fetch a single shape with an HTTP Range request and
+decompress just that member. The shape is implied by the member, so no
+per-point shape byte is stored. The country table is append-only, so files
+of years that were not re-exported stay valid.
+
+Regeneration is incremental by year: --years names them, and --changed
+exports the years whose summary rollup (rollup_stats.py) was refreshed since
+the year was last exported. Files whose bytes come out identical are not
+rewritten.
+
+Usage:
+    python export_point_packs.py                    # every year
+    python export_point_packs.py --changed          # years touched since the last export
+    python export_point_packs.py --years 2014,2015
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from sighting_points import Points, load_points, split_years
+from static_artifacts import build_years, changed_since_build, load_manifest
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'packs')
+PACK_VERSION = 2  # 2 added the minute column
+PACK_COLUMNS = [('lat', '<f4'), ('lng', '<f4'), ('id', '<u4'), ('loc', '<u4'), ('doy', '<u2'), ('minute', '<u2'),
+                ('country', 'u1')]
+
+
+def pack_manifest(out_dir: str) -> dict:
+    manifest = load_manifest(out_dir, PACK_VERSION, {'columns': [name for name, _ in PACK_COLUMNS]})
+    manifest.setdefault('countries', [''])
+    return manifest
+
+
+def encode_shape(points: Points, loc_idx: np.ndarray, country_idx: np.ndarray) -> bytes:
+    columns = {'lat': points.lat, 'lng': points.lng, 'id': points.id, 'loc': loc_idx,
+               'doy': points.doy, 'minute': points.minute, 'country': country_idx}
+    return b''.join(np.ascontiguousarray(columns[name], dtype=dtype).tobytes() for name, dtype in PACK_COLUMNS)
+
+
+def build_year(points: Points, countries: List[str], level: int = 9) -> Tuple[bytes, dict]:
+    """Encode one year's pack. Appends unseen country codes to countries."""
+    def member(raw: bytes) -> bytes:
+        # mtime=0 keeps the output byte-identical across runs
+        return gzip.compress(raw, compresslevel=level, mtime=0)
+
+    locations, loc_idx = np.unique(points.location.astype(str), return_inverse=True)
+    country_index = {code: i for i, code in enumerate(countries)}
+    for code in np.unique(points.country.astype(str)):
+        if code not in country_index:
+            country_index[code] = len(countries)
+            countries.append(code)
+    if len(countries) > 256:
+        raise ValueError(f"{len(countries)} country codes don't fit the uint8 country column")
+    country_idx = np.array([country_index[c] for c in points.country], dtype=np.uint8)
+
+    parts = [member(json.dumps(locations.tolist(), ensure_ascii=False).encode('utf-8'))]
+    meta = {'count': len(points), 'locations': [0, len(parts[0])], 'shapes': {}}
+    offset = len(parts[0])
+    shapes = points.shape.astype(str)
+    for shape in np.unique(shapes):
+        idx = np.flatnonzero(shapes == shape)
+        idx = idx[np.lexsort((points.id[idx], points.minute[idx], points.doy[idx]))]
+        data = member(encode_shape(points.take(idx), loc_idx[idx], country_idx[idx]))
+        meta['shapes'][str(shape)] = [offset, len(data), len(idx)]
+        parts.append(data)
+        offset += len(data)
+
+    blob = b''.join(parts)
+    meta['bytes'] = len(blob)
+    meta['sha1'] = hashlib.sha1(blob).hexdigest()
+    return blob, meta
+
+
+def export_packs(client: Client, out_dir: str = DEFAULT_PACK_DIR, years: Optional[List[int]] = None,
+                 workers: int = 4, level: int = 9) -> Dict[str, int]:
+    """Export the given years (None = all) and update the manifest."""
+    manifest = pack_manifest(out_dir)
+    points = load_points(client, years, workers=workers)
+    counts = build_years(out_dir, manifest, split_years(points), years,
+                         lambda pts: build_year(pts, manifest['countries'], level), 'exported_at')
+    counts['points'] = len(points)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export per-year binary point packs for the map')
+    parser.add_argument('--out', type=str, default=DEFAULT_PACK_DIR, help='Output directory (served statically)')
+    parser.add_argument('--years', type=str, default=None, help='Comma-separated years to export')
+    parser.add_argument('--changed', action='store_true',
+                        help='Only years whose rollup was refreshed since their last export')
+    parser.add_argument('--level', type=int, default=9, help='gzip compression level')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("Signal 626 - Point Pack Export")
+    logger.info(f"Output: {args.out}")
+    logger.info("=" * 60)
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    years = None
+    if args.years:
+        years = sorted({int(y) for y in args.years.split(',') if y.strip()})
+    elif args.changed:
+        years = changed_since_build(client, pack_manifest(args.out), 'exported_at')
+        if not years:
+            logger.info("No years changed since the last export")
+            return
+        logger.info(f"Changed years: {', '.join(map(str, years))}")
+
+    start = time.time()
+    counts = export_packs(client, args.out, years, workers=args.fetch_workers, level=args.level)
+    elapsed = time.time() - start
+
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE! ({elapsed:.1f}s)")
+    logger.info(f"  Points: {counts['points']:,}")
+    logger.info(f"  Years written: {counts['written']} ({counts['unchanged']} unchanged, "
+                f"{counts['removed']} removed)")
+    logger.info(f"  Pack size: {counts['bytes'] / 1024:,.0f} KiB "
+                f"({counts['bytes'] / max(counts['points'], 1):.1f} bytes/point)")
+    logger.info("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
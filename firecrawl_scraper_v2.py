@@ -8,6 +8,7 @@ import json
 import logging
 import os
 import re
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +18,9 @@ from firecrawl import Firecrawl
 from dotenv import load_dotenv
 from supabase import create_client
 
+from table_scanner import TableScanner
+from upsert_writer import BatchWriter
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -169,12 +173,17 @@ def parse_markdown(sighting_id: int, markdown: str) -> Optional[dict]:
 class FirecrawlScraperV2:
     def __init__(self):
         self.client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.writer = BatchWriter(self.client, batch_size=20, in_flight=2,
+                                  on_written=self._saved, on_rejected=self._rejected)
         self.firecrawl = Firecrawl(api_key=FIRECRAWL_API_KEY)
         self.scraped_ids = set()
         self.failed_ids = set()
+        self.ids_lock = threading.Lock()  # the id sets and counters are updated from writer threads
         self.load_progress()
         self.success = 0
         self.blocked = 0
+        self.saved = 0
+        self.write_failed = 0
 
     def load_progress(self):
         if PROGRESS_FILE.exists():
@@ -186,34 +195,47 @@ class FirecrawlScraperV2:
                 pass
 
     def save_progress(self):
+        with self.ids_lock:
+            scraped_ids = list(self.scraped_ids)
+            failed_ids = list(self.failed_ids)
         PROGRESS_FILE.write_text(json.dumps({
-            'scraped_ids': list(self.scraped_ids),
-            'failed_ids': list(self.failed_ids)
+            'scraped_ids': scraped_ids,
+            'failed_ids': failed_ids
         }))
 
     def get_missing_ids(self, start_id: int, end_id: int) -> list:
         """Get IDs not yet in database"""
-        existing = set()
-        result = self.client.table('nuforc_sightings').select('id').gte('id', start_id).lte('id', end_id).execute()
-        for r in result.data:
-            existing.add(r['id'])
-        return [i for i in range(end_id, start_id - 1, -1)
-                if i not in existing and i not in self.scraped_ids and i not in self.failed_ids]
+        scanner = TableScanner(self.client, 'id', id_range=(start_id - 1, end_id))
+        existing = {r['id'] for r in scanner}
+        with self.ids_lock:
+            done = existing | self.scraped_ids | self.failed_ids
+        return [i for i in range(end_id, start_id - 1, -1) if i not in done]
 
     def save_record(self, record: dict) -> bool:
-        """Save record to Supabase"""
+        """Queue record for saving to Supabase (written in the background by self.writer)"""
         if not record or not record.get('id'):
             return False
         # Must have at least some useful data
         if not (record.get('location') or record.get('shape') or record.get('occurred')):
             return False
-        try:
-            self.client.table('nuforc_sightings').upsert(record, on_conflict='id').execute()
-            self.scraped_ids.add(record['id'])
-            return True
-        except Exception as e:
-            logger.error(f"Save error: {e}")
-            return False
+        self.writer.add(record)
+        return True
+
+    def _saved(self, records: list):
+        with self.ids_lock:
+            self.scraped_ids.update(r['id'] for r in records)
+            self.saved += len(records)
+
+    def _rejected(self, records: list):
+        ids = [r['id'] for r in records]
+        with self.ids_lock:
+            self.failed_ids.update(ids)
+            self.write_failed += len(ids)
+        logger.warning(f"  Write failed for {len(ids)} record(s): {ids} (see {self.writer.dead_letter})")
+
+    def _mark_failed(self, sighting_id: int):
+        with self.ids_lock:
+            self.failed_ids.add(sighting_id)
 
     def fetch_one(self, sighting_id: int) -> Optional[dict]:
         """Fetch and parse a single sighting"""
@@ -227,7 +249,7 @@ class FirecrawlScraperV2:
                 if 'wordfence' in markdown.lower():
                     logger.warning(f"  BLOCKED by Wordfence")
                     self.blocked += 1
-                    self.failed_ids.add(sighting_id)
+                    self._mark_failed(sighting_id)
                     return None
 
                 record = parse_markdown(sighting_id, markdown)
@@ -235,15 +257,15 @@ class FirecrawlScraperV2:
                     self.success += 1
                     return record
                 else:
-                    self.failed_ids.add(sighting_id)
+                    self._mark_failed(sighting_id)
                     return None
             else:
-                self.failed_ids.add(sighting_id)
+                self._mark_failed(sighting_id)
                 return None
 
         except Exception as e:
             logger.warning(f"ID {sighting_id}: Error - {e}")
-            self.failed_ids.add(sighting_id)
+            self._mark_failed(sighting_id)
             return None
 
     def run(self, start_id: int, end_id: int, limit: int = 500):
@@ -264,7 +286,6 @@ class FirecrawlScraperV2:
             logger.info("All done!")
             return
 
-        total_saved = 0
         start_time = time.time()
 
         try:
@@ -275,7 +296,6 @@ class FirecrawlScraperV2:
 
                 if record:
                     if self.save_record(record):
-                        total_saved += 1
                         # Show extracted data
                         shape = record.get('shape') or '-'
                         location = record.get('location') or '-'
@@ -294,20 +314,23 @@ class FirecrawlScraperV2:
                 # Progress every 10 records
                 if (i + 1) % 10 == 0:
                     elapsed = time.time() - start_time
-                    rate = total_saved / elapsed * 60 if elapsed > 0 else 0
-                    logger.info(f"--- Progress: {i+1}/{len(ids)} | Saved: {total_saved} | Rate: {rate:.1f}/min ---")
+                    rate = self.saved / elapsed * 60 if elapsed > 0 else 0
+                    logger.info(f"--- Progress: {i+1}/{len(ids)} | Saved: {self.saved} | "
+                                f"Write failures: {self.write_failed} | Rate: {rate:.1f}/min ---")
 
                 time.sleep(1)
 
         except KeyboardInterrupt:
             logger.info("\nStopped by user")
         finally:
+            self.writer.close()
             self.save_progress()
 
         elapsed = time.time() - start_time
         logger.info(f"\n{'='*60}")
         logger.info(f"COMPLETE!")
-        logger.info(f"Saved: {total_saved} | Blocked: {self.blocked}")
+        logger.info(f"Saved: {self.saved} | Write failures: {self.write_failed} | Blocked: {self.blocked}")
+        logger.info(f"Writes: {self.writer.stats.summary()}")
         logger.info(f"Time: {elapsed/60:.1f} minutes")
         logger.info(f"{'='*60}")
 
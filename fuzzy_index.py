@@ -0,0 +1,82 @@
+"""
+Signal 626 - Trigram fuzzy name index
+======================================
+
+Approximate string lookup for misspelled place names ("Sydnee" -> "Sydney",
+"Milon Keynes" -> "Milton Keynes"). Every name is split into padded
+character trigrams; a posting list maps each trigram to the names that
+contain it. A query only scores names that share at least one trigram with
+it, so lookups touch a small fraction of the table.
+
+Similarity is the Dice coefficient of the two trigram sets,
+2|A & B| / (|A| + |B|), between 0.0 and 1.0.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def normalize(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+
+def trigrams(name: str) -> Set[str]:
+    """Padded trigrams of a normalized name ("york" -> {"  y", " yo", "yor", "ork", "rk "})."""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex(Generic[T]):
+    """Names -> values, queried by trigram similarity.
+
+    >>> idx = TrigramIndex([('Sydney', 1), ('Sidney', 2)])
+    >>> idx.best('Sydnee')[:2]
+    ('Sydney', 1)
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, T]]):
+        self.names: List[str] = []
+        self.values: List[T] = []
+        self.sizes: List[int] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        seen = set()
+
+        for name, value in entries:
+            key = normalize(name)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            grams = trigrams(key)
+            idx = len(self.names)
+            self.names.append(name)
+            self.values.append(value)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(idx)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def best(self, query: str, threshold: float = 0.0) -> Optional[Tuple[str, T, float]]:
+        """Return (name, value, score) of the most similar name with score >= threshold."""
+        key = normalize(query)
+        if not key:
+            return None
+        grams = trigrams(key)
+
+        overlap: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for idx in self.postings.get(gram, ()):
+                overlap[idx] += 1
+
+        best_idx, best_score = -1, threshold
+        for idx, shared in overlap.items():
+            score = 2.0 * shared / (len(grams) + self.sizes[idx])
+            if score > best_score or (score == best_score and best_idx == -1):
+                best_idx, best_score = idx, score
+        if best_idx == -1:
+            return None
+        return self.names[best_idx], self.values[best_idx], best_score
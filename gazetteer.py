@@ -0,0 +1,443 @@
+"""
+Signal 626 - Built-in gazetteer
+================================
+
+Coordinate tables shared by the rule-based geocoders (fast_geocode.py and
+geocode_remaining.py via location_resolver.py). Centroids are approximate;
+cities are precise to ~1 km.
+"""
+
+# US State centroids
+US_STATES = {
+    'AL': (32.806671, -86.791130), 'AK': (61.370716, -152.404419),
+    'AZ': (33.729759, -111.431221), 'AR': (34.969704, -92.373123),
+    'CA': (36.116203, -119.681564), 'CO': (39.059811, -105.311104),
+    'CT': (41.597782, -72.755371), 'DE': (39.318523, -75.507141),
+    'FL': (27.766279, -81.686783), 'GA': (33.040619, -83.643074),
+    'HI': (21.094318, -157.498337), 'ID': (44.240459, -114.478828),
+    'IL': (40.349457, -88.986137), 'IN': (39.849426, -86.258278),
+    'IA': (42.011539, -93.210526), 'KS': (38.526600, -96.726486),
+    'KY': (37.668140, -84.670067), 'LA': (31.169546, -91.867805),
+    'ME': (44.693947, -69.381927), 'MD': (39.063946, -76.802101),
+    'MA': (42.230171, -71.530106), 'MI': (43.326618, -84.536095),
+    'MN': (45.694454, -93.900192), 'MS': (32.741646, -89.678696),
+    'MO': (38.456085, -92.288368), 'MT': (46.921925, -110.454353),
+    'NE': (41.125370, -98.268082), 'NV': (38.313515, -117.055374),
+    'NH': (43.452492, -71.563896), 'NJ': (40.298904, -74.521011),
+    'NM': (34.840515, -106.248482), 'NY': (42.165726, -74.948051),
+    'NC': (35.630066, -79.806419), 'ND': (47.528912, -99.784012),
+    'OH': (40.388783, -82.764915), 'OK': (35.565342, -96.928917),
+    'OR': (44.572021, -122.070938), 'PA': (40.590752, -77.209755),
+    'RI': (41.680893, -71.511780), 'SC': (33.856892, -80.945007),
+    'SD': (44.299782, -99.438828), 'TN': (35.747845, -86.692345),
+    'TX': (31.054487, -97.563461), 'UT': (40.150032, -111.862434),
+    'VT': (44.045876, -72.710686), 'VA': (37.769337, -78.169968),
+    'WA': (47.400902, -121.490494), 'WV': (38.491226, -80.954453),
+    'WI': (44.268543, -89.616508), 'WY': (42.755966, -107.302490),
+    'DC': (38.897438, -77.026817), 'PR': (18.220833, -66.590149),
+    'VI': (18.335765, -64.896335), 'GU': (13.444304, 144.793731),
+}
+
+# Canadian province centroids
+CA_PROVINCES = {
+    'ON': (51.2538, -85.3232), 'QC': (52.9399, -73.5491),
+    'BC': (53.7267, -127.6476), 'AB': (53.9333, -116.5765),
+    'MB': (53.7609, -98.8139), 'SK': (52.9399, -106.4509),
+    'NS': (44.6820, -63.7443), 'NB': (46.5653, -66.4619),
+    'NL': (53.1355, -57.6604), 'PE': (46.5107, -63.4168),
+    'NT': (64.8255, -124.8457), 'YT': (64.2823, -135.0000),
+    'NU': (70.2998, -83.1076),
+}
+
+# US state full names to abbreviations
+STATE_NAMES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
+    'california': 'CA', 'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID',
+    'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
+    'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
+    'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS',
+    'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV',
+    'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY',
+    'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
+    'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
+    'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
+    'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV',
+    'wisconsin': 'WI', 'wyoming': 'WY', 'district of columbia': 'DC',
+    'puerto rico': 'PR',
+}
+
+# Major US cities with precise coordinates, keyed by (city, state)
+US_CITIES = {
+    ('New York', 'NY'): (40.7128, -74.0060), ('Los Angeles', 'CA'): (34.0522, -118.2437),
+    ('Chicago', 'IL'): (41.8781, -87.6298), ('Houston', 'TX'): (29.7604, -95.3698),
+    ('Phoenix', 'AZ'): (33.4484, -112.0740), ('Philadelphia', 'PA'): (39.9526, -75.1652),
+    ('San Antonio', 'TX'): (29.4241, -98.4936), ('San Diego', 'CA'): (32.7157, -117.1611),
+    ('Dallas', 'TX'): (32.7767, -96.7970), ('San Jose', 'CA'): (37.3382, -121.8863),
+    ('Austin', 'TX'): (30.2672, -97.7431), ('Jacksonville', 'FL'): (30.3322, -81.6557),
+    ('Fort Worth', 'TX'): (32.7555, -97.3308), ('Columbus', 'OH'): (39.9612, -82.9988),
+    ('San Francisco', 'CA'): (37.7749, -122.4194), ('Charlotte', 'NC'): (35.2271, -80.8431),
+    ('Indianapolis', 'IN'): (39.7684, -86.1581), ('Seattle', 'WA'): (47.6062, -122.3321),
+    ('Denver', 'CO'): (39.7392, -104.9903), ('Washington', 'DC'): (38.9072, -77.0369),
+    ('Nashville', 'TN'): (36.1627, -86.7816), ('El Paso', 'TX'): (31.7619, -106.4850),
+    ('Boston', 'MA'): (42.3601, -71.0589), ('Portland', 'OR'): (45.5152, -122.6784),
+    ('Las Vegas', 'NV'): (36.1699, -115.1398), ('Memphis', 'TN'): (35.1495, -90.0490),
+    ('Louisville', 'KY'): (38.2527, -85.7585), ('Baltimore', 'MD'): (39.2904, -76.6122),
+    ('Milwaukee', 'WI'): (43.0389, -87.9065), ('Albuquerque', 'NM'): (35.0844, -106.6504),
+    ('Tucson', 'AZ'): (32.2226, -110.9747), ('Fresno', 'CA'): (36.7378, -119.7871),
+    ('Sacramento', 'CA'): (38.5816, -121.4944), ('Mesa', 'AZ'): (33.4152, -111.8315),
+    ('Kansas City', 'MO'): (39.0997, -94.5786), ('Atlanta', 'GA'): (33.7490, -84.3880),
+    ('Omaha', 'NE'): (41.2565, -95.9345), ('Colorado Springs', 'CO'): (38.8339, -104.8214),
+    ('Raleigh', 'NC'): (35.7796, -78.6382), ('Long Beach', 'CA'): (33.7701, -118.1937),
+    ('Virginia Beach', 'VA'): (36.8529, -75.9780), ('Miami', 'FL'): (25.7617, -80.1918),
+    ('Oakland', 'CA'): (37.8044, -122.2712), ('Minneapolis', 'MN'): (44.9778, -93.2650),
+    ('Tulsa', 'OK'): (36.1540, -95.9928), ('Tampa', 'FL'): (27.9506, -82.4572),
+    ('Arlington', 'TX'): (32.7357, -97.1081), ('New Orleans', 'LA'): (29.9511, -90.0715),
+    ('Cleveland', 'OH'): (41.4993, -81.6944), ('Honolulu', 'HI'): (21.3069, -157.8583),
+    ('Anaheim', 'CA'): (33.8366, -117.9143), ('Orlando', 'FL'): (28.5383, -81.3792),
+    ('St. Louis', 'MO'): (38.6270, -90.1994), ('Pittsburgh', 'PA'): (40.4406, -79.9959),
+    ('Cincinnati', 'OH'): (39.1031, -84.5120), ('Anchorage', 'AK'): (61.2181, -149.9003),
+    ('Detroit', 'MI'): (42.3314, -83.0458), ('Salt Lake City', 'UT'): (40.7608, -111.8910),
+    ('Tacoma', 'WA'): (47.2529, -122.4443), ('Spokane', 'WA'): (47.6588, -117.4260),
+    ('Boise', 'ID'): (43.6150, -116.2023), ('Reno', 'NV'): (39.5296, -119.8138),
+    ('Scottsdale', 'AZ'): (33.4942, -111.9261), ('Chandler', 'AZ'): (33.3062, -111.8413),
+    ('St. Petersburg', 'FL'): (27.7676, -82.6403), ('Norfolk', 'VA'): (36.8508, -76.2859),
+    ('Buffalo', 'NY'): (42.8864, -78.8784), ('Rochester', 'NY'): (43.1566, -77.6088),
+    ('Syracuse', 'NY'): (43.0481, -76.1474), ('Albany', 'NY'): (42.6526, -73.7562),
+    ('Dayton', 'OH'): (39.7589, -84.1916), ('Akron', 'OH'): (41.0814, -81.5190),
+    ('Madison', 'WI'): (43.0731, -89.4012), ('Lexington', 'KY'): (38.0406, -84.5037),
+    ('Knoxville', 'TN'): (35.9606, -83.9207), ('Chattanooga', 'TN'): (35.0456, -85.3097),
+    ('Springfield', 'IL'): (39.7817, -89.6501), ('Little Rock', 'AR'): (34.7465, -92.2896),
+    ('Baton Rouge', 'LA'): (30.4515, -91.1871), ('Mobile', 'AL'): (30.6954, -88.0399),
+    ('Birmingham', 'AL'): (33.5207, -86.8025), ('Des Moines', 'IA'): (41.5868, -93.6250),
+    ('Wichita', 'KS'): (37.6872, -97.3301), ('Columbia', 'SC'): (34.0007, -81.0348),
+    ('Charleston', 'SC'): (32.7765, -79.9311), ('Savannah', 'GA'): (32.0809, -81.0912),
+    ('Providence', 'RI'): (41.8240, -71.4128), ('Hartford', 'CT'): (41.7658, -72.6734),
+    ('Wilmington', 'NC'): (34.2257, -77.9447), ('Fargo', 'ND'): (46.8772, -96.7898),
+    ('Sioux Falls', 'SD'): (43.5446, -96.7311), ('Billings', 'MT'): (45.7833, -108.5007),
+    ('Cheyenne', 'WY'): (41.1400, -104.8202), ('Burlington', 'VT'): (44.4759, -73.2121),
+    ('Concord', 'NH'): (43.2081, -71.5376), ('Dover', 'DE'): (39.1582, -75.5244),
+    ('Annapolis', 'MD'): (38.9784, -76.4922), ('Juneau', 'AK'): (58.3005, -134.4197),
+    ('Helena', 'MT'): (46.5891, -112.0391), ('Pierre', 'SD'): (44.3683, -100.3510),
+    ('Bismarck', 'ND'): (46.8083, -100.7837), ('Santa Fe', 'NM'): (35.6870, -105.9378),
+    ('Carson City', 'NV'): (39.1638, -119.7674), ('Olympia', 'WA'): (47.0379, -122.9007),
+    ('Salem', 'OR'): (44.9429, -123.0351), ('Topeka', 'KS'): (39.0473, -95.6752),
+    ('Oklahoma City', 'OK'): (35.4676, -97.5164), ('Lincoln', 'NE'): (40.8136, -96.7026),
+    ('Jackson', 'MS'): (32.2988, -90.1848), ('Montgomery', 'AL'): (32.3792, -86.3077),
+    ('Tallahassee', 'FL'): (30.4383, -84.2807), ('Richmond', 'VA'): (37.5407, -77.4360),
+    ('Harrisburg', 'PA'): (40.2732, -76.8867), ('Trenton', 'NJ'): (40.2171, -74.7429),
+    ('Lansing', 'MI'): (42.7325, -84.5555), ('Frankfort', 'KY'): (38.2009, -84.8733),
+    ('Jefferson City', 'MO'): (38.5768, -92.1735), ('Montpelier', 'VT'): (44.2601, -72.5754),
+    ('Augusta', 'ME'): (44.3106, -69.7795),
+}
+
+# Major Canadian cities, keyed by (city, province)
+CA_CITIES = {
+    ('Toronto', 'ON'): (43.6532, -79.3832),
+    ('Vancouver', 'BC'): (49.2827, -123.1207),
+    ('Montreal', 'QC'): (45.5017, -73.5673),
+    ('Calgary', 'AB'): (51.0447, -114.0719),
+    ('Edmonton', 'AB'): (53.5461, -113.4938),
+    ('Ottawa', 'ON'): (45.4215, -75.6972),
+    ('Winnipeg', 'MB'): (49.8951, -97.1384),
+    ('Halifax', 'NS'): (44.6488, -63.5752),
+    ('Victoria', 'BC'): (48.4284, -123.3656),
+    ('Quebec City', 'QC'): (46.8139, -71.2080),
+}
+
+# International cities (and UK counties) common in the data
+INTL_CITIES = {
+    'London': (51.5074, -0.1278),
+    'Manchester': (53.4808, -2.2426),
+    'Birmingham': (52.4862, -1.8904),
+    'Leeds': (53.8008, -1.5491),
+    'Glasgow': (55.8642, -4.2518),
+    'Edinburgh': (55.9533, -3.1883),
+    'Bristol': (51.4545, -2.5879),
+    'Liverpool': (53.4084, -2.9916),
+    'Sheffield': (53.3811, -1.4701),
+    'Newcastle': (54.9783, -1.6178),
+    'Nottingham': (52.9548, -1.1581),
+    'Southampton': (50.9097, -1.4044),
+    'Brighton': (50.8225, -0.1372),
+    'Cardiff': (51.4816, -3.1791),
+    'Belfast': (54.5973, -5.9301),
+    'Aberdeen': (57.1497, -2.0943),
+    'Dundee': (56.4620, -2.9707),
+    'Oxford': (51.7520, -1.2577),
+    'Cambridge': (52.2053, 0.1218),
+    'York': (53.9600, -1.0873),
+    'Bath': (51.3811, -2.3590),
+    'Canterbury': (51.2802, 1.0789),
+    'Exeter': (50.7184, -3.5339),
+    'Plymouth': (50.3755, -4.1427),
+    'Swansea': (51.6214, -3.9436),
+    'Coventry': (52.4068, -1.5197),
+    'Leicester': (52.6369, -1.1398),
+    'Wolverhampton': (52.5870, -2.1288),
+    'Stoke': (53.0027, -2.1794),
+    'Derby': (52.9225, -1.4746),
+    'Reading': (51.4543, -0.9781),
+    'Milton Keynes': (52.0406, -0.7594),
+    'Sunderland': (54.9069, -1.3838),
+    'Croydon': (51.3762, -0.0982),
+    'Kent': (51.2787, 0.5217),
+    'Surrey': (51.3148, -0.5600),
+    'Essex': (51.7343, 0.4691),
+    'Cornwall': (50.2660, -5.0527),
+    'Devon': (50.7156, -3.5309),
+    'Norfolk': (52.6140, 0.8864),
+    'Suffolk': (52.1872, 0.9708),
+    'Dorset': (50.7488, -2.3445),
+    'Wiltshire': (51.3492, -1.9927),
+    'Hampshire': (51.0577, -1.3081),
+    'Sussex': (50.9225, -0.1388),
+    # Australia
+    'Sydney': (-33.8688, 151.2093),
+    'Melbourne': (-37.8136, 144.9631),
+    'Brisbane': (-27.4698, 153.0251),
+    'Perth': (-31.9505, 115.8605),
+    'Adelaide': (-34.9285, 138.6007),
+    'Canberra': (-35.2809, 149.1300),
+    'Hobart': (-42.8821, 147.3272),
+    'Darwin': (-12.4634, 130.8456),
+    # Other international
+    'Dubai': (25.2048, 55.2708),
+    'Abu Dhabi': (24.4539, 54.3773),
+    'Mumbai': (19.0760, 72.8777),
+    'Delhi': (28.7041, 77.1025),
+    'Bangalore': (12.9716, 77.5946),
+    'Hyderabad': (17.3850, 78.4867),
+    'Chennai': (13.0827, 80.2707),
+    'Kolkata': (22.5726, 88.3639),
+    'Pune': (18.5204, 73.8567),
+    'Ahmedabad': (23.0225, 72.5714),
+    'Berlin': (52.5200, 13.4050),
+    'Munich': (48.1351, 11.5820),
+    'Hamburg': (53.5511, 9.9937),
+    'Frankfurt': (50.1109, 8.6821),
+    'Paris': (48.8566, 2.3522),
+    'Lyon': (45.7640, 4.8357),
+    'Marseille': (43.2965, 5.3698),
+    'Rome': (41.9028, 12.4964),
+    'Milan': (45.4642, 9.1900),
+    'Naples': (40.8518, 14.2681),
+    'Madrid': (40.4168, -3.7038),
+    'Barcelona': (41.3874, 2.1686),
+    'Lisbon': (38.7223, -9.1393),
+    'Amsterdam': (52.3676, 4.9041),
+    'Brussels': (50.8503, 4.3517),
+    'Vienna': (48.2082, 16.3738),
+    'Zurich': (47.3769, 8.5417),
+    'Geneva': (46.2044, 6.1432),
+    'Stockholm': (59.3293, 18.0686),
+    'Oslo': (59.9139, 10.7522),
+    'Copenhagen': (55.6761, 12.5683),
+    'Helsinki': (60.1699, 24.9384),
+    'Warsaw': (52.2297, 21.0122),
+    'Prague': (50.0755, 14.4378),
+    'Budapest': (47.4979, 19.0402),
+    'Athens': (37.9838, 23.7275),
+    'Istanbul': (41.0082, 28.9784),
+    'Ankara': (39.9334, 32.8597),
+    'Bangkok': (13.7563, 100.5018),
+    'Kuala Lumpur': (3.1390, 101.6869),
+    'Jakarta': (-6.2088, 106.8456),
+    'Manila': (14.5995, 120.9842),
+    'Seoul': (37.5665, 126.9780),
+    'Taipei': (25.0330, 121.5654),
+    'Tokyo': (35.6762, 139.6503),
+    'Osaka': (34.6937, 135.5023),
+    'Beijing': (39.9042, 116.4074),
+    'Shanghai': (31.2304, 121.4737),
+    'Hong Kong': (22.3193, 114.1694),
+    'Tehran': (35.6892, 51.3890),
+    'Baghdad': (33.3152, 44.3661),
+    'Riyadh': (24.7136, 46.6753),
+    'Cairo': (30.0444, 31.2357),
+    'Nairobi': (-1.2921, 36.8219),
+    'Lagos': (6.5244, 3.3792),
+    'Johannesburg': (-26.2041, 28.0473),
+    'Cape Town': (-33.9249, 18.4241),
+    'Lima': (-12.0464, -77.0428),
+    'Bogota': (4.7110, -74.0721),
+    'Santiago': (-33.4489, -70.6693),
+    'Buenos Aires': (-34.6037, -58.3816),
+    'Sao Paulo': (-23.5505, -46.6333),
+    'Rio de Janeiro': (-22.9068, -43.1729),
+    'Havana': (23.1136, -82.3666),
+    'Nassau': (25.0480, -77.3554),
+    'Kingston': (18.0179, -76.8099),
+    'San Juan': (18.4655, -66.1057),
+    'Islamabad': (33.6844, 73.0479),
+    'Amman': (31.9454, 35.9284),
+}
+
+# Country and region centroids
+COUNTRY_COORDS = {
+    'USA': (39.8283, -98.5795), 'Canada': (56.1304, -106.3468),
+    'UK': (55.3781, -3.4360), 'Australia': (-25.2744, 133.7751),
+    'Germany': (51.1657, 10.4515), 'France': (46.2276, 2.2137),
+    'India': (20.5937, 78.9629), 'Brazil': (-14.2350, -51.9253),
+    'Mexico': (23.6345, -102.5528), 'Japan': (36.2048, 138.2529),
+    'China': (35.8617, 104.1954), 'Russia': (61.5240, 105.3188),
+    'Italy': (41.8719, 12.5674), 'Spain': (40.4637, -3.7492),
+    'Netherlands': (52.1326, 5.2913), 'Sweden': (60.1282, 18.6435),
+    'Norway': (60.4720, 8.4689), 'Denmark': (56.2639, 9.5018),
+    'Finland': (61.9241, 25.7482), 'Poland': (51.9194, 19.1451),
+    'Ireland': (53.1424, -7.6921), 'New Zealand': (-40.9006, 174.8860),
+    'South Africa': (-30.5595, 22.9375), 'Argentina': (-38.4161, -63.6167),
+    'Chile': (-35.6751, -71.5430), 'Colombia': (4.5709, -74.2973),
+    'Turkey': (38.9637, 35.2433), 'Greece': (39.0742, 21.8243),
+    'Portugal': (39.3999, -8.2245), 'Belgium': (50.8503, 4.3517),
+    'Austria': (47.5162, 14.5501), 'Switzerland': (46.8182, 8.2275),
+    'Philippines': (12.8797, 121.7740), 'Indonesia': (-0.7893, 113.9213),
+    'Thailand': (15.8700, 100.9925), 'Singapore': (1.3521, 103.8198),
+    'South Korea': (35.9078, 127.7669), 'Israel': (31.0461, 34.8516),
+    'Egypt': (26.8206, 30.8025), 'Puerto Rico': (18.2208, -66.5901),
+    'United Kingdom': (55.3781, -3.4360),
+    'England': (52.3555, -1.1743),
+    'Scotland': (56.4907, -4.2026),
+    'Wales': (52.1307, -3.7837),
+    'Northern Ireland': (54.7877, -6.4923),
+    'Morocco': (31.7917, -7.0926),
+    'Panama': (8.5380, -80.7821),
+    'Bahamas': (25.0343, -77.3963),
+    'Botswana': (-22.3285, 24.6849),
+    'Pakistan': (30.3753, 69.3451),
+    'Iran': (32.4279, 53.6880),
+    'Iraq': (33.2232, 43.6793),
+    'Bulgaria': (42.7339, 25.4858),
+    'Syria': (34.8021, 38.9968),
+    'Lebanon': (33.8547, 35.8623),
+    'Malaysia': (4.2105, 101.9758),
+    'Peru': (-9.1900, -75.0152),
+    'Jordan': (30.5852, 36.2384),
+    'Bermuda': (32.3078, -64.7505),
+    'Cuba': (21.5218, -77.7812),
+    'Jamaica': (18.1096, -77.2975),
+    'Costa Rica': (9.7489, -83.7534),
+    'Guatemala': (15.7835, -90.2308),
+    'Honduras': (15.2000, -86.2419),
+    'Nicaragua': (12.8654, -85.2072),
+    'El Salvador': (13.7942, -88.8965),
+    'Dominican Republic': (18.7357, -70.1627),
+    'Trinidad': (10.6918, -61.2225),
+    'Barbados': (13.1939, -59.5432),
+    'Venezuela': (6.4238, -66.5897),
+    'Ecuador': (-1.8312, -78.1834),
+    'Bolivia': (-16.2902, -63.5887),
+    'Paraguay': (-23.4425, -58.4438),
+    'Uruguay': (-32.5228, -55.7658),
+    'Croatia': (45.1000, 15.2000),
+    'Czech Republic': (49.8175, 15.4730),
+    'Czechia': (49.8175, 15.4730),
+    'Romania': (45.9432, 24.9668),
+    'Hungary': (47.1625, 19.5033),
+    'Slovakia': (48.6690, 19.6990),
+    'Serbia': (44.0165, 21.0059),
+    'Slovenia': (46.1512, 14.9955),
+    'Bosnia': (43.9159, 17.6791),
+    'Montenegro': (42.7087, 19.3744),
+    'Albania': (41.1533, 20.1683),
+    'North Macedonia': (41.5122, 21.7453),
+    'Macedonia': (41.5122, 21.7453),
+    'Kosovo': (42.6026, 20.9030),
+    'Lithuania': (55.1694, 23.8813),
+    'Latvia': (56.8796, 24.6032),
+    'Estonia': (58.5953, 25.0136),
+    'Ukraine': (48.3794, 31.1656),
+    'Belarus': (53.7098, 27.9534),
+    'Moldova': (47.4116, 28.3699),
+    'Iceland': (64.9631, -19.0208),
+    'Cyprus': (35.1264, 33.4299),
+    'Malta': (35.9375, 14.3754),
+    'Luxembourg': (49.8153, 6.1296),
+    'Taiwan': (23.6978, 120.9605),
+    'Vietnam': (14.0583, 108.2772),
+    'Cambodia': (12.5657, 104.9910),
+    'Myanmar': (21.9162, 95.9560),
+    'Bangladesh': (23.6850, 90.3563),
+    'Sri Lanka': (7.8731, 80.7718),
+    'Nepal': (28.3949, 84.1240),
+    'Afghanistan': (33.9391, 67.7100),
+    'Saudi Arabia': (23.8859, 45.0792),
+    'UAE': (23.4241, 53.8478),
+    'United Arab Emirates': (23.4241, 53.8478),
+    'Qatar': (25.3548, 51.1839),
+    'Kuwait': (29.3117, 47.4818),
+    'Oman': (21.4735, 55.9754),
+    'Bahrain': (26.0667, 50.5577),
+    'Yemen': (15.5527, 48.5164),
+    'Kenya': (-0.0236, 37.9062),
+    'Nigeria': (9.0820, 8.6753),
+    'Ghana': (7.9465, -1.0232),
+    'Ethiopia': (9.1450, 40.4897),
+    'Tanzania': (-6.3690, 34.8888),
+    'Uganda': (1.3733, 32.2903),
+    'Rwanda': (-1.9403, 29.8739),
+    'Mozambique': (-18.6657, 35.5296),
+    'Zimbabwe': (-19.0154, 29.1549),
+    'Zambia': (-13.1339, 27.8493),
+    'Namibia': (-22.9576, 18.4904),
+    'Congo': (-4.0383, 21.7587),
+    'Tunisia': (33.8869, 9.5375),
+    'Algeria': (28.0339, 1.6596),
+    'Libya': (26.3351, 17.2283),
+    'Sudan': (12.8628, 30.2176),
+    'Pacific Ocean': (0.0, -160.0),
+    'Atlantic Ocean': (14.5994, -28.6731),
+    'Caribbean': (14.5, -75.0),
+}
+
+# ISO 3166-1 alpha-2 codes for country names as they appear in NUFORC data
+COUNTRY_ISO2 = {
+    'USA': 'US', 'United States': 'US', 'Canada': 'CA', 'UK': 'GB',
+    'United Kingdom': 'GB', 'England': 'GB', 'Scotland': 'GB', 'Wales': 'GB',
+    'Northern Ireland': 'GB', 'Australia': 'AU', 'Germany': 'DE',
+    'France': 'FR', 'India': 'IN', 'Brazil': 'BR', 'Mexico': 'MX',
+    'Japan': 'JP', 'China': 'CN', 'Russia': 'RU', 'Italy': 'IT', 'Spain': 'ES',
+    'Netherlands': 'NL', 'Sweden': 'SE', 'Norway': 'NO', 'Denmark': 'DK',
+    'Finland': 'FI', 'Poland': 'PL', 'Ireland': 'IE', 'New Zealand': 'NZ',
+    'South Africa': 'ZA', 'Argentina': 'AR', 'Chile': 'CL', 'Colombia': 'CO',
+    'Turkey': 'TR', 'Greece': 'GR', 'Portugal': 'PT', 'Belgium': 'BE',
+    'Austria': 'AT', 'Switzerland': 'CH', 'Philippines': 'PH',
+    'Indonesia': 'ID', 'Thailand': 'TH', 'Singapore': 'SG',
+    'South Korea': 'KR', 'Israel': 'IL', 'Egypt': 'EG', 'Puerto Rico': 'PR',
+    'Morocco': 'MA', 'Panama': 'PA', 'Bahamas': 'BS', 'Botswana': 'BW',
+    'Pakistan': 'PK', 'Iran': 'IR', 'Iraq': 'IQ', 'Bulgaria': 'BG',
+    'Syria': 'SY', 'Lebanon': 'LB', 'Malaysia': 'MY', 'Peru': 'PE',
+    'Jordan': 'JO', 'Bermuda': 'BM', 'Cuba': 'CU', 'Jamaica': 'JM',
+    'Costa Rica': 'CR', 'Guatemala': 'GT', 'Honduras': 'HN',
+    'Nicaragua': 'NI', 'El Salvador': 'SV', 'Dominican Republic': 'DO',
+    'Trinidad': 'TT', 'Barbados': 'BB', 'Venezuela': 'VE', 'Ecuador': 'EC',
+    'Bolivia': 'BO', 'Paraguay': 'PY', 'Uruguay': 'UY', 'Croatia': 'HR',
+    'Czech Republic': 'CZ', 'Czechia': 'CZ', 'Romania': 'RO', 'Hungary': 'HU',
+    'Slovakia': 'SK', 'Serbia': 'RS', 'Slovenia': 'SI', 'Bosnia': 'BA',
+    'Montenegro': 'ME', 'Albania': 'AL', 'North Macedonia': 'MK',
+    'Macedonia': 'MK', 'Kosovo': 'XK', 'Lithuania': 'LT', 'Latvia': 'LV',
+    'Estonia': 'EE', 'Ukraine': 'UA', 'Belarus': 'BY', 'Moldova': 'MD',
+    'Iceland': 'IS', 'Cyprus': 'CY', 'Malta': 'MT', 'Luxembourg': 'LU',
+    'Taiwan': 'TW', 'Vietnam': 'VN', 'Cambodia': 'KH', 'Myanmar': 'MM',
+    'Bangladesh': 'BD', 'Sri Lanka': 'LK', 'Nepal': 'NP',
+    'Afghanistan': 'AF', 'Saudi Arabia': 'SA', 'UAE': 'AE',
+    'United Arab Emirates': 'AE', 'Qatar': 'QA', 'Kuwait': 'KW', 'Oman': 'OM',
+    'Bahrain': 'BH', 'Yemen': 'YE', 'Kenya': 'KE', 'Nigeria': 'NG',
+    'Ghana': 'GH', 'Ethiopia': 'ET', 'Tanzania': 'TZ', 'Uganda': 'UG',
+    'Rwanda': 'RW', 'Mozambique': 'MZ', 'Zimbabwe': 'ZW', 'Zambia': 'ZM',
+    'Namibia': 'NA', 'Congo': 'CD', 'Tunisia': 'TN', 'Algeria': 'DZ',
+    'Libya': 'LY', 'Sudan': 'SD',
+}
+
+# GeoNames admin1 codes for Canadian provinces (NUFORC uses postal codes)
+CA_ADMIN1 = {
+    'AB': '01', 'BC': '02', 'MB': '03', 'NB': '04', 'NL': '05', 'NS': '07',
+    'ON': '08', 'PE': '09', 'QC': '10', 'SK': '11', 'YT': '12', 'NT': '13',
+    'NU': '14',
+}
+
+# GeoNames admin1 codes for the UK constituent countries
+UK_ADMIN1 = {
+    'England': 'ENG', 'Scotland': 'SCT', 'Wales': 'WLS',
+    'Northern Ireland': 'NIR', 'Ireland': 'NIR',
+}
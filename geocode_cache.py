@@ -0,0 +1,131 @@
+"""
+Signal 626 - Persistent Geocode Cache
+======================================
+
+Durable location -> coordinates store shared by all geocoders, kept in a
+SQLite database in WAL mode. Every lookup result is recorded as soon as it
+is known, together with where it came from and when:
+
+    hit   latitude/longitude set         (e.g. source='nominatim')
+    miss  latitude/longitude NULL        (the source could not resolve it)
+
+Misses are cached too, so re-runs don't spend rate-limited Nominatim calls on
+strings that are known to be unresolvable. geocode_locations.py reads and
+writes it; fast_geocode.py / geocode_remaining.py can consult it (read-only)
+before their rule tables with --geocode-cache.
+
+A legacy geocode_cache.json is imported automatically the first time.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geocode_cache.sqlite')
+LEGACY_JSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'geocode_cache.json')
+
+
+class CacheEntry(NamedTuple):
+    coords: Optional[Tuple[float, float]]  # None for a cached miss
+    source: str
+    updated_at: float
+
+    @property
+    def hit(self) -> bool:
+        return self.coords is not None
+
+
+class GeocodeCache:
+    """SQLite-backed geocode cache with negative entries."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, miss_ttl: Optional[float] = None,
+                 legacy_json: Optional[str] = LEGACY_JSON_PATH):
+        """
+        Args:
+            path: SQLite database file (created if missing).
+            miss_ttl: Seconds after which a cached miss is ignored and the
+                location is retried. None keeps misses forever.
+            legacy_json: geocode_cache.json to import into an empty database.
+        """
+        self.path = path
+        self.miss_ttl = miss_ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                location   TEXT PRIMARY KEY,
+                latitude   REAL,
+                longitude  REAL,
+                source     TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+
+        if legacy_json and os.path.exists(legacy_json) and len(self) == 0:
+            self.import_json(legacy_json)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM geocode_cache').fetchone()[0]
+
+    def counts(self) -> Tuple[int, int]:
+        """Return (hits, misses) stored."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT COUNT(latitude), COUNT(*) - COUNT(latitude) FROM geocode_cache'
+            ).fetchone()
+        return row[0], row[1]
+
+    def get(self, location: str) -> Optional[CacheEntry]:
+        """Return the cached entry for location, or None if unknown (or an expired miss)."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT latitude, longitude, source, updated_at FROM geocode_cache WHERE location = ?',
+                (location,),
+            ).fetchone()
+        if row is None:
+            return None
+        lat, lng, source, updated_at = row
+        if lat is None:
+            if self.miss_ttl is not None and time.time() - updated_at > self.miss_ttl:
+                return None
+            return CacheEntry(None, source, updated_at)
+        return CacheEntry((lat, lng), source, updated_at)
+
+    def put(self, location: str, coords: Optional[Tuple[float, float]], source: str):
+        """Record a hit (coords) or a miss (None) for location."""
+        lat, lng = coords if coords else (None, None)
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO geocode_cache (location, latitude, longitude, source, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (location, lat, lng, source, time.time()),
+            )
+
+    def import_json(self, path: str) -> int:
+        """Import a legacy {location: [lat, lng]} JSON cache."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        now = time.time()
+        with self.lock:
+            self.conn.execute('BEGIN')
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO geocode_cache (location, latitude, longitude, source, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                ((loc, v[0], v[1], 'legacy_json', now) for loc, v in data.items()),
+            )
+            self.conn.execute('COMMIT')
+        logger.info(f"Imported {len(data)} entries from {path}")
+        return len(data)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -5,28 +5,44 @@ Geocode NUFORC sighting locations → Add latitude/longitude to Supabase
 This script:
 1. Adds latitude/longitude columns to the Supabase table (if not exists)
 2. Finds all unique locations without coordinates
-3. Geocodes them using geopy (Nominatim - free, no API key)
-4. Updates records in Supabase in bulk
+3. Geocodes them with the offline GeoNames index (if --gazetteer is given),
+   then geopy (Nominatim - free, no API key) for whatever is left
+4. Updates records in Supabase in bulk: every --apply-every locations go to
+   the apply_location_coordinates RPC (setup.sql Step 6) as one set-based UPDATE
+5. Refreshes the summary rollups (rollup_stats.py) for the years it touched
 
 Usage:
     pip install geopy supabase python-dotenv
     python geocode_locations.py
+    python geocode_locations.py --gazetteer cities500.zip
 
 Note: Nominatim has rate limits (1 req/sec). For 150k records with ~15k unique
-locations, this will take ~4-5 hours. Use --batch-size and --start-from to resume.
+locations, this will take ~4-5 hours. With a local GeoNames dump most locations
+resolve offline in seconds and only the remainder goes to Nominatim.
+Use --batch-size and --start-from to resume.
+
+Geocoding and database writes run as a pipeline: the geocoder is paced by a
+token bucket and hands results through a bounded queue to --writers threads,
+so Supabase latency never adds to the rate-limited critical path. Point
+--nominatim-url at a local stand-in server to test without the public API.
 """
 
 import os
 import sys
 import time
-import json
+import queue
 import logging
-from typing import Optional, Dict, Tuple
+import threading
+from typing import Optional, Tuple
 from collections import defaultdict
 
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from geocode_cache import DEFAULT_CACHE_PATH, GeocodeCache
+from rollup_stats import refresh_rollup, year_of
+from table_scanner import TableScanner
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -39,34 +55,155 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Cache file for geocoded locations (resume support)
-CACHE_FILE = os.path.join(os.path.dirname(__file__), 'geocode_cache.json')
-
-
-def load_cache() -> Dict[str, Tuple[float, float]]:
-    """Load cached geocoding results."""
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, 'r') as f:
-            data = json.load(f)
-            return {k: tuple(v) for k, v in data.items()}
-    return {}
-
 
-def save_cache(cache: Dict[str, Tuple[float, float]]):
-    """Save geocoding cache."""
-    with open(CACHE_FILE, 'w') as f:
-        json.dump({k: list(v) for k, v in cache.items()}, f)
-
-
-def geocode_location(location: str, geocoder) -> Optional[Tuple[float, float]]:
-    """Geocode a single location string."""
-    try:
-        result = geocoder.geocode(location, timeout=10)
+class BackendError(Exception):
+    """A backend failed to answer (network error, timeout); the location is not a known miss."""
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+class NominatimBackend:
+    """Live Nominatim lookups paced by a token bucket (default 1 req/sec)."""
+
+    name = 'nominatim'
+
+    def __init__(self, rate: float = 1.0, url: Optional[str] = None):
+        try:
+            from geopy.geocoders import Nominatim
+        except ImportError:
+            logger.error("Please install geopy: pip install geopy")
+            sys.exit(1)
+        options = {}
+        if url:
+            scheme, _, domain = url.rstrip('/').partition('://')
+            options = {'scheme': scheme, 'domain': domain}
+        self.geocoder = Nominatim(user_agent="signal626_geocoder/1.0", **options)
+        self.bucket = TokenBucket(rate)
+
+    def geocode(self, location: str) -> Optional[Tuple[float, float]]:
+        self.bucket.acquire()
+        try:
+            result = self.geocoder.geocode(location, timeout=10)
+        except Exception as e:
+            logger.warning(f"Geocode error for '{location}': {e}")
+            raise BackendError(str(e)) from e
         if result:
             return (result.latitude, result.longitude)
+        return None
+
+
+def backend_chain(backends: list) -> str:
+    return '+'.join(b.name for b in backends)
+
+
+def geocode_with(backends: list, location: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+    """Try each backend in order.
+
+    Returns (coords, backend name) for the first hit, (None, chain name) when
+    every backend answered "not found", and (None, None) if any backend
+    errored, so transient failures are never cached as misses.
+    """
+    errored = False
+    for backend in backends:
+        try:
+            coords = backend.geocode(location)
+        except BackendError:
+            errored = True
+            continue
+        if coords:
+            return coords, backend.name
+    return None, (None if errored else backend_chain(backends))
+
+
+def update_location(client: Client, location: str, lat: float, lng: float,
+                    ids: list, batch_size: int) -> Tuple[int, int]:
+    """Write one location's coordinates by id. Returns (records, errors)."""
+    records = errors = 0
+    for batch_start in range(0, len(ids), batch_size):
+        batch_ids = ids[batch_start:batch_start + batch_size]
+        try:
+            client.table('nuforc_sightings').update({
+                'latitude': lat,
+                'longitude': lng
+            }).in_('id', batch_ids).execute()
+            records += len(batch_ids)
+        except Exception as e:
+            logger.error(f"Update error for {location}: {e}")
+            errors += 1
+    return records, errors
+
+
+def apply_locations(client: Client, pending: list, locations_map: dict, batch_size: int) -> Tuple[int, int]:
+    """Write many (location, lat, lng) results with one apply_location_coordinates call.
+
+    Falls back to per-location updates if the RPC fails (e.g. setup.sql
+    Step 6 has not been run). Returns (records, errors).
+    """
+    payload = [{'location': loc, 'lat': lat, 'lng': lng} for loc, lat, lng in pending]
+    try:
+        response = client.rpc('apply_location_coordinates', {'payload': payload}).execute()
+        return int(response.data or 0), 0
     except Exception as e:
-        logger.warning(f"Geocode error for '{location}': {e}")
-    return None
+        logger.error(f"Bulk apply error ({len(pending)} locations), falling back to per-location updates: {e}")
+    records = errors = 0
+    for location, lat, lng in pending:
+        r, err = update_location(client, location, lat, lng, locations_map[location], batch_size)
+        records += r
+        errors += err
+    return records, errors
+
+
+def write_worker(client: Client, work: queue.Queue, locations_map: dict, batch_size: int,
+                 apply_every: int, counters: dict, lock: threading.Lock):
+    """Drain (location, lat, lng) items from the queue into Supabase until a None arrives.
+
+    With apply_every > 0 results are buffered and written in bulk every
+    apply_every locations; 0 issues one UPDATE per location.
+    """
+    pending = []
+    while True:
+        item = work.get()
+        if item is not None:
+            if apply_every <= 0:
+                location, lat, lng = item
+                records, errors = update_location(client, location, lat, lng,
+                                                  locations_map[location], batch_size)
+            else:
+                pending.append(item)
+                if len(pending) < apply_every:
+                    continue
+                records, errors = apply_locations(client, pending, locations_map, batch_size)
+                pending = []
+        elif pending:
+            records, errors = apply_locations(client, pending, locations_map, batch_size)
+        else:
+            return
+
+        with lock:
+            counters['records'] += records
+            counters['errors'] += errors
+        if item is None:
+            return
 
 
 def main():
@@ -76,8 +213,30 @@ def main():
     parser.add_argument('--batch-size', type=int, default=500, help='Update batch size')
     parser.add_argument('--start-from', type=int, default=0, help='Start from Nth unique location')
     parser.add_argument('--dry-run', action='store_true', help='Only count, do not geocode')
+    parser.add_argument('--gazetteer', type=str, default=None,
+                        help='GeoNames cities dump (.txt/.zip) to resolve locations offline first')
+    parser.add_argument('--gazetteer-index', type=str, default=None,
+                        help='Directory for the compiled gazetteer index (default: <gazetteer>.idx)')
+    parser.add_argument('--offline-only', action='store_true',
+                        help='Do not fall back to Nominatim for locations the gazetteer misses')
+    parser.add_argument('--cache-db', type=str, default=DEFAULT_CACHE_PATH, help='Persistent geocode cache (SQLite)')
+    parser.add_argument('--retry-misses-after', type=float, default=None,
+                        help='Retry cached misses older than this many days (default: never)')
+    parser.add_argument('--rate', type=float, default=1.0, help='Max Nominatim requests per second')
+    parser.add_argument('--nominatim-url', type=str, default=None,
+                        help='Nominatim base URL, e.g. http://localhost:8080 for a local stand-in')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    parser.add_argument('--writers', type=int, default=4, help='Concurrent database writer threads')
+    parser.add_argument('--apply-every', type=int, default=200,
+                        help='Locations per bulk apply_location_coordinates call (0 = one UPDATE per location)')
+    parser.add_argument('--queue-size', type=int, default=100,
+                        help='Max geocoded locations waiting to be written')
+    parser.add_argument('--skip-rollup', action='store_true',
+                        help='Do not refresh the summary rollups for the years this run changed')
 
     args = parser.parse_args()
+    if args.offline_only and not args.gazetteer:
+        parser.error('--offline-only requires --gazetteer')
 
     logger.info("=" * 60)
     logger.info("Signal 626 - Location Geocoder")
@@ -91,30 +250,25 @@ def main():
     logger.info("Fetching locations without coordinates...")
 
     locations_map = defaultdict(list)  # location -> [list of IDs]
-    offset = 0
-    batch = 10000
-
-    while True:
-        response = client.table('nuforc_sightings').select(
-            'id, location'
-        ).is_('latitude', 'null').not_.is_('location', 'null').range(
-            offset, offset + batch - 1
-        ).execute()
-
-        if not response.data:
-            break
-
-        for row in response.data:
+    location_years = defaultdict(set)  # location -> occurrence years (for the rollup refresh)
+    scanner = TableScanner(
+        client, 'id, location, occurred',
+        filters=lambda q: q.is_('latitude', 'null').not_.is_('location', 'null'),
+        workers=args.fetch_workers,
+    )
+    fetched = 0
+    for page in scanner.pages():
+        for row in page.rows:
             if row['location']:
                 locations_map[row['location']].append(row['id'])
-
-        offset += batch
-        logger.info(f"  Fetched {offset} records...")
-
-        if len(response.data) < batch:
-            break
-
-    unique_locations = list(locations_map.keys())
+                location_years[row['location']].add(year_of(row['occurred']))
+        if page.rows:
+            fetched += len(page.rows)
+            logger.info(f"  Fetched {fetched} records...")
+
+    # Pages arrive from several partitions at once; order by first id so
+    # --start-from means the same thing on every run
+    unique_locations = sorted(locations_map, key=lambda loc: min(locations_map[loc]))
     total_records = sum(len(ids) for ids in locations_map.values())
 
     logger.info(f"Found {len(unique_locations)} unique locations covering {total_records} records")
@@ -123,67 +277,97 @@ def main():
         logger.info("Dry run complete. Exiting.")
         return
 
-    # Step 2: Geocode
-    try:
-        from geopy.geocoders import Nominatim
-    except ImportError:
-        logger.error("Please install geopy: pip install geopy")
-        sys.exit(1)
-
-    geocoder = Nominatim(user_agent="signal626_geocoder/1.0")
-    cache = load_cache()
-    logger.info(f"Loaded {len(cache)} cached locations")
+    # Step 2: Geocode (offline index first, Nominatim for the rest)
+    backends = []
+    if args.gazetteer:
+        from offline_gazetteer import OfflineGazetteer
+        start = time.time()
+        backends.append(OfflineGazetteer(args.gazetteer, args.gazetteer_index))
+        logger.info(f"Loaded offline gazetteer ({len(backends[0]):,} keys) in {time.time() - start:.2f}s")
+    if not args.offline_only:
+        backends.append(NominatimBackend(rate=args.rate, url=args.nominatim_url))
+
+    miss_ttl = args.retry_misses_after * 86400 if args.retry_misses_after is not None else None
+    cache = GeocodeCache(args.cache_db, miss_ttl=miss_ttl)
+    hits, misses = cache.counts()
+    logger.info(f"Geocode cache: {hits} hits, {misses} known misses ({args.cache_db})")
+    chain = set(backend_chain(backends).split('+'))
 
     geocoded = 0
     failed = 0
     skipped = 0
-
-    for i, location in enumerate(unique_locations[args.start_from:], start=args.start_from):
-        if location in cache:
-            lat, lng = cache[location]
-            skipped += 1
-        else:
-            coords = geocode_location(location, geocoder)
-            if coords:
-                lat, lng = coords
-                cache[location] = coords
-                geocoded += 1
-            else:
-                failed += 1
-                if (i + 1) % 100 == 0:
-                    logger.info(f"Progress: {i+1}/{len(unique_locations)} | Geocoded: {geocoded} | Failed: {failed} | Cached: {skipped}")
-                time.sleep(1)  # Rate limit
+    known_misses = 0
+    by_backend = defaultdict(int)
+    touched_years = set()
+
+    # Writers drain the queue while this thread keeps geocoding
+    work = queue.Queue(maxsize=args.queue_size)
+    counters = {'records': 0, 'errors': 0}
+    lock = threading.Lock()
+    writers = [
+        threading.Thread(
+            target=write_worker,
+            args=(client, work, locations_map, args.batch_size, args.apply_every, counters, lock),
+            daemon=True,
+        )
+        for _ in range(args.writers)
+    ]
+    for t in writers:
+        t.start()
+
+    start = time.time()
+    try:
+        for i, location in enumerate(unique_locations[args.start_from:], start=args.start_from):
+            entry = cache.get(location)
+            if entry and entry.hit:
+                lat, lng = entry.coords
+                skipped += 1
+            elif entry and chain <= set(entry.source.split('+')):
+                # Every backend in this run already failed on it
+                known_misses += 1
                 continue
-
-            # Rate limit for Nominatim
-            time.sleep(1.1)
-
-        # Update all records with this location
-        ids = locations_map[location]
-        for batch_start in range(0, len(ids), args.batch_size):
-            batch_ids = ids[batch_start:batch_start + args.batch_size]
-            try:
-                client.table('nuforc_sightings').update({
-                    'latitude': lat,
-                    'longitude': lng
-                }).in_('id', batch_ids).execute()
-            except Exception as e:
-                logger.error(f"Update error for {location}: {e}")
-
-        if (i + 1) % 50 == 0:
-            save_cache(cache)
-            logger.info(f"Progress: {i+1}/{len(unique_locations)} | Geocoded: {geocoded} | Failed: {failed} | Cached: {skipped}")
-
-    # Final save
-    save_cache(cache)
+            else:
+                coords, source = geocode_with(backends, location)
+                if source:
+                    cache.put(location, coords, source)
+                if coords:
+                    lat, lng = coords
+                    geocoded += 1
+                    by_backend[source] += 1
+                else:
+                    failed += 1
+                    if (i + 1) % 100 == 0:
+                        logger.info(f"Progress: {i+1}/{len(unique_locations)} | Geocoded: {geocoded} | Failed: {failed} | Cached: {skipped}")
+                    continue
+
+            work.put((location, lat, lng))
+            touched_years.update(location_years[location])
+
+            if (i + 1) % 50 == 0:
+                logger.info(f"Progress: {i+1}/{len(unique_locations)} | Geocoded: {geocoded} | Failed: {failed} | "
+                            f"Cached: {skipped} | Written: {counters['records']} records | Queued: {work.qsize()}")
+    finally:
+        for _ in writers:
+            work.put(None)
+        for t in writers:
+            t.join()
+        cache.close()
 
     logger.info("=" * 60)
     logger.info(f"COMPLETE!")
     logger.info(f"  Geocoded: {geocoded}")
+    for source, count in by_backend.items():
+        logger.info(f"    {source:<10} {count}")
     logger.info(f"  From cache: {skipped}")
+    logger.info(f"  Known misses skipped: {known_misses}")
     logger.info(f"  Failed: {failed}")
+    logger.info(f"  Records updated: {counters['records']} ({counters['errors']} write errors)")
+    logger.info(f"  Elapsed: {time.time() - start:.1f}s")
     logger.info("=" * 60)
 
+    if counters['records'] and not args.skip_rollup:
+        refresh_rollup(client, touched_years, workers=args.fetch_workers)
+
 
 if __name__ == '__main__':
     main()
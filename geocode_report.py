@@ -0,0 +1,124 @@
+"""
+Signal 626 - Geocoder dry-run report
+=====================================
+
+Structured statistics for a resolver pass over the table, written as JSON by
+``fast_geocode.py --dry-run --report report.json`` so runs can be diffed:
+
+    tiers          records and unique strings resolved per tier, and the
+                   cumulative time spent in each tier (including attempts
+                   that fell through to the next one)
+    latency_us     p50/p99 resolve latency per record (through the LRU
+                   cache) and per unique string (first, uncached resolve)
+    unresolved     top unresolved strings by record count
+    fuzzy          fuzzy matches with their similarity scores
+
+Tier timing wraps the resolver's tier callables, so it costs two clock reads
+per tier attempt and is only switched on for dry runs.
+"""
+
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from location_resolver import TIERS, LocationResolver, Resolution
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class GeocodeReport:
+    """Collects per-tier counts and timings for one resolver pass."""
+
+    def __init__(self, resolver: LocationResolver, top_n: int = 50):
+        self.top_n = top_n
+        self.records = 0
+        self.tier_records = Counter()
+        self.tier_unique = Counter()
+        self.tier_seconds: Dict[str, float] = defaultdict(float)
+        self.tier_calls = Counter()
+        self.record_latency: List[float] = []
+        self.unique_latency: List[float] = []
+        self.unresolved = Counter()
+        self.fuzzy: Dict[str, list] = {}  # location -> [Resolution, records]
+        self.seen = set()
+        self.started = time.time()
+        self._instrument(resolver)
+
+    def _instrument(self, resolver: LocationResolver):
+        def timed(name, tier):
+            def call(parsed):
+                start = time.perf_counter()
+                try:
+                    return tier(parsed)
+                finally:
+                    self.tier_seconds[name] += time.perf_counter() - start
+                    self.tier_calls[name] += 1
+            return call
+
+        resolver.tiers = [(name, timed(name, tier)) for name, tier in resolver.tiers]
+
+    def observe(self, location: str, result: Optional[Resolution], seconds: float):
+        """Record one record's resolution and how long resolve() took."""
+        self.records += 1
+        self.record_latency.append(seconds)
+        first = location not in self.seen
+        if first:
+            self.seen.add(location)
+            self.unique_latency.append(seconds)
+
+        if result is None:
+            self.unresolved[location] += 1
+            return
+        self.tier_records[result.tier] += 1
+        if first:
+            self.tier_unique[result.tier] += 1
+        if result.tier == 'fuzzy':
+            self.fuzzy.setdefault(location, [result, 0])[1] += 1
+
+    @property
+    def resolved(self) -> int:
+        return sum(self.tier_records.values())
+
+    def to_dict(self) -> dict:
+        tiers = {}
+        for tier in TIERS:
+            tiers[tier] = {
+                'records': self.tier_records[tier],
+                'unique': self.tier_unique[tier],
+                'calls': self.tier_calls[tier],
+                'ms': round(1000 * self.tier_seconds[tier], 3),
+            }
+        return {
+            'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'elapsed_s': round(time.time() - self.started, 3),
+            'records': self.records,
+            'unique_locations': len(self.seen),
+            'resolved': self.resolved,
+            'coverage_pct': round(100 * self.resolved / max(self.records, 1), 2),
+            'tiers': tiers,
+            'latency_us': {
+                'record': {'p50': round(1e6 * percentile(self.record_latency, 50), 2),
+                           'p99': round(1e6 * percentile(self.record_latency, 99), 2)},
+                'unique': {'p50': round(1e6 * percentile(self.unique_latency, 50), 2),
+                           'p99': round(1e6 * percentile(self.unique_latency, 99), 2)},
+            },
+            'unresolved': {
+                'records': sum(self.unresolved.values()),
+                'unique': len(self.unresolved),
+                'top': [{'location': loc, 'records': n} for loc, n in self.unresolved.most_common(self.top_n)],
+            },
+            'fuzzy': [
+                {'location': loc, 'matched': result.matched, 'score': round(result.score, 3), 'records': n}
+                for loc, (result, n) in sorted(self.fuzzy.items(), key=lambda kv: kv[1][0].score)
+            ],
+        }
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,335 @@
+"""
+Signal 626 - Rule-based geocoding run
+======================================
+
+Shared command-line flow behind fast_geocode.py and geocode_remaining.py:
+stream every record without coordinates, resolve it with the tiered
+LocationResolver and upsert the coordinates back to Supabase. One pass
+covers everything both scripts used to resolve separately.
+
+Fetching, resolving and writing run concurrently with bounded buffers in
+between (--max-inflight pages, --writers batches in flight), so the first
+batch is written as soon as the first page is resolved and memory does not
+grow with the table.
+
+Coordinates are deterministic per record, so only rows whose value actually
+changes are written. With --regeocode-all a re-run after a gazetteer edit
+touches just the records that edit moved. It always consults the persistent
+geocode cache first, so records geocode_locations.py placed precisely
+(Nominatim or the offline gazetteer) keep their cached coordinates instead
+of being moved to a jittered rule-table centroid.
+
+Progress is checkpointed as the highest id below which everything is
+committed, plus the location strings no tier resolves. --resume continues
+from there after a crash and skips the known-unresolvable strings.
+
+Every write also clears the record's country_code, so the next
+country_attribution.py run re-attributes it from the new position.
+
+At the end the summary rollups (rollup_stats.py) are refreshed for the
+years of the records that were written.
+"""
+
+import argparse
+import functools
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from checkpoint import DEFAULT_CHECKPOINT_PATH, Checkpoint
+from geocode_cache import DEFAULT_CACHE_PATH, GeocodeCache
+from geocode_report import GeocodeReport
+from location_resolver import DEFAULT_FUZZY_THRESHOLD, TIERS, LocationResolver, parse_locations
+from rollup_stats import refresh_rollup, year_of
+from table_scanner import TableScanner
+from upsert_writer import DEFAULT_DEAD_LETTER_PATH, BatchWriter
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def record_scanner(client: Client, include_geocoded: bool = False, workers: int = 4,
+                   prefetch: int = None, after: int = None) -> TableScanner:
+    """Keyset scanner over the records to geocode (with their current coordinates)."""
+    if include_geocoded:
+        logger.info("Scanning all records with a location...")
+    else:
+        logger.info("Scanning records without coordinates...")
+
+    def filters(query):
+        if not include_geocoded:
+            query = query.is_('latitude', 'null')
+        return query.not_.is_('location', 'null')
+
+    return TableScanner(client, 'id, location, latitude, longitude, occurred', filters=filters,
+                        workers=workers, prefetch=prefetch, after=after)
+
+
+def coordinate_updates(ids: np.ndarray, lat: np.ndarray, lng: np.ndarray) -> list:
+    """Build upsert payloads straight from coordinate arrays.
+
+    country_code is cleared in the same write: it was attributed from the old
+    position, and country_attribution.py re-attributes rows without one.
+    """
+    return [
+        {'id': i, 'latitude': a, 'longitude': b, 'country_code': None}
+        for i, a, b in zip(ids.tolist(), lat.tolist(), lng.tolist())
+    ]
+
+
+def log_tiers(tiers: Counter):
+    for tier in TIERS:
+        if tiers[tier]:
+            logger.info(f"    {tier:<10} {tiers[tier]}")
+
+
+def log_cache(resolve):
+    info = resolve.cache_info()
+    lookups = info.hits + info.misses
+    logger.info(f"  Resolver cache: {info.hits} hits, {info.misses} misses "
+                f"({100*info.hits/max(lookups,1):.1f}% hit rate, "
+                f"{info.currsize}/{info.maxsize} entries)")
+
+
+class RunStats:
+    """Counters shared by the resolver and writer stages."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.scanned = 0
+        self.geocoded = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.written = 0
+        self.tiers = Counter()
+        self.skip_samples = []
+
+
+def resolve_page(rows: list, resolve, stats: RunStats, known_unresolvable=frozenset()) -> Tuple[list, set]:
+    """Resolve one page of records.
+
+    Returns upserts for rows whose coordinates change, and the page's
+    unresolvable location strings. Rows whose location is in
+    known_unresolvable count as skipped without being resolved again.
+    """
+    known = [r for r in rows if r['location'] in known_unresolvable]
+    if known:
+        rows = [r for r in rows if r['location'] not in known_unresolvable]
+        with stats.lock:
+            stats.scanned += len(known)
+            stats.skipped += len(known)
+    if not rows:
+        return [], set()
+
+    ids = np.fromiter((r['id'] for r in rows), dtype=np.int64, count=len(rows))
+    lat, lng, tier_codes = parse_locations([r['location'] for r in rows], ids, resolve=resolve)
+    lat, lng = np.round(lat, 6), np.round(lng, 6)
+    resolved = tier_codes >= 0
+
+    # Only write rows whose coordinates actually move (NaN != anything)
+    old_lat = np.array([r.get('latitude') for r in rows], dtype=np.float64)
+    old_lng = np.array([r.get('longitude') for r in rows], dtype=np.float64)
+    same = (old_lat == lat) & (old_lng == lng)
+    changed = resolved & ~same
+
+    with stats.lock:
+        stats.scanned += len(rows)
+        for code, count in enumerate(np.bincount(tier_codes[resolved], minlength=len(TIERS))):
+            stats.tiers[TIERS[code]] += int(count)
+        stats.geocoded += int(resolved.sum())
+        stats.skipped += int(len(rows) - resolved.sum())
+        stats.unchanged += int((resolved & same).sum())
+        for i in np.flatnonzero(~resolved):
+            if len(stats.skip_samples) >= 20:
+                break
+            if rows[i]['location'] not in stats.skip_samples:
+                stats.skip_samples.append(rows[i]['location'])
+
+    unresolved = {rows[i]['location'] for i in np.flatnonzero(~resolved)}
+    return coordinate_updates(ids[changed], lat[changed], lng[changed]), unresolved
+
+
+def run(title: str, subtitle: str):
+    parser = argparse.ArgumentParser(description=title)
+    parser.add_argument('--batch-size', type=int, default=500, help='Update batch size')
+    parser.add_argument('--dry-run', action='store_true', help='Count only, no updates')
+    parser.add_argument('--report', type=str, default=None,
+                        help='With --dry-run, write per-tier counts/timings and top misses as JSON')
+    parser.add_argument('--cache-size', type=int, default=50000,
+                        help='Max distinct location strings kept in the resolver cache (LRU)')
+    parser.add_argument('--regeocode-all', action='store_true',
+                        help='Re-resolve records that already have coordinates and write the ones '
+                             'that changed; cached precise results take precedence over the rules')
+    parser.add_argument('--geocode-cache', type=str, default=None,
+                        help='Consult this persistent geocode cache (SQLite) before the rule tables '
+                             f'(--regeocode-all defaults to {os.path.basename(DEFAULT_CACHE_PATH)})')
+    parser.add_argument('--fuzzy-threshold', type=float, default=DEFAULT_FUZZY_THRESHOLD,
+                        help='Minimum trigram similarity (0-1) for a fuzzy city-name match')
+    parser.add_argument('--fetch-workers', type=int, default=4,
+                        help='Id-range partitions fetched concurrently')
+    parser.add_argument('--max-inflight', type=int, default=4,
+                        help='Pages buffered between the fetch and resolve stages')
+    parser.add_argument('--writers', type=int, default=8, help='Upsert batches in flight at once')
+    parser.add_argument('--dead-letter', type=str, default=DEFAULT_DEAD_LETTER_PATH,
+                        help='JSONL file for rows that fail on their own (with the error text)')
+    parser.add_argument('--checkpoint', type=str, default=DEFAULT_CHECKPOINT_PATH,
+                        help='Checkpoint file (committed high-water id + unresolvable strings)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue above the checkpoint high-water id and skip known-unresolvable strings')
+    parser.add_argument('--skip-rollup', action='store_true',
+                        help='Do not refresh the summary rollups for the years this run changed')
+    args = parser.parse_args()
+    if args.report and not args.dry_run:
+        parser.error('--report requires --dry-run')
+    if args.regeocode_all:
+        # Without the cache, rows geocoded precisely would be overwritten with rule centroids
+        args.geocode_cache = args.geocode_cache or DEFAULT_CACHE_PATH
+        if not os.path.exists(args.geocode_cache):
+            parser.error(f'--regeocode-all needs the geocode cache ({args.geocode_cache}); '
+                         'pass --geocode-cache')
+
+    logger.info("=" * 60)
+    logger.info(f"Signal 626 - {title}")
+    logger.info(subtitle)
+    logger.info("=" * 60)
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    cache = GeocodeCache(args.geocode_cache, legacy_json=None) if args.geocode_cache else None
+    resolver = LocationResolver(cache=cache, fuzzy_threshold=args.fuzzy_threshold)
+    if cache is not None:
+        hits, misses = cache.counts()
+        logger.info(f"Using geocode cache {args.geocode_cache} ({hits} hits, {misses} misses)")
+
+    # Each distinct location string is resolved once; jitter stays per record
+    resolve = functools.lru_cache(maxsize=args.cache_size)(resolver.resolve)
+
+    checkpoint = Checkpoint(args.checkpoint)
+    after = None
+    known_unresolvable = frozenset()
+    if args.resume and not args.dry_run:
+        if checkpoint.load() and checkpoint.high_water is not None:
+            after = checkpoint.high_water
+            known_unresolvable = frozenset(checkpoint.unresolvable)
+            logger.info(f"Resuming above id {after} from {args.checkpoint} "
+                        f"({len(known_unresolvable)} known-unresolvable locations)")
+        else:
+            logger.warning(f"No checkpoint at {args.checkpoint}, starting from the beginning")
+
+    scanner = record_scanner(client, include_geocoded=args.regeocode_all, workers=args.fetch_workers,
+                             prefetch=args.max_inflight, after=after)
+
+    if args.dry_run:
+        report = GeocodeReport(resolver)
+        for page in scanner.pages():
+            for r in page.rows:
+                start = time.perf_counter()
+                result = resolve(r['location'])
+                report.observe(r['location'], result, time.perf_counter() - start)
+        summary = report.to_dict()
+        logger.info(f"Would geocode: {report.resolved}/{report.records} ({summary['coverage_pct']:.1f}%)")
+        for tier, t in summary['tiers'].items():
+            if t['records'] or t['calls']:
+                logger.info(f"    {tier:<10} {t['records']:>7} records {t['unique']:>6} unique "
+                            f"{t['ms']:>9.1f} ms")
+        logger.info(f"  Latency per record p50 {summary['latency_us']['record']['p50']:.1f} us, "
+                    f"p99 {summary['latency_us']['record']['p99']:.1f} us "
+                    f"(uncached p50 {summary['latency_us']['unique']['p50']:.1f} us, "
+                    f"p99 {summary['latency_us']['unique']['p99']:.1f} us)")
+        log_cache(resolve)
+        if summary['fuzzy']:
+            logger.info(f"Fuzzy matches (threshold {args.fuzzy_threshold:.2f}), lowest score first:")
+            for m in summary['fuzzy'][:20]:
+                logger.info(f"  {m['score']:.2f}  {m['location']} -> {m['matched']} ({m['records']} records)")
+        logger.info(f"Still unresolvable: {summary['unresolved']['records']}")
+        # Most frequent unresolvable first
+        for m in summary['unresolved']['top'][:20]:
+            logger.info(f"  SKIP: {m['location']} ({m['records']})")
+        if args.report:
+            report.write(args.report)
+            logger.info(f"Report written to {args.report}")
+        return
+
+    # Pipeline: scanner threads -> resolver (this thread) -> writer pool.
+    # The scanner queue and the writer's in-flight slots are bounded, so a
+    # slow stage holds the others back and memory stays flat however large
+    # the table is.
+    stats = RunStats()
+
+    def written(rows):
+        checkpoint.rows_done(rows)
+        with stats.lock:
+            stats.written += len(rows)
+            logger.info(f"Updated batch: {stats.written} written, {stats.geocoded} geocoded, "
+                        f"{stats.unchanged} unchanged, {stats.skipped} skipped ({stats.scanned} scanned)")
+
+    bounds = scanner.bounds()
+    if bounds is None:
+        logger.info("No records to geocode!")
+        return
+    checkpoint.start(bounds[0])
+    touched_years = set()
+
+    try:
+        with BatchWriter(client, batch_size=args.batch_size, in_flight=args.writers, on_written=written,
+                         on_rejected=checkpoint.rows_failed, dead_letter=args.dead_letter) as writer:
+            for page in scanner.pages(bounds):
+                updates, unresolved = resolve_page(page.rows, resolve, stats, known_unresolvable)
+                checkpoint.add_unresolvable(unresolved)
+                # Register before writing, so the writer can't report rows first
+                checkpoint.begin_page(page.lo, page.hi, (u['id'] for u in updates))
+                writer.add_many(updates)
+                if updates:
+                    changed = {u['id'] for u in updates}
+                    touched_years.update(year_of(r.get('occurred')) for r in page.rows if r['id'] in changed)
+    finally:
+        checkpoint.save()
+
+    if not stats.scanned:
+        logger.info("No records to geocode!")
+        return
+
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE!")
+    logger.info(f"  Geocoded: {stats.geocoded}")
+    log_tiers(stats.tiers)
+    logger.info(f"  Written: {stats.written}")
+    logger.info(f"  Unchanged (not written): {stats.unchanged}")
+    logger.info(f"  Skipped: {stats.skipped}")
+    log_cache(resolve)
+    logger.info(f"  Writes: {writer.stats.summary()}")
+    if writer.stats.failed_rows:
+        logger.info(f"  Failed rows written to {args.dead_letter}")
+    logger.info(f"  Coverage: {100*stats.geocoded/max(stats.scanned,1):.1f}%")
+    logger.info(f"  Checkpoint: id {checkpoint.high_water}, {len(checkpoint.unresolvable)} "
+                f"unresolvable locations -> {args.checkpoint}")
+    failed_pages = checkpoint.failed_pages()
+    if failed_pages:
+        logger.warning(f"  {len(failed_pages)} page(s) had rejected rows (first: ids {failed_pages[0][0] + 1}-"
+                       f"{failed_pages[0][1]}); --resume will scan them again")
+    logger.info("=" * 60)
+
+    if touched_years and not args.skip_rollup:
+        refresh_rollup(client, touched_years, workers=args.fetch_workers)
+
+    if stats.skip_samples:
+        logger.info("Sample skipped locations:")
+        for loc in stats.skip_samples:
+            logger.info(f"  {loc}")
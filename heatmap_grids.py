@@ -0,0 +1,159 @@
+"""
+Signal 626 - Heatmap grid precomputation
+=========================================
+
+Precomputes the heatmap layer as sparse density grids per year and per
+shape at three resolutions, one per heatmap mode:
+
+    2.0 deg   clusters
+    0.5 deg   density
+    0.1 deg   precision
+
+A grid is a global row-major lattice (cell = row * cols + col, with row 0 at
+-90 lat and col 0 at -180 lng). Only non-empty cells are stored, as two
+little-endian columns sorted by cell:
+
+    cell   uint32[n]
+    count  uint32[n]
+
+public/heatmaps/{year}.bin holds one gzip member per (resolution, shape),
+plus an 'All' member per resolution. manifest.json records their byte
+offsets, so the map fetches just the member it draws (typically a few KB)
+instead of the year's points. --changed rebuilds only the years whose rollup
+was refreshed since their last build, i.e. the years a geocoding or import
+run touched.
+
+Usage:
+    python heatmap_grids.py               # every year
+    python heatmap_grids.py --changed
+    python heatmap_grids.py --years 2014
+"""
+
+import argparse
+import gzip
+import hashlib
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from sighting_points import Points, load_points, split_years
+from static_artifacts import build_years, changed_since_build, load_manifest
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEATMAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'heatmaps')
+GRID_VERSION = 1
+RESOLUTIONS = (2.0, 0.5, 0.1)
+ALL_SHAPES = 'All'
+
+
+def grid_shape(resolution: float) -> Tuple[int, int]:
+    """(rows, cols) of the global grid at this resolution."""
+    return int(round(180 / resolution)), int(round(360 / resolution))
+
+
+def grid_cells(lat: np.ndarray, lng: np.ndarray, resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Sparse 2-D histogram: sorted non-empty cell ids and their counts."""
+    rows, cols = grid_shape(resolution)
+    row = np.clip(np.floor((np.asarray(lat, dtype=np.float64) + 90) / resolution), 0, rows - 1).astype(np.int64)
+    col = np.clip(np.floor((np.asarray(lng, dtype=np.float64) + 180) / resolution), 0, cols - 1).astype(np.int64)
+    cells, counts = np.unique(row * cols + col, return_counts=True)
+    return cells.astype(np.uint32), counts.astype(np.uint32)
+
+
+def build_year(points: Points, resolutions: Sequence[float] = RESOLUTIONS, level: int = 9) -> Tuple[bytes, dict]:
+    """Encode one year's grids: an 'All' member and one per shape at each resolution."""
+    shapes = points.shape.astype(str)
+    groups = [(ALL_SHAPES, slice(None))] + [(str(s), shapes == s) for s in np.unique(shapes)]
+
+    parts, grids, offset = [], {}, 0
+    for resolution in resolutions:
+        members = grids[f"{resolution:g}"] = {}
+        for shape, sel in groups:
+            cells, counts = grid_cells(points.lat[sel], points.lng[sel], resolution)
+            data = gzip.compress(cells.astype('<u4').tobytes() + counts.astype('<u4').tobytes(),
+                                 compresslevel=level, mtime=0)
+            members[shape] = [offset, len(data), len(cells)]
+            parts.append(data)
+            offset += len(data)
+
+    blob = b''.join(parts)
+    return blob, {'count': len(points), 'bytes': len(blob), 'sha1': hashlib.sha1(blob).hexdigest(), 'grids': grids}
+
+
+def grid_manifest(out_dir: str, resolutions: Sequence[float]) -> dict:
+    return load_manifest(out_dir, GRID_VERSION, {'resolutions': [float(r) for r in resolutions],
+                                                 'columns': ['cell', 'count']})
+
+
+def build_grids(client: Client, out_dir: str = DEFAULT_HEATMAP_DIR, years: Optional[List[int]] = None,
+                resolutions: Sequence[float] = RESOLUTIONS, workers: int = 4) -> Dict[str, float]:
+    """Build the given years (None = all) and update the manifest."""
+    manifest = grid_manifest(out_dir, resolutions)
+    points = load_points(client, years, workers=workers, columns='id, latitude, longitude, occurred, shape')
+    counts = build_years(out_dir, manifest, split_years(points), years,
+                         lambda pts: build_year(pts, resolutions), 'built_at')
+    counts['points'] = len(points)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute sparse heatmap grids per year and shape')
+    parser.add_argument('--out', type=str, default=DEFAULT_HEATMAP_DIR, help='Output directory')
+    parser.add_argument('--years', type=str, default=None, help='Comma-separated years to build')
+    parser.add_argument('--changed', action='store_true',
+                        help='Only years whose rollup was refreshed since their last build')
+    parser.add_argument('--resolutions', type=str, default=','.join(f"{r:g}" for r in RESOLUTIONS),
+                        help='Comma-separated cell sizes in degrees')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    args = parser.parse_args()
+
+    resolutions = [float(r) for r in args.resolutions.split(',') if r.strip()]
+
+    logger.info("=" * 60)
+    logger.info("Signal 626 - Heatmap Grids")
+    logger.info(f"Output: {args.out} (resolutions {', '.join(f'{r:g}' for r in resolutions)} deg)")
+    logger.info("=" * 60)
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    years = None
+    if args.years:
+        years = sorted({int(y) for y in args.years.split(',') if y.strip()})
+    elif args.changed:
+        years = changed_since_build(client, grid_manifest(args.out, resolutions), 'built_at')
+        if not years:
+            logger.info("No years changed since the last build")
+            return
+        logger.info(f"Changed years: {', '.join(map(str, years))}")
+
+    start = time.time()
+    counts = build_grids(client, args.out, years, resolutions=resolutions, workers=args.fetch_workers)
+
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE! ({time.time() - start:.1f}s, gridding {counts['seconds']:.2f}s)")
+    logger.info(f"  Points: {counts['points']:,}")
+    logger.info(f"  Years written: {counts['written']} ({counts['unchanged']} unchanged, "
+                f"{counts['removed']} removed)")
+    logger.info(f"  Grid size: {counts['bytes'] / 1024:,.0f} KiB")
+    logger.info("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,18 +5,34 @@ Import NUFORC data from Hugging Face dataset (147,890 records!)
 Maps all fields to Supabase schema including:
 - location, shape, duration, occurred, reported
 - num_observers, characteristics, summary
+
+The input (JSON array, JSON Lines or Parquet, see record_readers.py) is
+streamed: rows are mapped and handed to the writer as they are parsed, so
+memory stays flat regardless of file size and the first batch is written
+right away. With --workers N the mapping (regexes and date parsing, the CPU
+bound part) runs in N processes; see benchmarks/bench_map_workers.py.
+
+Afterwards the summary rollups (rollup_stats.py) are refreshed for the years
+of the imported records, or rebuilt entirely after --clear.
 """
 
-import json
 import logging
 import os
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple
 
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from record_readers import read_records
+from rollup_stats import refresh_rollup, year_of
+from upsert_writer import DEFAULT_DEAD_LETTER_PATH, BatchWriter
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -74,13 +90,157 @@ def clean_string(value, max_length: int = 500) -> Optional[str]:
     return value[:max_length] if len(value) > max_length else value
 
 
+COLOR_PATTERNS = [
+    r'(?:color|colour|colored|coloured)\s+(?:was\s+)?(\w+)',
+    r'(\w+)\s+(?:color|colour|colored|coloured)',
+    r'(red|blue|green|white|yellow|orange|black|silver|gray|grey|purple|pink)\s+(?:light|glow|object)',
+]
+
+MAP_CHUNK = 1000
+
+
+def map_row(row: dict) -> Optional[tuple]:
+    """Map a dataset row to the values record_from_values needs (None if it can't be imported).
+
+    A plain tuple rather than the full record, so the result is cheap to send
+    back from a worker process.
+    """
+
+    # Get sighting ID
+    sighting_id = row.get('Sighting')
+    if not sighting_id:
+        return None
+
+    # Parse characteristics
+    characteristics = row.get('Characteristics', [])
+    if isinstance(characteristics, list):
+        characteristics_str = ', '.join(characteristics) if characteristics else None
+    else:
+        characteristics_str = clean_string(characteristics)
+
+    # Extract color from characteristics or text
+    color = None
+    text = row.get('Text', '') or ''
+    summary = row.get('Summary', '') or ''
+
+    # Try to extract color mentions
+    for pattern in COLOR_PATTERNS:
+        match = re.search(pattern, text + ' ' + summary, re.IGNORECASE)
+        if match:
+            color = match.group(1).capitalize()
+            break
+
+    occurred = parse_datetime(row.get('Occurred'))
+    location = clean_string(row.get('Location'))
+    shape = clean_string(row.get('Shape'), 100)
+
+    # Validate - must have at least one key field
+    if not location and not shape and not occurred:
+        return None
+
+    return (
+        int(sighting_id),
+        occurred,
+        parse_datetime(row.get('Reported')),
+        clean_string(row.get('Duration')),
+        clean_string(row.get('No of observers')),
+        location,
+        shape,
+        color,
+        characteristics_str,
+        clean_string(row.get('Text') or row.get('Summary'), 2000),
+    )
+
+
+def record_from_values(values: tuple) -> dict:
+    """Expand a map_row tuple into a full nuforc_sightings record."""
+    (sighting_id, occurred, reported, duration, num_observers, location, shape, color,
+     characteristics, summary) = values
+    return {
+        'id': sighting_id,
+        'url': f"https://nuforc.org/sighting/?id={sighting_id}",
+        'occurred': occurred,
+        'reported': reported,
+        'duration': duration,
+        'num_observers': num_observers,
+        'location': location,
+        'location_details': None,  # Not in this dataset
+        'shape': shape,
+        'color': color,
+        'estimated_size': None,  # Not in this dataset
+        'viewed_from': None,
+        'direction_from_viewer': None,
+        'angle_of_elevation': None,
+        'closest_distance': None,
+        'estimated_speed': None,
+        'characteristics': characteristics,
+        'summary': summary,
+    }
+
+
+def map_chunk(rows: list) -> Tuple[int, list]:
+    """Map a chunk of rows (in a worker process): (rows read, tuples of the valid ones)."""
+    mapped = []
+    for row in rows:
+        try:
+            values = map_row(row)
+        except Exception:
+            continue
+        if values:
+            mapped.append(values)
+    return len(rows), mapped
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_parallel(rows: Iterable[dict], workers: int, chunk_size: int = MAP_CHUNK,
+                 ordered: bool = True) -> Iterator[Tuple[int, list]]:
+    """map_chunk over chunks of rows in a process pool.
+
+    Yields (rows read, tuples) per chunk, in input order when ordered, else
+    as chunks finish. At most 2 * workers chunks are in flight, so memory
+    stays bounded however long the input is.
+    """
+    def finished(pending: deque) -> list:
+        if ordered:
+            return [pending.popleft()]
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+        return list(done)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunked(rows, chunk_size):
+            pending.append(pool.submit(map_chunk, chunk))
+            while len(pending) >= 2 * workers:
+                for future in finished(pending):
+                    yield future.result()
+        while pending:
+            for future in finished(pending):
+                yield future.result()
+
+
 class HuggingFaceImporter:
     def __init__(self):
         self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.touched_years = set()
+        self.read = self.valid = 0
         logger.info("Supabase connected")
 
-    def import_json(self, filepath: str, clear_first: bool = False) -> int:
-        """Import JSON file to Supabase."""
+    def import_file(self, filepath: str, clear_first: bool = False, writers: int = 8,
+                    dead_letter: Optional[str] = DEFAULT_DEAD_LETTER_PATH, fmt: Optional[str] = None,
+                    workers: int = 1, ordered: bool = True) -> int:
+        """Stream a JSON / JSONL / Parquet file into Supabase, mapping rows in `workers` processes."""
         logger.info("=" * 60)
         logger.info("NUFORC Hugging Face Importer (147,890 records)")
         logger.info(f"File: {filepath}")
@@ -93,130 +253,90 @@ class HuggingFaceImporter:
             except Exception as e:
                 logger.error(f"Error clearing: {e}")
 
-        # Read JSON
-        logger.info("Reading JSON file...")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        logger.info("Streaming records...")
+        self.read = self.valid = 0
+        if workers > 1:
+            logger.info(f"Mapping rows in {workers} processes ({'ordered' if ordered else 'unordered'})")
+        records = self._map_records(read_records(filepath, fmt), workers=workers, ordered=ordered)
+        saved = self._save_records(records, writers=writers, dead_letter=dead_letter)
 
-        logger.info(f"Total records in file: {len(data)}")
+        logger.info(f"Total records in file: {self.read:,}")
+        logger.info(f"Valid records: {self.valid:,}")
+        return saved
 
-        # Process records
-        records = []
-        for i, row in enumerate(data):
-            try:
-                record = self._map_record(row)
-                if record:
-                    records.append(record)
-            except Exception as e:
-                continue
+    def _map_records(self, rows: Iterable[dict], workers: int = 1, ordered: bool = True) -> Iterator[dict]:
+        """Map rows lazily, skipping the ones that can't be imported.
 
-            if (i + 1) % 20000 == 0:
-                logger.info(f"Processed {i + 1:,} rows...")
+        With workers > 1 the mapping runs in a process pool (see map_parallel).
+        """
+        if workers > 1:
+            chunks = map_parallel(rows, workers, ordered=ordered)
+        else:
+            chunks = (map_chunk(chunk) for chunk in chunked(rows, MAP_CHUNK))
 
-        logger.info(f"Valid records: {len(records):,}")
+        for read, mapped in chunks:
+            logged = self.read // 20000
+            self.read += read
+            self.valid += len(mapped)
+            for values in mapped:
+                yield record_from_values(values)
 
-        # Save to Supabase
-        return self._save_records(records)
+            if self.read // 20000 > logged:
+                logger.info(f"Processed {self.read:,} rows...")
 
     def _map_record(self, row: dict) -> Optional[dict]:
         """Map JSON record to Supabase schema."""
-
-        # Get sighting ID
-        sighting_id = row.get('Sighting')
-        if not sighting_id:
-            return None
-
-        # Parse characteristics
-        characteristics = row.get('Characteristics', [])
-        if isinstance(characteristics, list):
-            characteristics_str = ', '.join(characteristics) if characteristics else None
-        else:
-            characteristics_str = clean_string(characteristics)
-
-        # Extract color from characteristics or text
-        color = None
-        text = row.get('Text', '') or ''
-        summary = row.get('Summary', '') or ''
-
-        # Try to extract color mentions
-        color_patterns = [
-            r'(?:color|colour|colored|coloured)\s+(?:was\s+)?(\w+)',
-            r'(\w+)\s+(?:color|colour|colored|coloured)',
-            r'(red|blue|green|white|yellow|orange|black|silver|gray|grey|purple|pink)\s+(?:light|glow|object)',
-        ]
-        for pattern in color_patterns:
-            match = re.search(pattern, text + ' ' + summary, re.IGNORECASE)
-            if match:
-                color = match.group(1).capitalize()
-                break
-
-        # Build record
-        record = {
-            'id': int(sighting_id),
-            'url': f"https://nuforc.org/sighting/?id={sighting_id}",
-            'occurred': parse_datetime(row.get('Occurred')),
-            'reported': parse_datetime(row.get('Reported')),
-            'duration': clean_string(row.get('Duration')),
-            'num_observers': clean_string(row.get('No of observers')),
-            'location': clean_string(row.get('Location')),
-            'location_details': None,  # Not in this dataset
-            'shape': clean_string(row.get('Shape'), 100),
-            'color': color,
-            'estimated_size': None,  # Not in this dataset
-            'viewed_from': None,
-            'direction_from_viewer': None,
-            'angle_of_elevation': None,
-            'closest_distance': None,
-            'estimated_speed': None,
-            'characteristics': characteristics_str,
-            'summary': clean_string(row.get('Text') or row.get('Summary'), 2000),
-        }
-
-        # Validate - must have at least one key field
-        if not record['location'] and not record['shape'] and not record['occurred']:
-            return None
-
-        return record
-
-    def _save_records(self, records: list, batch_size: int = 500) -> int:
-        """Save records to Supabase in batches."""
-        total = 0
-
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-
-            try:
-                response = self.client.table('nuforc_sightings').upsert(
-                    batch,
-                    on_conflict='id'
-                ).execute()
-
-                if response.data:
-                    total += len(response.data)
-                    logger.info(f"Saved batch {i//batch_size + 1}: {len(response.data)} records (Total: {total:,})")
-
-            except Exception as e:
-                logger.error(f"Batch error: {e}")
-                # Try individual inserts
-                for record in batch:
-                    try:
-                        self.client.table('nuforc_sightings').upsert(
-                            record,
-                            on_conflict='id'
-                        ).execute()
-                        total += 1
-                    except:
-                        pass
-
-        return total
+        values = map_row(row)
+        return record_from_values(values) if values else None
+
+    def _save_records(self, records: Iterable[dict], batch_size: int = 500, writers: int = 8,
+                      dead_letter: Optional[str] = DEFAULT_DEAD_LETTER_PATH) -> int:
+        """Save records to Supabase in batches, `writers` batches in flight at once.
+
+        records may be a generator: adding to the writer blocks while all
+        `writers` batches are in flight, so at most that many are buffered.
+        """
+        progress = {'batches': 0, 'total': 0}
+        lock = threading.Lock()
+        start = time.time()
+
+        def saved(rows):
+            with lock:
+                progress['batches'] += 1
+                progress['total'] += len(rows)
+                self.touched_years.update(year_of(r['occurred']) for r in rows)
+                if progress['batches'] == 1:
+                    logger.info(f"First batch written {time.time() - start:.2f}s after start")
+                logger.info(f"Saved batch {progress['batches']}: {len(rows)} records (Total: {progress['total']:,})")
+
+        with BatchWriter(self.client, batch_size=batch_size, in_flight=writers,
+                         on_written=saved, dead_letter=dead_letter) as writer:
+            writer.add_many(records)
+
+        logger.info(f"Writes: {writer.stats.summary()}")
+        if writer.stats.failed_rows and dead_letter:
+            logger.warning(f"{writer.stats.failed_rows} rows could not be saved, see {dead_letter}")
+        return writer.stats.rows
 
 
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Import NUFORC from Hugging Face')
-    parser.add_argument('--file', type=str, default='nuforc_hf.json', help='JSON file')
+    parser.add_argument('--file', type=str, default='nuforc_hf.json',
+                        help='JSON array, JSON Lines (.jsonl) or Parquet file')
+    parser.add_argument('--format', type=str, choices=['json', 'jsonl', 'parquet'], default=None,
+                        help='Input format (default: from the file extension)')
     parser.add_argument('--clear', action='store_true', help='Clear existing data')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes mapping rows (1 = in the main process)')
+    parser.add_argument('--unordered', action='store_true',
+                        help='With --workers, write chunks as they finish instead of in file order')
+    parser.add_argument('--writers', type=int, default=8, help='Upsert batches in flight at once')
+    parser.add_argument('--dead-letter', type=str, default=DEFAULT_DEAD_LETTER_PATH,
+                        help='JSONL file for rows that fail on their own (with the error text)')
+    parser.add_argument('--skip-rollup', action='store_true',
+                        help='Do not refresh the summary rollups afterwards')
 
     args = parser.parse_args()
 
@@ -229,12 +349,17 @@ def main():
         return
 
     importer = HuggingFaceImporter()
-    saved = importer.import_json(filepath, clear_first=args.clear)
+    saved = importer.import_file(filepath, clear_first=args.clear, writers=args.writers,
+                                 dead_letter=args.dead_letter, fmt=args.format,
+                                 workers=args.workers, ordered=not args.unordered)
 
     logger.info("=" * 60)
     logger.info(f"COMPLETE! Imported {saved:,} records")
     logger.info("=" * 60)
 
+    if saved and not args.skip_rollup:
+        refresh_rollup(importer.client, None if args.clear else importer.touched_years)
+
 
 if __name__ == '__main__':
     main()
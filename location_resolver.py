@@ -0,0 +1,372 @@
+"""
+Signal 626 - Tiered Location Resolver
+======================================
+
+Single rule-based resolver used by fast_geocode.py and geocode_remaining.py.
+A NUFORC location string ("City, ST, Country", "City (UK/England), , ", ...)
+is tried against an ordered list of tiers; the first tier that recognises it
+wins and is reported alongside the coordinates:
+
+    cache       precise result from the persistent geocode cache (optional)
+    city        exact city name (international, or unqualified US/Canada)
+    state_city  city qualified by its US state / Canadian province
+    uk          "(UK/England)"-style records without a known city
+    state       US state centroid (code or full name)
+    province    Canadian province centroid
+    country     country/region alias anywhere in the string
+    fuzzy       closest city name by trigram similarity (fuzzy_index.py),
+                accepted at or above the resolver's fuzzy_threshold
+
+Resolutions are centroids without jitter; ``spread`` is the half-width in
+degrees over which callers scatter individual records. The scatter is derived
+from a hash of the sighting id and tier, so re-running a geocoder reproduces
+the same coordinates for every record whose resolution hasn't changed.
+``score`` is 1.0 except for fuzzy matches, which carry their similarity and
+the gazetteer name they matched.
+"""
+
+import hashlib
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from alias_matcher import AliasMatcher
+from fuzzy_index import TrigramIndex
+from gazetteer import (
+    CA_CITIES, CA_PROVINCES, COUNTRY_COORDS, INTL_CITIES, STATE_NAMES,
+    US_CITIES, US_STATES,
+)
+
+TIERS = ('cache', 'city', 'state_city', 'uk', 'state', 'province', 'country', 'fuzzy', 'implicit_usa')
+TIER_CODES = {tier: code for code, tier in enumerate(TIERS)}
+UNRESOLVED = -1
+
+# Jitter half-widths (degrees)
+CACHE_SPREAD = 0.0  # keep geocode_locations' precise coordinates as they are
+CITY_SPREAD = 0.02
+US_CITY_SPREAD = 0.05
+REGION_SPREAD = 0.5
+COUNTRY_SPREAD = 1.0
+
+DEFAULT_FUZZY_THRESHOLD = 0.6
+
+JUNK_LOCATIONS = ('', ',', ', ,', ', , ', 'Unspecified', ', , Unspecified')
+
+# Unqualified US/Canadian city names that are unambiguous across both tables
+_NA_CITY_NAMES: Dict[str, Tuple[float, float]] = {}
+_name_counts: Dict[str, int] = {}
+for (_name, _region), _coords in list(US_CITIES.items()) + list(CA_CITIES.items()):
+    _name_counts[_name] = _name_counts.get(_name, 0) + 1
+    _NA_CITY_NAMES[_name] = _coords
+for _name, _count in _name_counts.items():
+    if _count > 1:
+        del _NA_CITY_NAMES[_name]
+del _name_counts
+
+COUNTRY_MATCHER = AliasMatcher(COUNTRY_COORDS)
+
+# International names first, so they win a name shared with a US/Canadian city
+FUZZY_INDEX = TrigramIndex(
+    [(name, (lat, lng, CITY_SPREAD)) for name, (lat, lng) in INTL_CITIES.items()]
+    + [(name, (lat, lng, US_CITY_SPREAD)) for name, (lat, lng) in _NA_CITY_NAMES.items()]
+)
+
+
+class Resolution(NamedTuple):
+    lat: float
+    lng: float
+    tier: str
+    spread: float
+    score: float = 1.0
+    matched: str = ''
+
+
+class ParsedLocation(NamedTuple):
+    raw: str
+    loc: str
+    parts: List[str]
+    city_raw: str
+    city: str
+    paren: str
+    state: str
+    country: str
+
+
+def clean_city_name(city: str) -> str:
+    """Remove parenthetical notes and extra text from city names."""
+    # Remove (UK/England), (QLD, Australia), etc.
+    city = re.sub(r'\s*\([^)]*\)\s*', ' ', city).strip()
+    # Remove "approx", "near", "west of", etc. modifiers
+    city = re.sub(r'\s*(approx|near|north|south|east|west|outside|between)\s+.*$', '', city, flags=re.IGNORECASE).strip()
+    # Remove trailing commas/spaces
+    city = city.strip(', ')
+    return city
+
+
+def split_location(loc: str) -> Optional[ParsedLocation]:
+    """Split a raw location into city/state/country fields, or None if junk."""
+    if not loc or loc.strip() in JUNK_LOCATIONS:
+        return None
+
+    raw = loc
+    loc = loc.strip()
+    parts = [p.strip() for p in loc.split(',')]
+
+    # Extract any country info from parentheses in first part
+    paren_match = re.search(r'\(([^)]+)\)', parts[0])
+
+    return ParsedLocation(
+        raw=raw,
+        loc=loc,
+        parts=parts,
+        city_raw=parts[0],
+        city=clean_city_name(parts[0]),
+        paren=paren_match.group(1) if paren_match else '',
+        state=parts[1] if len(parts) >= 2 else '',
+        country=parts[2] if len(parts) >= 3 else '',
+    )
+
+
+def us_state_code(state: str) -> Optional[str]:
+    """Return the two-letter code for a US state code or full name."""
+    abbr = state.upper()
+    if len(abbr) == 2 and abbr in US_STATES:
+        return abbr
+    return STATE_NAMES.get(state.lower())
+
+
+class LocationResolver:
+    """Resolve location strings through the ordered tiers in TIERS.
+
+    If a GeocodeCache is given, its hits are used before any rule table;
+    cached misses fall through to the rules. Fuzzy matches scoring below
+    fuzzy_threshold (0.0-1.0) are rejected.
+    """
+
+    def __init__(self, cache=None, fuzzy_threshold: float = DEFAULT_FUZZY_THRESHOLD):
+        self.cache = cache
+        self.fuzzy_threshold = fuzzy_threshold
+        self.tiers: List[Tuple[str, Callable[[ParsedLocation], Optional[Resolution]]]] = [
+            ('cache', self._cached),
+            ('city', self._exact_city),
+            ('state_city', self._state_city),
+            ('uk', self._uk),
+            ('state', self._state),
+            ('province', self._province),
+            ('country', self._country),
+            ('fuzzy', self._fuzzy),
+            ('implicit_usa', self._implicit_usa),
+        ]
+
+    def resolve(self, loc: str) -> Optional[Resolution]:
+        """Return the first tier's Resolution for loc, or None."""
+        parsed = split_location(loc)
+        if parsed is None:
+            return None
+        for _name, tier in self.tiers:
+            result = tier(parsed)
+            if result is not None:
+                return result
+        return None
+
+    # -- tiers ---------------------------------------------------------
+
+    def _cached(self, p: ParsedLocation) -> Optional[Resolution]:
+        if self.cache is None:
+            return None
+        entry = self.cache.get(p.raw)
+        if entry is None or not entry.hit:
+            return None
+        lat, lng = entry.coords
+        return Resolution(lat, lng, 'cache', CACHE_SPREAD)
+
+    def _exact_city(self, p: ParsedLocation) -> Optional[Resolution]:
+        # A US/Canadian state qualifier is handled by the state_city tier;
+        # matching it here would send "Birmingham, AL" to England.
+        if us_state_code(p.state) or p.state.upper() in CA_PROVINCES:
+            return None
+        if p.city in INTL_CITIES:
+            lat, lng = INTL_CITIES[p.city]
+            return Resolution(lat, lng, 'city', CITY_SPREAD)
+        if (p.city in _NA_CITY_NAMES and not p.paren
+                and p.country.upper() in ('', 'USA', 'CANADA')):
+            lat, lng = _NA_CITY_NAMES[p.city]
+            return Resolution(lat, lng, 'city', US_CITY_SPREAD)
+        return None
+
+    def _state_city(self, p: ParsedLocation) -> Optional[Resolution]:
+        code = us_state_code(p.state)
+        if code:
+            coords = US_CITIES.get((p.city, code))
+        else:
+            coords = CA_CITIES.get((p.city, p.state.upper()))
+        if coords:
+            return Resolution(coords[0], coords[1], 'state_city', US_CITY_SPREAD)
+        return None
+
+    def _uk(self, p: ParsedLocation) -> Optional[Resolution]:
+        if 'UK/' not in p.paren and 'UK/' not in p.city_raw:
+            return None
+        if p.city in INTL_CITIES:
+            lat, lng = INTL_CITIES[p.city]
+            return Resolution(lat, lng, 'uk', CITY_SPREAD)
+        if 'Scotland' in p.paren:
+            lat, lng = COUNTRY_COORDS['Scotland']
+        elif 'Wales' in p.paren:
+            lat, lng = COUNTRY_COORDS['Wales']
+        elif 'Ireland' in p.paren:
+            lat, lng = COUNTRY_COORDS['Northern Ireland']
+        else:
+            lat, lng = COUNTRY_COORDS['England']
+        return Resolution(lat, lng, 'uk', REGION_SPREAD)
+
+    def _state(self, p: ParsedLocation) -> Optional[Resolution]:
+        code = us_state_code(p.state)
+        if code:
+            lat, lng = US_STATES[code]
+            return Resolution(lat, lng, 'state', REGION_SPREAD)
+        return None
+
+    def _province(self, p: ParsedLocation) -> Optional[Resolution]:
+        coords = CA_PROVINCES.get(p.state.upper())
+        if coords:
+            return Resolution(coords[0], coords[1], 'province', REGION_SPREAD)
+        return None
+
+    def _country(self, p: ParsedLocation) -> Optional[Resolution]:
+        # Match country from country field, parentheses, or full location
+        match = COUNTRY_MATCHER.longest(f"{p.country} {p.paren} {p.loc}")
+        if match:
+            lat, lng = match[1]
+            return Resolution(lat, lng, 'country', COUNTRY_SPREAD)
+        return None
+
+    def _fuzzy(self, p: ParsedLocation) -> Optional[Resolution]:
+        # Misspelled city names (e.g. "Milon Keynes", "Sydnee")
+        if len(p.city) < 4:
+            return None
+        match = FUZZY_INDEX.best(p.city, self.fuzzy_threshold)
+        if match:
+            name, (lat, lng, spread), score = match
+            return Resolution(lat, lng, 'fuzzy', spread, score, name)
+        return None
+
+    def _implicit_usa(self, p: ParsedLocation) -> Optional[Resolution]:
+        # "City, Somewhere" without a country field is assumed to be American
+        if len(p.parts) == 2:
+            lat, lng = COUNTRY_COORDS['USA']
+            return Resolution(lat, lng, 'implicit_usa', COUNTRY_SPREAD)
+        return None
+
+
+DEFAULT_RESOLVER = LocationResolver()
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def stable_hash(text: str) -> int:
+    """64-bit hash of a string that is stable across processes."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+TIER_SALTS: Dict[str, int] = {tier: stable_hash(tier) for tier in TIERS}
+# Implicit-USA rows were jittered as 'country' before the tier got its own
+# name; keep their salt so re-runs don't move already-written coordinates
+TIER_SALTS['implicit_usa'] = TIER_SALTS['country']
+_TIER_SALT_ARRAY = np.array([TIER_SALTS[tier] for tier in TIERS], dtype=np.uint64)
+
+
+def splitmix64(x: int) -> int:
+    """SplitMix64 finalizer: well-mixed 64-bit output for sequential input."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def jitter(result: Resolution, sighting_id: int) -> Tuple[float, float]:
+    """Scatter a centroid so records at the same place don't stack.
+
+    The offset is a pure function of (sighting_id, tier), uniform over
+    [-spread, spread) on each axis.
+    """
+    h = splitmix64((sighting_id ^ TIER_SALTS[result.tier]) & _MASK64)
+    dx = (h >> 32) / 2**32 * 2 - 1
+    dy = (h & 0xFFFFFFFF) / 2**32 * 2 - 1
+    return (result.lat + dx * result.spread,
+            result.lng + dy * result.spread)
+
+
+def parse_location(loc: str, sighting_id: Optional[int] = None) -> Optional[Tuple[float, float]]:
+    """Parse a location string and return jittered (lat, lng) or None.
+
+    Without a sighting id the jitter is keyed on the location string itself.
+    """
+    result = DEFAULT_RESOLVER.resolve(loc)
+    if result is None:
+        return None
+    if sighting_id is None:
+        sighting_id = stable_hash(loc)
+    return jitter(result, sighting_id)
+
+
+def _splitmix64_array(x: np.ndarray) -> np.ndarray:
+    """Vectorized splitmix64 over a uint64 array (wrapping arithmetic)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def jitter_offsets(ids: np.ndarray, tier_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit offsets in [-1, 1) per record; matches jitter() element for element."""
+    salts = _TIER_SALT_ARRAY[np.maximum(tier_codes, 0)]
+    h = _splitmix64_array(ids.astype(np.uint64) ^ salts)
+    dx = (h >> np.uint64(32)).astype(np.float64) / 2**32 * 2 - 1
+    dy = (h & np.uint64(0xFFFFFFFF)).astype(np.float64) / 2**32 * 2 - 1
+    return dx, dy
+
+
+def parse_locations(
+    locations: Sequence[str],
+    ids: Sequence[int],
+    resolve: Optional[Callable[[str], Optional[Resolution]]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Batch form of parse_location for a column of locations and their ids.
+
+    Each distinct string is resolved once into an integer-coded table of
+    centroids; records then gather from it and are jittered in one
+    vectorized pass. Returns float64 ``lat`` and ``lng`` arrays (NaN where
+    unresolved) and an int8 tier-code array (index into TIERS, or
+    UNRESOLVED).
+    """
+    resolve = resolve or DEFAULT_RESOLVER.resolve
+    ids = np.asarray(ids, dtype=np.int64)
+
+    # Integer-code the distinct location strings
+    codes: Dict[str, int] = {}
+    loc_codes = np.fromiter(
+        (codes.setdefault(loc, len(codes)) for loc in locations),
+        dtype=np.int64, count=len(ids),
+    )
+
+    table_lat = np.full(len(codes), np.nan)
+    table_lng = np.full(len(codes), np.nan)
+    table_spread = np.zeros(len(codes))
+    table_tier = np.full(len(codes), UNRESOLVED, dtype=np.int8)
+    for loc, code in codes.items():
+        result = resolve(loc)
+        if result is not None:
+            table_lat[code] = result.lat
+            table_lng[code] = result.lng
+            table_spread[code] = result.spread
+            table_tier[code] = TIER_CODES[result.tier]
+
+    tier_codes = table_tier[loc_codes]
+    spread = table_spread[loc_codes]
+    dx, dy = jitter_offsets(ids, tier_codes)
+    lat = table_lat[loc_codes] + dx * spread
+    lng = table_lng[loc_codes] + dy * spread
+    return lat, lng, tier_codes
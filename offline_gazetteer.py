@@ -0,0 +1,247 @@
+"""
+Signal 626 - Offline Gazetteer (GeoNames cities dump)
+======================================================
+
+Local geocoding backend for geocode_locations.py. A GeoNames cities dump
+(cities500.txt / cities1000.txt / cities15000.txt, or the .zip it ships in,
+from https://download.geonames.org/export/dump/) is compiled once into a
+compact index directory:
+
+    keys.npy     uint64  sorted hashes of normalized (name, admin1, country)
+    coords.npy   float32 (n, 2) latitude/longitude per key
+    meta.json    source file size/mtime, used to detect a stale index
+
+Both arrays are opened memory-mapped, so loading is near-instant and a lookup
+is one binary search. Where several places share a key the most populous
+one wins, and every place is also indexed without its admin1 code (and
+without its country) so partially qualified locations still resolve.
+
+Usage:
+    python offline_gazetteer.py cities500.zip                 # build index
+    python offline_gazetteer.py cities500.zip --query "Leeds (UK/England), , "
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+import zipfile
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from alias_matcher import AliasMatcher
+from gazetteer import CA_ADMIN1, COUNTRY_ISO2, UK_ADMIN1
+from location_resolver import split_location, us_state_code
+
+logger = logging.getLogger(__name__)
+
+# GeoNames dump columns
+COL_NAME, COL_ASCIINAME, COL_LAT, COL_LNG = 1, 2, 4, 5
+COL_COUNTRY, COL_ADMIN1, COL_POPULATION = 8, 10, 14
+
+COUNTRY_MATCHER = AliasMatcher(COUNTRY_ISO2)
+_COUNTRY_ISO2_LOWER = {name.lower(): code for name, code in COUNTRY_ISO2.items()}
+
+_ABBREVIATIONS = {'saint': 'st', 'sainte': 'ste', 'fort': 'ft', 'mount': 'mt'}
+
+
+def normalize_name(name: str) -> str:
+    """Accent-free, lowercase, punctuation-free place name ("St. Louis" -> "st louis")."""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    name = re.sub(r"[.'`]", '', name)
+    name = re.sub(r'[^a-z0-9]+', ' ', name).strip()
+    return ' '.join(_ABBREVIATIONS.get(w, w) for w in name.split())
+
+
+def key_hash(name: str, admin1: str = '', country: str = '') -> int:
+    """64-bit hash of a normalized (name, admin1, country) key."""
+    raw = f"{name}|{admin1.upper()}|{country.upper()}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), 'little')
+
+
+def query_keys(location: str) -> List[Tuple[str, str, str]]:
+    """Candidate (name, admin1, country) keys for a NUFORC location, most specific first."""
+    p = split_location(location)
+    if p is None:
+        return []
+    name = normalize_name(p.city)
+    if not name:
+        return []
+
+    country = _COUNTRY_ISO2_LOWER.get(p.country.lower(), '')
+    admin1 = ''
+
+    state_code = us_state_code(p.state)
+    if state_code and country in ('', 'US'):
+        country, admin1 = 'US', state_code
+    elif p.state.upper() in CA_ADMIN1 and country in ('', 'CA'):
+        country, admin1 = 'CA', CA_ADMIN1[p.state.upper()]
+    elif p.paren:
+        # "Leeds (UK/England)", "Perth (Western Australia)"
+        region = p.paren.split('/', 1)[1].strip() if '/' in p.paren else ''
+        if p.paren.startswith('UK'):
+            country, admin1 = 'GB', UK_ADMIN1.get(region, '')
+        elif not country:
+            match = COUNTRY_MATCHER.longest(p.paren)
+            if match:
+                country = match[1]
+
+    keys = []
+    if admin1:
+        keys.append((name, admin1, country))
+    if country:
+        keys.append((name, '', country))
+    else:
+        keys.append((name, '', ''))
+    return keys
+
+
+def _open_dump(path: str) -> io.TextIOBase:
+    if path.lower().endswith('.zip'):
+        archive = zipfile.ZipFile(path)
+        member = next(n for n in archive.namelist() if n.endswith('.txt'))
+        return io.TextIOWrapper(archive.open(member), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _iter_places(path: str) -> Iterator[Tuple[List[int], float, float, int]]:
+    """Yield (key hashes, lat, lng, population) for each place in the dump."""
+    with _open_dump(path) as f:
+        for line in f:
+            cols = line.rstrip('\n').split('\t')
+            if len(cols) <= COL_POPULATION:
+                continue
+            try:
+                lat, lng = float(cols[COL_LAT]), float(cols[COL_LNG])
+            except ValueError:
+                continue
+            population = int(cols[COL_POPULATION] or 0)
+            names = {normalize_name(cols[COL_NAME]), normalize_name(cols[COL_ASCIINAME])}
+            country, admin1 = cols[COL_COUNTRY], cols[COL_ADMIN1]
+            keys = []
+            for name in names:
+                if not name:
+                    continue
+                keys.append(key_hash(name, admin1, country))
+                keys.append(key_hash(name, '', country))
+                keys.append(key_hash(name))
+            yield keys, lat, lng, population
+
+
+def build_index(source: str, index_dir: str) -> int:
+    """Compile a GeoNames dump into index_dir. Returns the number of keys."""
+    start = time.time()
+    hashes, lats, lngs, pops = [], [], [], []
+    for keys, lat, lng, population in _iter_places(source):
+        hashes.extend(keys)
+        lats.extend([lat] * len(keys))
+        lngs.extend([lng] * len(keys))
+        pops.extend([population] * len(keys))
+
+    hashes = np.array(hashes, dtype=np.uint64)
+    pops = np.array(pops, dtype=np.int64)
+    # Sort by key, most populous first, and keep the first row of each key
+    order = np.lexsort((-pops, hashes))
+    hashes = hashes[order]
+    first = np.ones(len(hashes), dtype=bool)
+    first[1:] = hashes[1:] != hashes[:-1]
+    keep = order[first]
+
+    coords = np.empty((len(keep), 2), dtype=np.float32)
+    coords[:, 0] = np.asarray(lats, dtype=np.float64)[keep]
+    coords[:, 1] = np.asarray(lngs, dtype=np.float64)[keep]
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, 'keys.npy'), hashes[first])
+    np.save(os.path.join(index_dir, 'coords.npy'), coords)
+    stat = os.stat(source)
+    with open(os.path.join(index_dir, 'meta.json'), 'w') as f:
+        json.dump({
+            'source': os.path.abspath(source),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'entries': int(len(keep)),
+        }, f)
+
+    logger.info(f"Built gazetteer index: {len(keep):,} keys in {time.time() - start:.1f}s -> {index_dir}")
+    return len(keep)
+
+
+def _index_is_fresh(source: str, index_dir: str) -> bool:
+    meta_path = os.path.join(index_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, 'r') as f:
+        meta = json.load(f)
+    stat = os.stat(source)
+    return meta.get('size') == stat.st_size and meta.get('mtime') == stat.st_mtime
+
+
+class OfflineGazetteer:
+    """Memory-mapped (name, admin1, country) -> (lat, lng) index."""
+
+    name = 'geonames'
+
+    def __init__(self, source: str, index_dir: Optional[str] = None):
+        index_dir = index_dir or os.path.splitext(source)[0] + '.idx'
+        if not _index_is_fresh(source, index_dir):
+            logger.info(f"Building gazetteer index from {source} (one-time)...")
+            build_index(source, index_dir)
+        self.keys = np.load(os.path.join(index_dir, 'keys.npy'), mmap_mode='r')
+        self.coords = np.load(os.path.join(index_dir, 'coords.npy'), mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, name: str, admin1: str = '', country: str = '') -> Optional[Tuple[float, float]]:
+        h = np.uint64(key_hash(name, admin1, country))
+        i = int(self.keys.searchsorted(h))
+        if i < len(self.keys) and self.keys[i] == h:
+            lat, lng = self.coords[i]
+            return (round(float(lat), 5), round(float(lng), 5))
+        return None
+
+    def geocode(self, location: str) -> Optional[Tuple[float, float]]:
+        """Resolve a raw NUFORC location string, or None if not in the index."""
+        for key in query_keys(location):
+            coords = self.lookup(*key)
+            if coords:
+                return coords
+        return None
+
+
+def main():
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    parser = argparse.ArgumentParser(description='Build/query the offline GeoNames gazetteer index')
+    parser.add_argument('source', help='GeoNames cities dump (.txt or .zip)')
+    parser.add_argument('--index-dir', type=str, default=None, help='Index directory (default: <source>.idx)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild even if the index is fresh')
+    parser.add_argument('--query', type=str, action='append', default=[], help='Location to look up')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        build_index(args.source, args.index_dir or os.path.splitext(args.source)[0] + '.idx')
+
+    start = time.time()
+    gazetteer = OfflineGazetteer(args.source, args.index_dir)
+    logger.info(f"Loaded {len(gazetteer):,} keys in {1000 * (time.time() - start):.0f} ms")
+
+    for location in args.query:
+        logger.info(f"  {location!r} -> {gazetteer.geocode(location)}")
+
+
+if __name__ == '__main__':
+    main()
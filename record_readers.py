@@ -0,0 +1,155 @@
+"""
+Signal 626 - Streaming record readers
+======================================
+
+Iterate over the records of a dataset file one at a time, without loading
+the file, so an import's memory does not grow with the input:
+
+    .json              a top-level JSON array, parsed incrementally with
+                       json.JSONDecoder.raw_decode over a sliding buffer
+    .jsonl / .ndjson   one JSON object per line
+    .parquet           row groups read lazily in record batches (needs
+                       pyarrow: pip install pyarrow)
+
+A .json file whose first character is not '[' is read as JSON Lines, since
+exports often use .json for both.
+
+Usage:
+    for row in read_records('nuforc_hf.jsonl'):
+        ...
+"""
+
+import json
+import logging
+import os
+import sys
+from typing import Iterator, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK = 1 << 16
+PARQUET_BATCH = 2048
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+def iter_json_array(f: TextIO, chunk_size: int = READ_CHUNK) -> Iterator:
+    """Yield the elements of a top-level JSON array from a text stream.
+
+    Only the current element plus one read chunk is held in memory. An
+    element is accepted only once something other than a number character
+    follows it (or at EOF), so a number split across reads is never yielded
+    half-parsed.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != '[':
+        raise ValueError("Expected a JSON array ('[') at the start of the file")
+    pos += 1
+
+    skip_whitespace()
+    if pos < len(buf) and buf[pos] == ']':
+        return
+
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                if eof or (end < len(buf) and (buf[end] not in _NUMBER_CHARS
+                                               or buf[end:].strip(_NUMBER_CHARS))):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+        pos = end
+        yield value
+
+        skip_whitespace()
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of file inside the JSON array")
+        if buf[pos] == ']':
+            return
+        if buf[pos] != ',':
+            raise ValueError(f"Expected ',' or ']' in the JSON array, got {buf[pos]!r}")
+        pos += 1
+
+
+def iter_json_lines(f: TextIO) -> Iterator[dict]:
+    """Yield one record per non-blank line."""
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_no}: {e}") from e
+
+
+def iter_parquet(path: str, batch_size: int = PARQUET_BATCH) -> Iterator[dict]:
+    """Yield rows of a Parquet file, reading one record batch at a time."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.error("Please install pyarrow to read Parquet: pip install pyarrow")
+        sys.exit(1)
+
+    parquet = pq.ParquetFile(path)
+    logger.info(f"Parquet: {parquet.metadata.num_rows:,} rows in {parquet.num_row_groups} row group(s)")
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.parquet', '.pq'):
+        return 'parquet'
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            ch = f.read(1)
+            if not ch or ch not in _WHITESPACE + '\ufeff':
+                return 'json' if ch == '[' else 'jsonl'
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[dict]:
+    """Stream the records of a JSON array, JSON Lines or Parquet file.
+
+    fmt is 'json', 'jsonl' or 'parquet'; None detects it from the extension
+    and, for .json, the first character.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == 'parquet':
+        yield from iter_parquet(path)
+        return
+    if fmt not in ('json', 'jsonl'):
+        raise ValueError(f"Unknown input format: {fmt}")
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if fmt == 'json':
+            yield from iter_json_array(f)
+        else:
+            yield from iter_json_lines(f)
@@ -0,0 +1,273 @@
+"""
+Signal 626 - Summary rollups
+=============================
+
+Materializes the counts the dashboard reads on every cold request (reports
+per year, per shape, totals and coordinate coverage) into the small
+sighting_rollup table, one row per (year, shape):
+
+    year       occurrence year, 0 when the record has no date
+    shape      reported shape, '' when missing
+    total      records
+    geocoded   records with coordinates
+
+A full run rebuilds every row in one streaming pass over the table. An
+incremental run (--years, or refresh_rollup(client, years) from the import
+and geocode scripts) only rescans the given years, using occurred range
+filters, and replaces just those rows. Rows for (year, shape) pairs that no
+longer occur are deleted.
+
+The read RPCs in setup.sql (get_rollup_year_counts, get_rollup_shape_counts,
+get_rollup_totals) aggregate this table instead of nuforc_sightings.
+
+Usage:
+    python rollup_stats.py                     # full rebuild
+    python rollup_stats.py --years 1999,2004   # recompute only these years
+    python rollup_stats.py --dry-run           # compute and print, no writes
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from table_scanner import TableScanner
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE = 'sighting_rollup'
+UNKNOWN_YEAR = 0
+UNKNOWN_SHAPE = ''
+SCAN_COLUMNS = 'id, occurred, shape, latitude, longitude'
+
+
+def utc_now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def year_of(occurred) -> int:
+    """Year of an ISO occurred timestamp (UNKNOWN_YEAR if missing or malformed)."""
+    if not occurred:
+        return UNKNOWN_YEAR
+    try:
+        return int(str(occurred)[:4])
+    except ValueError:
+        return UNKNOWN_YEAR
+
+
+def year_ranges(years: Iterable[int]) -> List[Tuple[int, int]]:
+    """Collapse years into inclusive (first, last) runs of consecutive years.
+
+    UNKNOWN_YEAR always stays a run of its own.
+    """
+    ranges = []
+    for year in sorted(set(years)):
+        if ranges and year == ranges[-1][1] + 1 and ranges[-1][0] != UNKNOWN_YEAR:
+            ranges[-1] = (ranges[-1][0], year)
+        else:
+            ranges.append((year, year))
+    return ranges
+
+
+def year_filter(first: int, last: int) -> Callable:
+    """TableScanner filter selecting records that occurred in [first, last]."""
+    if first == UNKNOWN_YEAR:
+        return lambda query: query.is_('occurred', 'null')
+    return lambda query: (query.gte('occurred', f"{first:04d}-01-01T00:00:00")
+                          .lt('occurred', f"{last + 1:04d}-01-01T00:00:00"))
+
+
+class Rollup:
+    """(year, shape) -> total / geocoded counts, built from scanned rows."""
+
+    def __init__(self):
+        self.total = Counter()
+        self.geocoded = Counter()
+
+    def add_rows(self, rows: list):
+        for r in rows:
+            key = (year_of(r.get('occurred')), r.get('shape') or UNKNOWN_SHAPE)
+            self.total[key] += 1
+            if r.get('latitude') is not None and r.get('longitude') is not None:
+                self.geocoded[key] += 1
+
+    @property
+    def records(self) -> int:
+        return sum(self.total.values())
+
+    def rows(self) -> List[dict]:
+        now = utc_now()
+        return [
+            {'year': year, 'shape': shape, 'total': total,
+             'geocoded': self.geocoded[(year, shape)], 'updated_at': now}
+            for (year, shape), total in sorted(self.total.items())
+        ]
+
+
+def compute_rollup(client: Client, years: Optional[Iterable[int]] = None, workers: int = 4) -> Rollup:
+    """Scan the table (or only the given years) and count it."""
+    rollup = Rollup()
+    if years is None:
+        scans = [TableScanner(client, SCAN_COLUMNS, workers=workers)]
+    else:
+        scans = [TableScanner(client, SCAN_COLUMNS, filters=year_filter(first, last), workers=workers)
+                 for first, last in year_ranges(years)]
+
+    for scanner in scans:
+        for page in scanner.pages():
+            rollup.add_rows(page.rows)
+    return rollup
+
+
+def existing_keys(client: Client) -> Set[Tuple[int, str]]:
+    keys, offset = set(), 0
+    while True:
+        result = (client.table(ROLLUP_TABLE).select('year, shape')
+                  .order('year').order('shape').range(offset, offset + 999).execute())
+        keys.update((r['year'], r['shape']) for r in result.data)
+        if len(result.data) < 1000:
+            return keys
+        offset += 1000
+
+
+def year_updated_at(client: Client) -> Dict[int, datetime]:
+    """Last rollup refresh per year: downstream builds use it to find changed years."""
+    updated, offset = {}, 0
+    while True:
+        result = (client.table(ROLLUP_TABLE).select('year, updated_at')
+                  .order('year').order('shape').range(offset, offset + 999).execute())
+        for r in result.data:
+            at = parse_utc(r['updated_at'])
+            if r['year'] not in updated or at > updated[r['year']]:
+                updated[r['year']] = at
+        if len(result.data) < 1000:
+            return updated
+        offset += 1000
+
+
+def changed_years(client: Client, exported_at: Dict[int, str]) -> List[int]:
+    """Years to rebuild in a derived artifact, given when each year was last built.
+
+    That is every year whose rollup was refreshed after its last build (or that
+    was never built), plus built years that dropped out of the rollup.
+    """
+    updated = year_updated_at(client)
+    years = {y for y, at in updated.items()
+             if y != UNKNOWN_YEAR and (y not in exported_at or at > parse_utc(exported_at[y]))}
+    years.update(y for y in exported_at if y not in updated)
+    return sorted(years)
+
+
+def parse_utc(stamp: str) -> datetime:
+    at = datetime.fromisoformat(stamp.replace('Z', '+00:00'))
+    return at if at.tzinfo else at.replace(tzinfo=timezone.utc)
+
+
+def write_rollup(client: Client, rollup: Rollup, years: Optional[Iterable[int]] = None,
+                 batch_size: int = 1000) -> Tuple[int, int]:
+    """Upsert the rollup rows, then delete stale rows in scope.
+
+    Scope is every year when years is None, otherwise only those years.
+    Returns (rows upserted, rows deleted).
+    """
+    rows = rollup.rows()
+    for i in range(0, len(rows), batch_size):
+        client.table(ROLLUP_TABLE).upsert(rows[i:i + batch_size], on_conflict='year,shape').execute()
+
+    scope = None if years is None else set(years)
+    stale: Dict[int, List[str]] = {}
+    for year, shape in existing_keys(client):
+        if (scope is None or year in scope) and (year, shape) not in rollup.total:
+            stale.setdefault(year, []).append(shape)
+    for year, shapes in stale.items():
+        client.table(ROLLUP_TABLE).delete().eq('year', year).in_('shape', shapes).execute()
+    return len(rows), sum(len(s) for s in stale.values())
+
+
+def refresh_rollup(client: Client, years: Optional[Iterable[int]] = None, workers: int = 4) -> Rollup:
+    """Recompute and store the rollup; called at the end of the import/geocode scripts.
+
+    Errors are logged rather than raised: the rows the script wrote are
+    already committed and a later full run repairs the summary.
+    """
+    if years is not None:
+        years = sorted(set(years))
+        if not years:
+            return Rollup()
+    scope = 'all years' if years is None else f"{len(years)} year(s)"
+    start = time.time()
+    try:
+        rollup = compute_rollup(client, years, workers=workers)
+        upserted, deleted = write_rollup(client, rollup, years)
+    except Exception as e:
+        logger.error(f"Rollup refresh failed ({scope}), run rollup_stats.py to rebuild: {e}")
+        return Rollup()
+    logger.info(f"Rollup refreshed for {scope}: {rollup.records:,} records -> {upserted} rows "
+                f"({deleted} stale removed) in {time.time() - start:.1f}s")
+    return rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Materialize year/shape summary counts')
+    parser.add_argument('--years', type=str, default=None,
+                        help='Comma-separated years to recompute (0 = undated); default rebuilds all')
+    parser.add_argument('--dry-run', action='store_true', help='Compute and print, no writes')
+    parser.add_argument('--fetch-workers', type=int, default=4, help='Id-range partitions fetched concurrently')
+    args = parser.parse_args()
+
+    years = None
+    if args.years:
+        years = sorted({int(y) for y in args.years.split(',') if y.strip()})
+
+    logger.info("=" * 60)
+    logger.info("Signal 626 - Summary Rollups")
+    logger.info(f"Scope: {'all years' if years is None else ', '.join(map(str, years))}")
+    logger.info("=" * 60)
+
+    client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logger.info("Connected to Supabase")
+
+    start = time.time()
+    if args.dry_run:
+        rollup = compute_rollup(client, years, workers=args.fetch_workers)
+    else:
+        rollup = refresh_rollup(client, years, workers=args.fetch_workers)
+
+    geocoded = sum(rollup.geocoded.values())
+    by_year, by_shape = Counter(), Counter()
+    for (year, shape), total in rollup.total.items():
+        by_year[year] += total
+        if shape:
+            by_shape[shape] += total
+
+    logger.info("=" * 60)
+    logger.info(f"COMPLETE! ({time.time() - start:.1f}s)")
+    logger.info(f"  Records: {rollup.records:,}")
+    logger.info(f"  Geocoded: {geocoded:,} ({100 * geocoded / max(rollup.records, 1):.1f}%)")
+    logger.info(f"  Years: {len([y for y in by_year if y != UNKNOWN_YEAR])} "
+                f"({by_year[UNKNOWN_YEAR]:,} undated records)")
+    logger.info(f"  Rows: {len(rollup.total)} (year, shape) pairs")
+    logger.info("  Top shapes:")
+    for shape, count in by_shape.most_common(10):
+        logger.info(f"    {shape:<12} {count:,}")
+    logger.info("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,14 +3,16 @@
 -- Run this in Supabase Dashboard → SQL Editor
 -- ============================================================
 
--- Step 1: Add latitude/longitude columns
+-- Step 1: Add latitude/longitude columns (and country_code, filled by country_attribution.py)
 ALTER TABLE nuforc_sightings ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
 ALTER TABLE nuforc_sightings ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+ALTER TABLE nuforc_sightings ADD COLUMN IF NOT EXISTS country_code TEXT;
 
 -- Step 2: Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_sightings_occurred ON nuforc_sightings (occurred);
 CREATE INDEX IF NOT EXISTS idx_sightings_coords ON nuforc_sightings (latitude, longitude) WHERE latitude IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_sightings_shape ON nuforc_sightings (shape);
+CREATE INDEX IF NOT EXISTS idx_sightings_country ON nuforc_sightings (country_code, occurred);
 
 -- Step 3: Create an RPC function for year counts (only records with coordinates)
 CREATE OR REPLACE FUNCTION get_year_counts()
@@ -37,6 +39,8 @@ RETURNS TABLE(shape TEXT, count BIGINT) AS $$
 $$ LANGUAGE sql STABLE;
 
 -- Step 5: Create an RPC for sightings by year (optimized)
+-- (dropped first: adding country_code changed the return type)
+DROP FUNCTION IF EXISTS get_sightings_by_year(INT, TEXT);
 CREATE OR REPLACE FUNCTION get_sightings_by_year(target_year INT, shape_filter TEXT DEFAULT NULL)
 RETURNS TABLE(
   id INT,
@@ -44,9 +48,10 @@ RETURNS TABLE(
   longitude DOUBLE PRECISION,
   shape TEXT,
   occurred TIMESTAMPTZ,
-  location TEXT
+  location TEXT,
+  country_code TEXT
 ) AS $$
-  SELECT s.id, s.latitude, s.longitude, s.shape, s.occurred, s.location
+  SELECT s.id, s.latitude, s.longitude, s.shape, s.occurred, s.location, s.country_code
   FROM nuforc_sightings s
   WHERE EXTRACT(YEAR FROM s.occurred) = target_year
     AND s.latitude IS NOT NULL
@@ -54,6 +59,125 @@ RETURNS TABLE(
     AND (shape_filter IS NULL OR shape_filter = 'All' OR s.shape = shape_filter);
 $$ LANGUAGE sql STABLE;
 
+-- Step 6: Bulk coordinate apply for the geocoders
+-- Both take a JSON array and write it in one set-based UPDATE, returning the
+-- number of rows changed:
+--   apply_location_coordinates('[{"location": "Leeds (UK/England), , ", "lat": 53.8, "lng": -1.55}]')
+--   apply_id_coordinates('[{"id": 42, "lat": 53.8, "lng": -1.55}]')
+CREATE INDEX IF NOT EXISTS idx_sightings_location_ungeocoded ON nuforc_sightings (location) WHERE latitude IS NULL;
+
+CREATE OR REPLACE FUNCTION apply_location_coordinates(payload JSONB)
+RETURNS INTEGER AS $$
+  WITH updated AS (
+    UPDATE nuforc_sightings s
+    SET latitude = p.lat, longitude = p.lng
+    FROM jsonb_to_recordset(payload) AS p(location TEXT, lat DOUBLE PRECISION, lng DOUBLE PRECISION)
+    WHERE s.location = p.location
+      AND s.latitude IS NULL
+    RETURNING 1
+  )
+  SELECT COUNT(*)::INT FROM updated;
+$$ LANGUAGE sql VOLATILE;
+
+CREATE OR REPLACE FUNCTION apply_id_coordinates(payload JSONB)
+RETURNS INTEGER AS $$
+  WITH updated AS (
+    UPDATE nuforc_sightings s
+    SET latitude = p.lat, longitude = p.lng
+    FROM jsonb_to_recordset(payload) AS p(id INT, lat DOUBLE PRECISION, lng DOUBLE PRECISION)
+    WHERE s.id = p.id
+    RETURNING 1
+  )
+  SELECT COUNT(*)::INT FROM updated;
+$$ LANGUAGE sql VOLATILE;
+
+-- Step 7: Per-country counts from the attributed country_code column
+-- (optionally for one year); 'ZZ' marks points outside every country
+CREATE OR REPLACE FUNCTION get_country_counts(target_year INT DEFAULT NULL)
+RETURNS TABLE(country_code TEXT, count BIGINT) AS $$
+  SELECT s.country_code, COUNT(*) as count
+  FROM nuforc_sightings s
+  WHERE s.country_code IS NOT NULL
+    AND (target_year IS NULL
+         OR (s.occurred >= make_date(target_year, 1, 1)
+             AND s.occurred < make_date(target_year + 1, 1, 1)))
+  GROUP BY s.country_code
+  ORDER BY count DESC;
+$$ LANGUAGE sql STABLE;
+
+-- Step 8: Summary rollups maintained by rollup_stats.py
+-- One row per (year, shape); year 0 = no date, shape '' = no shape. The
+-- import/geocode scripts refresh the years they touched, so the dashboard
+-- reads these instead of aggregating nuforc_sightings on every cold request.
+CREATE TABLE IF NOT EXISTS sighting_rollup (
+  year INT NOT NULL,
+  shape TEXT NOT NULL,
+  total BIGINT NOT NULL DEFAULT 0,
+  geocoded BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (year, shape)
+);
+
+-- Same result as get_year_counts(): dated records with coordinates
+CREATE OR REPLACE FUNCTION get_rollup_year_counts()
+RETURNS TABLE(year INT, count BIGINT) AS $$
+  SELECT r.year, SUM(r.geocoded)::BIGINT as count
+  FROM sighting_rollup r
+  WHERE r.year > 0
+  GROUP BY r.year
+  HAVING SUM(r.geocoded) > 0
+  ORDER BY r.year ASC;
+$$ LANGUAGE sql STABLE;
+
+-- Same result as get_shape_counts()
+CREATE OR REPLACE FUNCTION get_rollup_shape_counts()
+RETURNS TABLE(shape TEXT, count BIGINT) AS $$
+  SELECT r.shape, SUM(r.total)::BIGINT as count
+  FROM sighting_rollup r
+  WHERE r.shape <> ''
+  GROUP BY r.shape
+  ORDER BY count DESC;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_rollup_totals()
+RETURNS TABLE(total_reports BIGINT, geocoded BIGINT, min_year INT, max_year INT, updated_at TIMESTAMPTZ) AS $$
+  SELECT
+    COALESCE(SUM(r.total), 0)::BIGINT,
+    COALESCE(SUM(r.geocoded), 0)::BIGINT,
+    MIN(r.year) FILTER (WHERE r.year > 0),
+    MAX(r.year) FILTER (WHERE r.year > 0),
+    MAX(r.updated_at)
+  FROM sighting_rollup r;
+$$ LANGUAGE sql STABLE;
+
+-- Step 9: Anomaly index maintained by anomaly_index.py
+-- One row per (year, shape), shape 'All' = every shape. Same values as
+-- computeAnomalyIndex in src/lib/anomalyIndex.ts, precomputed in one batch.
+CREATE TABLE IF NOT EXISTS sighting_anomaly (
+  year INT NOT NULL,
+  shape TEXT NOT NULL,
+  count INT NOT NULL DEFAULT 0,
+  anomaly_index REAL NOT NULL DEFAULT 0,
+  status TEXT NOT NULL DEFAULT 'LOW',
+  delta REAL NOT NULL DEFAULT 0,
+  hotspot_lat DOUBLE PRECISION,
+  hotspot_lng DOUBLE PRECISION,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (year, shape)
+);
+
+-- Every year of one shape, so the panel fetches a series once and then
+-- looks years up locally during timeline playback
+CREATE OR REPLACE FUNCTION get_anomaly_series(target_shape TEXT DEFAULT 'All')
+RETURNS TABLE(year INT, count INT, anomaly_index REAL, status TEXT, delta REAL,
+              hotspot_lat DOUBLE PRECISION, hotspot_lng DOUBLE PRECISION) AS $$
+  SELECT a.year, a.count, a.anomaly_index, a.status, a.delta, a.hotspot_lat, a.hotspot_lng
+  FROM sighting_anomaly a
+  WHERE a.shape = target_shape
+  ORDER BY a.year ASC;
+$$ LANGUAGE sql STABLE;
+
 -- Verify
 SELECT COUNT(*) as total_records FROM nuforc_sightings;
 SELECT COUNT(*) as with_coordinates FROM nuforc_sightings WHERE latitude IS NOT NULL;
+SELECT COUNT(*) as with_country FROM nuforc_sightings WHERE country_code IS NOT NULL;
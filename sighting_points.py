@@ -0,0 +1,116 @@
+"""
+Signal 626 - Geocoded point loader
+===================================
+
+Loads the geocoded, dated sightings (optionally only some years) into
+columnar NumPy arrays for the offline build stages: the static point packs,
+cluster indexes and heatmap grids all start from the same Points.
+
+    id        uint32
+    lat, lng  float32
+    year      int16
+    doy       uint16   day of year, 1-366
+    minute    uint16   minutes after midnight, 0-1439 (NO_TIME when the
+                       timestamp has no time of day)
+    shape     object   shape string, '' when missing
+    location  object   location string, '' when missing
+    country   object   ISO-2 country_code, '' when not attributed yet
+
+Usage:
+    points = load_points(client, years=[2014, 2015])
+    for year, pts in split_years(points).items():
+        ...
+"""
+
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from rollup_stats import year_filter, year_ranges
+from table_scanner import TableScanner
+
+POINT_COLUMNS = 'id, latitude, longitude, occurred, shape, location, country_code'
+NO_TIME = 0xFFFF
+
+
+class Points(NamedTuple):
+    id: np.ndarray
+    lat: np.ndarray
+    lng: np.ndarray
+    year: np.ndarray
+    doy: np.ndarray
+    minute: np.ndarray
+    shape: np.ndarray
+    location: np.ndarray
+    country: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def take(self, idx) -> 'Points':
+        """Subset (or reorder) every column by a mask or index array."""
+        return Points(*(column[idx] for column in self))
+
+
+def minute_of_day(occurred: str) -> int:
+    """Minutes after midnight of an ISO timestamp (NO_TIME if it has no time)."""
+    try:
+        return int(occurred[11:13]) * 60 + int(occurred[14:16])
+    except ValueError:
+        return NO_TIME
+
+
+def points_from_rows(rows: list) -> Points:
+    """Build Points from scanned rows (which must have coordinates and a date)."""
+    n = len(rows)
+    dates = np.array([r['occurred'][:10] for r in rows], dtype='datetime64[D]')
+    years = dates.astype('datetime64[Y]')
+    return Points(
+        id=np.fromiter((r['id'] for r in rows), dtype=np.uint32, count=n),
+        lat=np.fromiter((r['latitude'] for r in rows), dtype=np.float32, count=n),
+        lng=np.fromiter((r['longitude'] for r in rows), dtype=np.float32, count=n),
+        year=(years.astype(np.int64) + 1970).astype(np.int16),
+        doy=((dates - years).astype(np.int64) + 1).astype(np.uint16),
+        minute=np.fromiter((minute_of_day(r['occurred']) for r in rows), dtype=np.uint16, count=n),
+        shape=np.array([r.get('shape') or '' for r in rows], dtype=object),
+        location=np.array([r.get('location') or '' for r in rows], dtype=object),
+        country=np.array([r.get('country_code') or '' for r in rows], dtype=object),
+    )
+
+
+def empty_points() -> Points:
+    return points_from_rows([])
+
+
+def load_points(client, years: Optional[Iterable[int]] = None, workers: int = 4,
+                columns: str = POINT_COLUMNS) -> Points:
+    """Scan geocoded, dated records (all years, or only the given ones)."""
+    def geocoded(query):
+        return query.not_.is_('latitude', 'null').not_.is_('longitude', 'null').not_.is_('occurred', 'null')
+
+    if years is None:
+        scans = [TableScanner(client, columns, filters=geocoded, workers=workers)]
+    else:
+        scans = [
+            TableScanner(client, columns, filters=lambda q, f=year_filter(first, last): f(geocoded(q)),
+                         workers=workers)
+            for first, last in year_ranges(y for y in years if y > 0)
+        ]
+
+    rows = []
+    for scanner in scans:
+        for page in scanner.pages():
+            rows.extend(page.rows)
+    rows.sort(key=lambda r: r['id'])
+    return points_from_rows(rows)
+
+
+def split_years(points: Points) -> Dict[int, Points]:
+    """Group points by year (each group keeps id order)."""
+    if not len(points):
+        return {}
+    order = np.argsort(points.year, kind='stable')
+    years = points.year[order]
+    starts = np.flatnonzero(np.r_[True, years[1:] != years[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    return {int(years[s]): points.take(order[s:e]) for s, e in zip(starts, ends)}
@@ -0,0 +1,43 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { createServerClient } from '@/lib/supabase';
+import type { AnomalyStatus, PrecomputedAnomaly } from '@/lib/anomalyIndex';
+
+export const dynamic = 'force-dynamic';
+
+interface AnomalyRow {
+  year: number;
+  count: number;
+  anomaly_index: number;
+  status: AnomalyStatus;
+  delta: number;
+  hotspot_lat: number | null;
+  hotspot_lng: number | null;
+}
+
+// GET /api/anomaly?shape=Light
+// Every year's precomputed anomaly index for one shape (from anomaly_index.py).
+// An empty series means it hasn't been built; the panel then computes live.
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const shape = searchParams.get('shape') || 'All';
+  const supabase = createServerClient();
+
+  const { data, error } = await supabase.rpc('get_anomaly_series', { target_shape: shape });
+  if (error || !Array.isArray(data)) {
+    console.warn('RPC get_anomaly_series failed:', error?.message);
+    return NextResponse.json({ shape, series: [] });
+  }
+
+  const series: PrecomputedAnomaly[] = (data as AnomalyRow[]).map(r => ({
+    year: Number(r.year),
+    count: Number(r.count),
+    index: Number(r.anomaly_index),
+    status: r.status,
+    delta: Number(r.delta),
+    hotspot: r.hotspot_lat != null && r.hotspot_lng != null ? [r.hotspot_lat, r.hotspot_lng] : null,
+  }));
+
+  return NextResponse.json({ shape, series }, {
+    headers: { 'Cache-Control': 'public, s-maxage=3600, stale-while-revalidate=7200' },
+  });
+}
@@ -0,0 +1,126 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { promises as fs } from 'fs';
+import path from 'path';
+import { gunzipSync } from 'zlib';
+
+export const runtime = 'nodejs';
+
+// Precomputed by cluster_index.py: one gzip member per zoom, columns
+// lng f32 | lat f32 | count u32 | parent u32 | id u32 | expand u8, sorted by lat
+const CLUSTER_DIR = path.join(process.cwd(), 'public', 'clusters');
+
+interface ClusterManifest {
+  version: number;
+  max_zoom: number;
+  years: Record<string, { file: string; zooms: [number, number, number][] }>;
+}
+
+interface Level {
+  lng: Float32Array;
+  lat: Float32Array;
+  count: Uint32Array;
+  id: Uint32Array;
+  expand: Uint8Array;
+}
+
+let manifestCache: { mtime: number; manifest: ClusterManifest } | null = null;
+const levelCache = new Map<string, Level>();
+const LEVEL_CACHE_SIZE = 64;
+
+async function loadManifest(): Promise<ClusterManifest> {
+  const file = path.join(CLUSTER_DIR, 'manifest.json');
+  const { mtimeMs } = await fs.stat(file);
+  if (!manifestCache || manifestCache.mtime !== mtimeMs) {
+    manifestCache = { mtime: mtimeMs, manifest: JSON.parse(await fs.readFile(file, 'utf-8')) };
+    levelCache.clear();
+  }
+  return manifestCache.manifest;
+}
+
+async function loadLevel(manifest: ClusterManifest, year: number, zoom: number): Promise<Level | null> {
+  const entry = manifest.years[String(year)];
+  if (!entry || !entry.zooms[zoom]) return null;
+
+  const key = `${year}/${zoom}`;
+  const cached = levelCache.get(key);
+  if (cached) return cached;
+
+  const [offset, length, n] = entry.zooms[zoom];
+  const handle = await fs.open(path.join(CLUSTER_DIR, entry.file), 'r');
+  const raw = Buffer.alloc(length);
+  try {
+    await handle.read(raw, 0, length, offset);
+  } finally {
+    await handle.close();
+  }
+  // Copy into a fresh, 4-byte aligned buffer for the typed-array views
+  const buffer = new Uint8Array(gunzipSync(raw)).buffer;
+  const level: Level = {
+    lng: new Float32Array(buffer, 0, n),
+    lat: new Float32Array(buffer, 4 * n, n),
+    count: new Uint32Array(buffer, 8 * n, n),
+    id: new Uint32Array(buffer, 16 * n, n),
+    expand: new Uint8Array(buffer, 20 * n, n),
+  };
+
+  if (levelCache.size >= LEVEL_CACHE_SIZE) {
+    levelCache.delete(levelCache.keys().next().value as string);
+  }
+  levelCache.set(key, level);
+  return level;
+}
+
+function lowerBound(values: Float32Array, target: number): number {
+  let lo = 0;
+  let hi = values.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (values[mid] < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+// GET /api/clusters?year=2014&zoom=4&bbox=west,south,east,north
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const year = parseInt(searchParams.get('year') || '', 10);
+  const zoomParam = parseInt(searchParams.get('zoom') || '0', 10);
+  const bbox = (searchParams.get('bbox') || '-180,-90,180,90').split(',').map(Number);
+
+  if (isNaN(year) || isNaN(zoomParam) || bbox.length !== 4 || bbox.some(isNaN)) {
+    return NextResponse.json({ error: 'year, zoom and bbox=west,south,east,north required' }, { status: 400 });
+  }
+
+  let manifest: ClusterManifest;
+  try {
+    manifest = await loadManifest();
+  } catch {
+    return NextResponse.json({ error: 'Cluster index not built (run cluster_index.py)' }, { status: 404 });
+  }
+
+  const zoom = Math.max(0, Math.min(manifest.max_zoom, zoomParam));
+  const level = await loadLevel(manifest, year, zoom);
+  if (!level) {
+    return NextResponse.json({ year, zoom, count: 0, clusters: [] });
+  }
+
+  const [west, south, east, north] = bbox;
+  const wraps = west > east; // viewport crosses the antimeridian
+  const clusters = [];
+  for (let i = lowerBound(level.lat, south); i < level.lat.length && level.lat[i] <= north; i++) {
+    const lng = level.lng[i];
+    if (wraps ? lng < west && lng > east : lng < west || lng > east) continue;
+    clusters.push({
+      latitude: level.lat[i],
+      longitude: lng,
+      count: level.count[i],
+      id: level.count[i] === 1 ? level.id[i] : null,
+      expansion_zoom: level.expand[i],
+    });
+  }
+
+  return NextResponse.json({ year, zoom, count: clusters.length, clusters }, {
+    headers: { 'Cache-Control': 'public, s-maxage=3600, stale-while-revalidate=7200' },
+  });
+}
@@ -0,0 +1,33 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { createServerClient } from '@/lib/supabase';
+
+export const dynamic = 'force-dynamic';
+
+// GET /api/country-counts?year=1997
+// Sightings per country_code for a year (all years without ?year), counted
+// in SQL by get_country_counts over the codes country_attribution.py stores.
+// An empty list means attribution hasn't run; the panel then filters live.
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const yearParam = searchParams.get('year');
+  const year = yearParam ? parseInt(yearParam, 10) : null;
+  const supabase = createServerClient();
+
+  const { data, error } = await supabase.rpc('get_country_counts', {
+    target_year: Number.isFinite(year) ? year : null,
+  });
+  if (error || !Array.isArray(data)) {
+    console.warn('RPC get_country_counts failed:', error?.message);
+    return NextResponse.json({ year, counts: [] });
+  }
+
+  // PostgREST returns BIGINT as strings — coerce to numbers
+  const counts = (data as { country_code: string; count: number | string }[]).map(r => ({
+    code: r.country_code,
+    count: Number(r.count),
+  }));
+
+  return NextResponse.json({ year, counts }, {
+    headers: { 'Cache-Control': 'public, s-maxage=3600, stale-while-revalidate=7200' },
+  });
+}
@@ -0,0 +1,86 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { promises as fs } from 'fs';
+import path from 'path';
+import { gunzipSync } from 'zlib';
+
+export const runtime = 'nodejs';
+
+// Precomputed by heatmap_grids.py: one gzip member per (resolution, shape),
+// columns cell u32 | count u32, sorted by cell (row-major from -90, -180)
+const HEATMAP_DIR = path.join(process.cwd(), 'public', 'heatmaps');
+
+interface HeatmapManifest {
+  version: number;
+  resolutions: number[];
+  years: Record<string, { file: string; grids: Record<string, Record<string, [number, number, number]>> }>;
+}
+
+let manifestCache: { mtime: number; manifest: HeatmapManifest } | null = null;
+
+async function loadManifest(): Promise<HeatmapManifest> {
+  const file = path.join(HEATMAP_DIR, 'manifest.json');
+  const { mtimeMs } = await fs.stat(file);
+  if (!manifestCache || manifestCache.mtime !== mtimeMs) {
+    manifestCache = { mtime: mtimeMs, manifest: JSON.parse(await fs.readFile(file, 'utf-8')) };
+  }
+  return manifestCache.manifest;
+}
+
+async function readMember(file: string, offset: number, length: number): Promise<ArrayBuffer> {
+  const handle = await fs.open(path.join(HEATMAP_DIR, file), 'r');
+  const raw = Buffer.alloc(length);
+  try {
+    await handle.read(raw, 0, length, offset);
+  } finally {
+    await handle.close();
+  }
+  return new Uint8Array(gunzipSync(raw)).buffer;
+}
+
+// GET /api/heatmap?year=2014&shape=Light&res=0.5
+// Returns cell centers as [lng, lat, count] triples
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const year = parseInt(searchParams.get('year') || '', 10);
+  const shape = searchParams.get('shape') || 'All';
+  const res = parseFloat(searchParams.get('res') || '0.5');
+
+  if (isNaN(year) || isNaN(res)) {
+    return NextResponse.json({ error: 'year and res required' }, { status: 400 });
+  }
+
+  let manifest: HeatmapManifest;
+  try {
+    manifest = await loadManifest();
+  } catch {
+    return NextResponse.json({ error: 'Heatmap grids not built (run heatmap_grids.py)' }, { status: 404 });
+  }
+
+  // Snap to the nearest precomputed resolution
+  const resolution = manifest.resolutions.reduce((best, r) => (Math.abs(r - res) < Math.abs(best - res) ? r : best));
+  const entry = manifest.years[String(year)];
+  const member = entry?.grids[String(resolution)]?.[shape];
+  if (!entry || !member) {
+    return NextResponse.json({ year, shape, res: resolution, count: 0, cells: [] });
+  }
+
+  const [offset, length, n] = member;
+  const buffer = await readMember(entry.file, offset, length);
+  const cell = new Uint32Array(buffer, 0, n);
+  const count = new Uint32Array(buffer, 4 * n, n);
+  const cols = Math.round(360 / resolution);
+  const cells: [number, number, number][] = new Array(n);
+  for (let i = 0; i < n; i++) {
+    const row = Math.floor(cell[i] / cols);
+    const col = cell[i] - row * cols;
+    cells[i] = [
+      +(-180 + (col + 0.5) * resolution).toFixed(3),
+      +(-90 + (row + 0.5) * resolution).toFixed(3),
+      count[i],
+    ];
+  }
+
+  return NextResponse.json({ year, shape, res: resolution, count: n, cells }, {
+    headers: { 'Cache-Control': 'public, s-maxage=3600, stale-while-revalidate=7200' },
+  });
+}
@@ -34,6 +34,7 @@ export async function GET(request: NextRequest) {
     shape: string | null;
     occurred: string | null;
     location: string | null;
+    country_code: string | null;
   }
 
   const BATCH = 1000;
@@ -65,6 +66,7 @@ export async function GET(request: NextRequest) {
           shape: r.shape ?? null,
           occurred: r.occurred ?? null,
           location: r.location ?? null,
+          country_code: r.country_code ?? null,
         });
       }
 
@@ -86,7 +88,7 @@ export async function GET(request: NextRequest) {
       while (true) {
         let q = supabase
           .from('nuforc_sightings')
-          .select('id, latitude, longitude, shape, occurred, location')
+          .select('id, latitude, longitude, shape, occurred, location, country_code')
           .gte('occurred', startDate)
           .lt('occurred', endDate)
           .not('latitude', 'is', null)
@@ -110,6 +112,7 @@ export async function GET(request: NextRequest) {
             shape: r.shape ?? null,
             occurred: r.occurred ?? null,
             location: r.location ?? null,
+            country_code: r.country_code ?? null,
           });
         }
 
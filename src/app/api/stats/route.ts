@@ -6,6 +6,27 @@ export const dynamic = 'force-dynamic';
 // GET /api/stats
 export async function GET() {
   const supabase = createServerClient();
+  const headers = { 'Cache-Control': 'public, s-maxage=3600, stale-while-revalidate=7200' };
+
+  // Precomputed rollups (rollup_stats.py): two reads of a small summary table
+  const [{ data: totalsRpc, error: totalsErr }, { data: rollupShapes, error: rollupShapesErr }] = await Promise.all([
+    supabase.rpc('get_rollup_totals'),
+    supabase.rpc('get_rollup_shape_counts'),
+  ]);
+  const totals = Array.isArray(totalsRpc) ? totalsRpc[0] : null;
+
+  if (!totalsErr && !rollupShapesErr && totals && Number(totals.total_reports) > 0 && rollupShapes) {
+    const shapes = (rollupShapes as { shape: string; count: number | string }[]).map(r => ({
+      shape: r.shape,
+      count: Number(r.count),
+    }));
+    return NextResponse.json({
+      totalReports: Number(totals.total_reports),
+      yearRange: { min: 1400, max: 2026 },
+      topShapes: shapes.slice(0, 20),
+      allShapes: shapes.map(r => r.shape),
+    }, { headers });
+  }
 
   // Get total count
   const { count: totalCount } = await supabase
@@ -61,9 +82,5 @@ export async function GET() {
     yearRange: { min: 1400, max: 2026 },
     topShapes,
     allShapes,
-  }, {
-    headers: {
-      'Cache-Control': 'public, s-maxage=3600, stale-while-revalidate=7200',
-    },
-  });
+  }, { headers });
 }
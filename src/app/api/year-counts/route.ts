@@ -7,8 +7,12 @@ export const dynamic = 'force-dynamic';
 export async function GET() {
   const supabase = createServerClient();
 
-  // Try RPC function first (single SQL query, ~100ms)
-  const { data: rpcData, error: rpcError } = await supabase.rpc('get_year_counts');
+  // Precomputed rollup first (rollup_stats.py), then the live aggregate
+  // (single SQL query, ~100ms); an empty rollup means it hasn't been built yet
+  let { data: rpcData, error: rpcError } = await supabase.rpc('get_rollup_year_counts');
+  if (rpcError || !Array.isArray(rpcData) || rpcData.length === 0) {
+    ({ data: rpcData, error: rpcError } = await supabase.rpc('get_year_counts'));
+  }
 
   if (!rpcError && rpcData) {
     // PostgREST returns BIGINT as strings — coerce to numbers
@@ -14,6 +14,7 @@ import { useSightings } from '@/hooks/useSightings';
 import { useYearCounts } from '@/hooks/useYearCounts';
 import { useStats } from '@/hooks/useStats';
 import { useSignalReplay } from '@/hooks/useSignalReplay';
+import { useCountryCounts } from '@/hooks/useCountryCounts';
 import { getCountryByCode, COUNTRIES } from '@/lib/countries';
 import { MAX_YEAR, MIN_YEAR } from '@/lib/constants';
 import type { MapPoint, HeatmapMode, TimelineMode } from '@/lib/types';
@@ -40,6 +41,7 @@ export default function HomePage() {
   );
   const { data: yearCountsData } = useYearCounts();
   const { data: statsData } = useStats();
+  const { data: countryCounts } = useCountryCounts(timeline.year);
 
   const points: MapPoint[] = useMemo(() => sightingsData?.sightings || [], [sightingsData]);
 
@@ -65,14 +67,16 @@ export default function HomePage() {
     if (!countryHover) return { totalReports: 0, anomalyScore: 0, anomalyLevel: 'LOW' as AnomalyLevel };
     const country = COUNTRIES.find(c => c.code === countryHover.code);
     if (!country) return { totalReports: 0, anomalyScore: 0, anomalyLevel: 'LOW' as AnomalyLevel };
-    const countryPoints = filterByCountryBounds(points, country.bounds, country.name);
-    const total = countryPoints.length;
+    // Server-side count when attribution has run (all shapes only), else filter live
+    const total = selectedShape === 'All' && countryCounts?.size
+      ? countryCounts.get(country.code) ?? 0
+      : filterByCountryBounds(points, country.bounds, country.name, country.code).length;
     const globalAvg = points.length / Math.max(COUNTRIES.length, 1);
     const ratio = globalAvg > 0 ? total / globalAvg : 0;
     const score = Math.min(100, Math.round(ratio * 15));
     const level: AnomalyLevel = score >= 75 ? 'CRITICAL' : score >= 50 ? 'HIGH' : score >= 25 ? 'MEDIUM' : 'LOW';
     return { totalReports: total, anomalyScore: score, anomalyLevel: level };
-  }, [countryHover, points]);
+  }, [countryHover, points, selectedShape, countryCounts]);
 
   const handleCountryHover = useCallback((data: CountryHoverData | null) => {
     if (hoverTimeoutRef.current) { clearTimeout(hoverTimeoutRef.current); hoverTimeoutRef.current = null; }
@@ -219,6 +223,7 @@ export default function HomePage() {
             noData={!sightingsLoading && !sightingsFetching && points.length === 0}
             heatmapEnabled={heatmapEnabled}
             heatmapMode={heatmapMode}
+            heatmapGrid={timelineMode === 'year' ? { year: timeline.year, shape: selectedShape } : null}
             countryBounds={countryBounds}
             onCountryHover={handleCountryHover}
             onCountryClick={handleCountryClickFromMap}
@@ -259,6 +264,7 @@ export default function HomePage() {
           onCountryChange={setSelectedCountry}
           yearCounts={yearCounts}
           isLoading={sightingsLoading}
+          shape={selectedShape}
         />
       </div>
 
@@ -329,6 +335,7 @@ export default function HomePage() {
                 }}
                 yearCounts={yearCounts}
                 isLoading={sightingsLoading}
+                shape={selectedShape}
                 className="flex flex-col w-full h-full overflow-y-auto"
               />
             </div>
@@ -25,6 +25,7 @@ interface DynamicMapProps {
   noData: boolean;
   heatmapEnabled: boolean;
   heatmapMode: HeatmapMode;
+  heatmapGrid?: { year: number; shape: string } | null;
   countryBounds?: [[number, number], [number, number]] | null;
   onCountryHover?: (data: CountryHoverData | null) => void;
   onCountryClick?: (code: string) => void;
@@ -10,6 +10,7 @@ import {
   getShapeColor,
 } from '@/lib/constants';
 import type { MapPoint, HeatmapMode } from '@/lib/types';
+import { loadHeatmapGrid } from '@/lib/heatmapGrids';
 import type { CountryHoverData } from './CountryHoverPopup';
 
 const STYLE_URL = 'https://basemaps.cartocdn.com/gl/dark-matter-gl-style/style.json';
@@ -321,6 +322,8 @@ function setupHeatmapLayer(map: maplibregl.Map) {
     type: 'heatmap',
     source: 'heatmap-source',
     paint: {
+      // Grid cells carry their point count; raw points weigh 1
+      'heatmap-weight': ['coalesce', ['get', 'count'], 1],
       'heatmap-intensity': ['interpolate', ['linear'], ['zoom'], 0, 1, 5, 2.5, 9, 5],
       'heatmap-radius': ['interpolate', ['linear'], ['zoom'], 0, 18, 5, 35, 9, 55],
       'heatmap-opacity': ['interpolate', ['linear'], ['zoom'], 5, 0.9, 12, 0.5],
@@ -427,6 +430,8 @@ interface MapViewProps {
   noData: boolean;
   heatmapEnabled: boolean;
   heatmapMode: HeatmapMode;
+  // Year/shape of a full-year view; the heatmap then uses the precomputed grid
+  heatmapGrid?: { year: number; shape: string } | null;
   countryBounds?: [[number, number], [number, number]] | null;
   onCountryHover?: (data: CountryHoverData | null) => void;
   onCountryClick?: (code: string) => void;
@@ -434,7 +439,7 @@ interface MapViewProps {
 
 export default function MapView({
   points, onSightingClick, isLoading, noData,
-  heatmapEnabled, heatmapMode, countryBounds,
+  heatmapEnabled, heatmapMode, heatmapGrid, countryBounds,
   onCountryHover, onCountryClick,
 }: MapViewProps) {
   const containerRef = useRef<HTMLDivElement>(null);
@@ -662,21 +667,34 @@ export default function MapView({
       }
     }
 
-    if (showHeat && points.length > 0) {
-      const geojson: GeoJSON.FeatureCollection = {
+    let cancelled = false;
+    const setHeatData = (geojson: GeoJSON.FeatureCollection) => {
+      const source = map.getSource('heatmap-source') as maplibregl.GeoJSONSource | undefined;
+      if (source && !cancelled) source.setData(geojson);
+    };
+    const fromPoints = () => {
+      if (points.length === 0) return;
+      setHeatData({
         type: 'FeatureCollection',
         features: points.map(p => ({
           type: 'Feature' as const,
           properties: {},
           geometry: { type: 'Point' as const, coordinates: [p.longitude, p.latitude] },
         })),
-      };
-      const source = map.getSource('heatmap-source') as maplibregl.GeoJSONSource | undefined;
-      if (source) source.setData(geojson);
+      });
+    };
+
+    if (showHeat && heatmapGrid) {
+      loadHeatmapGrid(heatmapGrid.year, heatmapGrid.shape, heatmapMode)
+        .then(grid => (grid ? setHeatData(grid) : fromPoints()))
+        .catch(fromPoints);
+    } else if (showHeat) {
+      fromPoints();
     }
 
     if (showHeat) applyHeatmapMode(map, heatmapMode);
-  }, [heatmapEnabled, points, heatmapMode]);
+    return () => { cancelled = true; };
+  }, [heatmapEnabled, points, heatmapMode, heatmapGrid?.year, heatmapGrid?.shape]);
 
   useEffect(() => {
     const map = mapRef.current;
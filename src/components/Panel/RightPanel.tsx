@@ -7,6 +7,8 @@ import { getShapeColor, MONTH_NAMES } from '@/lib/constants';
 import { getCountryByCode, COUNTRIES } from '@/lib/countries';
 import { buildIntelligenceReport, filterByCountryBounds } from '@/lib/intelligence';
 import { computeAnomalyIndex } from '@/lib/anomalyIndex';
+import { useAnomalySeries } from '@/hooks/useAnomalySeries';
+import { useCountryCounts } from '@/hooks/useCountryCounts';
 import type { IntelligenceReport } from '@/lib/intelligence';
 import type { MapPoint, YearCount } from '@/lib/types';
 
@@ -18,6 +20,7 @@ interface RightPanelProps {
   onCountryChange: (country: string) => void;
   yearCounts: YearCount[];
   isLoading: boolean;
+  shape?: string;
   className?: string;
 }
 
@@ -526,7 +529,7 @@ function CountrySelect({ value, onChange }: { value: string; onChange: (v: strin
    MAIN RIGHT PANEL
    ═══════════════════════════════════════════ */
 export default function RightPanel({
-  points, yearCount, year, selectedCountry, onCountryChange, yearCounts, isLoading, className,
+  points, yearCount, year, selectedCountry, onCountryChange, yearCounts, isLoading, shape = 'All', className,
 }: RightPanelProps) {
   const scrollRef = useRef<HTMLDivElement>(null);
   const country = getCountryByCode(selectedCountry);
@@ -538,20 +541,29 @@ export default function RightPanel({
   }, [selectedCountry]);
 
   // ── Core data ──
+  // Per-country totals from country_attribution.py's codes; they count every
+  // shape, so only apply to the unfiltered view (empty until attribution runs)
+  const { data: countryCounts } = useCountryCounts(year);
+  const countryTotal = shape === 'All' && country && countryCounts?.size
+    ? countryCounts.get(country.code) ?? 0 : undefined;
+
   const report = useMemo<IntelligenceReport | null>(() => {
     if (!country || selectedCountry === 'World') return null;
-    return buildIntelligenceReport(country.code, country.name, year, points, yearCounts, country.bounds);
-  }, [country, selectedCountry, year, points, yearCounts]);
+    return buildIntelligenceReport(country.code, country.name, year, points, yearCounts, country.bounds, countryTotal);
+  }, [country, selectedCountry, year, points, yearCounts, countryTotal]);
 
-  const anomaly = useMemo(
-    () => computeAnomalyIndex(year, yearCount, yearCounts, points),
-    [year, yearCount, yearCounts, points]
-  );
+  // Precomputed by anomaly_index.py when it matches the loaded year, else live
+  const { data: anomalySeries } = useAnomalySeries(shape);
+  const anomaly = useMemo(() => {
+    const precomputed = anomalySeries?.get(year);
+    if (precomputed && precomputed.count === yearCount) return precomputed;
+    return computeAnomalyIndex(year, yearCount, yearCounts, points);
+  }, [anomalySeries, year, yearCount, yearCounts, points]);
 
   // ── Filtered points for country ──
   const filteredPoints = useMemo(() => {
     if (!isCountryView || !country) return points;
-    return filterByCountryBounds(points, country.bounds, country.name);
+    return filterByCountryBounds(points, country.bounds, country.name, country.code);
   }, [points, isCountryView, country]);
 
   // ── Monthly distribution ──
@@ -0,0 +1,23 @@
+'use client';
+
+import { useQuery } from '@tanstack/react-query';
+import type { PrecomputedAnomaly } from '@/lib/anomalyIndex';
+
+interface AnomalySeriesResponse {
+  shape: string;
+  series: PrecomputedAnomaly[];
+}
+
+/** Precomputed anomaly index per year for a shape, keyed by year. */
+export function useAnomalySeries(shape: string) {
+  return useQuery<AnomalySeriesResponse, Error, Map<number, PrecomputedAnomaly>>({
+    queryKey: ['anomalySeries', shape],
+    queryFn: async () => {
+      const res = await fetch(`/api/anomaly?shape=${encodeURIComponent(shape)}`);
+      if (!res.ok) throw new Error('Failed to fetch anomaly series');
+      return res.json();
+    },
+    select: data => new Map(data.series.map(entry => [entry.year, entry])),
+    staleTime: 60 * 60 * 1000,
+  });
+}
@@ -0,0 +1,22 @@
+'use client';
+
+import { useQuery } from '@tanstack/react-query';
+
+interface CountryCountsResponse {
+  year: number | null;
+  counts: { code: string; count: number }[];
+}
+
+/** Sightings per ISO-2 country code for a year, counted server-side. */
+export function useCountryCounts(year: number) {
+  return useQuery<CountryCountsResponse, Error, Map<string, number>>({
+    queryKey: ['countryCounts', year],
+    queryFn: async () => {
+      const res = await fetch(`/api/country-counts?year=${year}`);
+      if (!res.ok) throw new Error('Failed to fetch country counts');
+      return res.json();
+    },
+    select: data => new Map(data.counts.map(entry => [entry.code, entry.count])),
+    staleTime: 60 * 60 * 1000,
+  });
+}
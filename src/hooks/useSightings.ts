@@ -1,6 +1,7 @@
 'use client';
 
 import { useQuery } from '@tanstack/react-query';
+import { loadYearPack } from '@/lib/pointPacks';
 import type { MapPoint, Sighting } from '@/lib/types';
 
 interface SightingsResponse {
@@ -13,6 +14,10 @@ export function useSightings(year: number, shape?: string) {
   return useQuery<SightingsResponse>({
     queryKey: ['sightings', year, shape],
     queryFn: async () => {
+      // Static pack first (one object per year), the paged API otherwise
+      const packed = await loadYearPack(year, shape).catch(() => null);
+      if (packed) return { year, count: packed.length, sightings: packed };
+
       const params = new URLSearchParams({ year: year.toString() });
       if (shape && shape !== 'All') params.set('shape', shape);
 
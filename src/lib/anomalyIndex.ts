@@ -9,6 +9,12 @@ export interface AnomalyData {
   hotspot: [number, number] | null; // [lat, lng] of densest cluster
 }
 
+/** A row precomputed by anomaly_index.py for (year, shape). */
+export interface PrecomputedAnomaly extends AnomalyData {
+  year: number;
+  count: number;         // the yearCount it was computed for
+}
+
 /**
  * Compute a Global Anomaly Index from year counts and current points.
  *
@@ -0,0 +1,97 @@
+import type { HeatmapMode } from './types';
+import { fetchRange, gunzip } from './pointPacks';
+
+/**
+ * Sparse heatmap grids written by heatmap_grids.py.
+ *
+ * public/heatmaps/{year}.bin holds one gzip member per (resolution, shape):
+ *   cell u32[n] | count u32[n]
+ * with cell = row * cols + col on a global grid anchored at (-90, -180).
+ * manifest.json gives every member's [offset, length, count].
+ */
+
+interface HeatmapYear {
+  file: string;
+  grids: Record<string, Record<string, [number, number, number]>>;
+}
+
+interface HeatmapManifest {
+  version: number;
+  resolutions: number[];
+  years: Record<string, HeatmapYear>;
+}
+
+const HEATMAP_BASE = '/heatmaps';
+const GRID_VERSION = 1;
+
+// Cell size per heatmap mode, in degrees
+export const HEATMAP_RESOLUTION: Record<HeatmapMode, number> = {
+  clusters: 2,
+  density: 0.5,
+  precision: 0.1,
+};
+
+let manifestPromise: Promise<HeatmapManifest | null> | null = null;
+const gridCache = new Map<string, GeoJSON.FeatureCollection>();
+const GRID_CACHE_SIZE = 32;
+
+function loadManifest(): Promise<HeatmapManifest | null> {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${HEATMAP_BASE}/manifest.json`)
+      .then(res => (res.ok ? res.json() : null))
+      .then((m: HeatmapManifest | null) => (m && m.version === GRID_VERSION ? m : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+/**
+ * Load a year's heatmap grid as weighted cell-center features (property
+ * `count`). Returns null when no grid was built for the year, so callers can
+ * fall back to the raw points.
+ */
+export async function loadHeatmapGrid(
+  year: number,
+  shape: string,
+  mode: HeatmapMode
+): Promise<GeoJSON.FeatureCollection | null> {
+  if (typeof DecompressionStream === 'undefined') return null;
+  const manifest = await loadManifest();
+  const entry = manifest?.years[String(year)];
+  const resolution = HEATMAP_RESOLUTION[mode];
+  const grid = entry?.grids[String(resolution)];
+  if (!entry || !grid) return null;
+
+  const key = `${year}/${shape}/${resolution}`;
+  const cached = gridCache.get(key);
+  if (cached) return cached;
+
+  const member = grid[shape || 'All'];
+  const features: GeoJSON.Feature[] = [];
+  if (member) {
+    const [offset, length, n] = member;
+    const buffer = await gunzip(await fetchRange(`${HEATMAP_BASE}/${entry.file}`, offset, length));
+    const cell = new Uint32Array(buffer, 0, n);
+    const count = new Uint32Array(buffer, 4 * n, n);
+    const cols = Math.round(360 / resolution);
+    for (let i = 0; i < n; i++) {
+      const row = Math.floor(cell[i] / cols);
+      const col = cell[i] - row * cols;
+      features.push({
+        type: 'Feature',
+        properties: { count: count[i] },
+        geometry: {
+          type: 'Point',
+          coordinates: [-180 + (col + 0.5) * resolution, -90 + (row + 0.5) * resolution],
+        },
+      });
+    }
+  }
+
+  const collection: GeoJSON.FeatureCollection = { type: 'FeatureCollection', features };
+  if (gridCache.size >= GRID_CACHE_SIZE) {
+    gridCache.delete(gridCache.keys().next().value as string);
+  }
+  gridCache.set(key, collection);
+  return collection;
+}
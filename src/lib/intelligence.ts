@@ -118,15 +118,22 @@ function detectCountryInLocation(location: string | null): string | null {
 export function filterByCountryBounds(
   points: MapPoint[],
   bounds: [[number, number], [number, number]],
-  targetCountryName?: string
+  targetCountryName?: string,
+  targetCountryCode?: string
 ): MapPoint[] {
   const [[south, west], [north, east]] = bounds;
-  const inBounds = points.filter(
-    (p) => p.latitude >= south && p.latitude <= north && p.longitude >= west && p.longitude <= east
-  );
+  const inBounds = (p: MapPoint) =>
+    p.latitude >= south && p.latitude <= north && p.longitude >= west && p.longitude <= east;
+
+  // Points attributed by country_attribution.py (point-in-polygon) match on
+  // their code alone; only unattributed points need the bounds + heuristics
+  const targetCode = targetCountryCode?.toUpperCase();
+  const attributed = (p: MapPoint) => Boolean(targetCode && p.country_code);
 
   // If no country name provided, just return bounding box results
-  if (!targetCountryName) return inBounds;
+  if (!targetCountryName) {
+    return points.filter(p => attributed(p) ? p.country_code === targetCode : inBounds(p));
+  }
 
   const targetLower = targetCountryName.toLowerCase();
 
@@ -134,7 +141,9 @@ export function filterByCountryBounds(
   const targetAliases = COUNTRY_ALIASES[targetCountryName]?.map(a => a.toLowerCase()) || [];
 
   // Secondary filter: use location field to exclude points that belong to a different country
-  return inBounds.filter(p => {
+  return points.filter(p => {
+    if (attributed(p)) return p.country_code === targetCode;
+    if (!inBounds(p)) return false;
     const detectedCountry = detectCountryInLocation(p.location);
     // No country detected in location string → keep (benefit of the doubt from bounding box)
     if (!detectedCountry) return true;
@@ -223,10 +232,11 @@ export function buildIntelligenceReport(
   year: number | 'all',
   currentYearPoints: MapPoint[],
   yearCounts: YearCount[],
-  countryBounds: [[number, number], [number, number]]
+  countryBounds: [[number, number], [number, number]],
+  countryTotal?: number
 ): IntelligenceReport {
   // Filter points to ONLY those within the country bounds + location verification
-  const countryPoints = filterByCountryBounds(currentYearPoints, countryBounds, countryName);
+  const countryPoints = filterByCountryBounds(currentYearPoints, countryBounds, countryName, countryCode);
 
   // Yearly trend: use GLOBAL yearCounts (we don't have per-country historical data)
   // This is clearly labeled in the UI as such
@@ -253,13 +263,15 @@ export function buildIntelligenceReport(
   const totalAllTime = yearlyTrend.reduce((sum, y) => sum + y.count, 0);
 
   // Anomaly level: compare current country count against global trend
-  const { level: anomalyLevel, score: anomalyScore } = calcAnomalyLevel(countryPoints.length, yearlyTrend);
+  // Server-side count (get_country_counts) when available, else the filtered points
+  const totalYear = countryTotal ?? countryPoints.length;
+  const { level: anomalyLevel, score: anomalyScore } = calcAnomalyLevel(totalYear, yearlyTrend);
 
   return {
     countryCode,
     countryName,
     year,
-    totalYear: countryPoints.length,
+    totalYear,
     totalAllTime,
     peakMonth,
     monthlyDistribution,
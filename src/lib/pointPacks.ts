@@ -0,0 +1,130 @@
+import type { MapPoint } from './types';
+
+/**
+ * Static per-year point packs written by export_point_packs.py.
+ *
+ * public/packs/{year}.bin is a concatenation of gzip members: the year's
+ * location strings (JSON), then one columnar member per shape:
+ *   lat f32[n] | lng f32[n] | id u32[n] | loc u32[n] | doy u16[n] | minute u16[n] | country u8[n]
+ * Points are sorted by (day, minute, id); minute is 0xFFFF when the report has
+ * no time of day.
+ * manifest.json gives every member's [offset, length(, count)].
+ */
+
+interface PackYear {
+  file: string;
+  count: number;
+  bytes: number;
+  locations: [number, number];
+  shapes: Record<string, [number, number, number]>;
+}
+
+interface PackManifest {
+  version: number;
+  countries: string[];
+  years: Record<string, PackYear>;
+}
+
+const PACK_BASE = '/packs';
+const PACK_VERSION = 2;
+const NO_TIME = 0xffff;
+
+let manifestPromise: Promise<PackManifest | null> | null = null;
+
+function loadManifest(): Promise<PackManifest | null> {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${PACK_BASE}/manifest.json`)
+      .then(res => (res.ok ? res.json() : null))
+      .then((m: PackManifest | null) => (m && m.version === PACK_VERSION ? m : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+export async function gunzip(bytes: Uint8Array): Promise<ArrayBuffer> {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+  return new Response(stream).arrayBuffer();
+}
+
+// Fetch [offset, offset + length) of a static file; falls back to slicing the
+// whole body when the server ignores the Range header
+export async function fetchRange(url: string, offset: number, length: number): Promise<Uint8Array> {
+  const res = await fetch(url, { headers: { Range: `bytes=${offset}-${offset + length - 1}` } });
+  if (!res.ok) throw new Error(`Failed to fetch ${url}`);
+  const body = new Uint8Array(await res.arrayBuffer());
+  return res.status === 206 ? body : body.subarray(offset, offset + length);
+}
+
+function pad(n: number, width: number): string {
+  return String(n).padStart(width, '0');
+}
+
+function decodeShape(
+  buffer: ArrayBuffer,
+  count: number,
+  year: number,
+  shape: string,
+  locations: string[],
+  countries: string[],
+  out: MapPoint[]
+) {
+  const lat = new Float32Array(buffer, 0, count);
+  const lng = new Float32Array(buffer, 4 * count, count);
+  const ids = new Uint32Array(buffer, 8 * count, count);
+  const loc = new Uint32Array(buffer, 12 * count, count);
+  const doy = new Uint16Array(buffer, 16 * count, count);
+  const minute = new Uint16Array(buffer, 18 * count, count);
+  const country = new Uint8Array(buffer, 20 * count, count);
+
+  for (let i = 0; i < count; i++) {
+    const d = new Date(Date.UTC(year, 0, doy[i]));
+    // Local noon when the time is unknown, so the date doesn't shift across timezones
+    const time = minute[i] === NO_TIME
+      ? '12:00:00'
+      : `${pad(Math.floor(minute[i] / 60), 2)}:${pad(minute[i] % 60, 2)}:00`;
+    out.push({
+      id: ids[i],
+      latitude: lat[i],
+      longitude: lng[i],
+      shape: shape || null,
+      occurred: `${pad(year, 4)}-${pad(d.getUTCMonth() + 1, 2)}-${pad(d.getUTCDate(), 2)}T${time}`,
+      location: locations[loc[i]] || null,
+      country_code: countries[country[i]] || null,
+    });
+  }
+}
+
+/**
+ * Load a year's points (optionally one shape) from the static packs.
+ * Returns null when there is no pack for the year, so callers can fall back
+ * to /api/sightings.
+ */
+export async function loadYearPack(year: number, shape?: string): Promise<MapPoint[] | null> {
+  if (typeof DecompressionStream === 'undefined') return null;
+  const manifest = await loadManifest();
+  const entry = manifest?.years[String(year)];
+  if (!manifest || !entry) return null;
+
+  const url = `${PACK_BASE}/${entry.file}`;
+  const wanted = shape && shape !== 'All'
+    ? Object.entries(entry.shapes).filter(([name]) => name === shape)
+    : Object.entries(entry.shapes);
+  if (!wanted.length) return [];
+
+  // One request for the whole year; single-shape views read just their member
+  const whole = wanted.length > 1 ? await fetchRange(url, 0, entry.bytes) : null;
+  const slice = (offset: number, length: number) =>
+    whole ? Promise.resolve(whole.subarray(offset, offset + length)) : fetchRange(url, offset, length);
+
+  const [locOffset, locLength] = entry.locations;
+  const locations: string[] = JSON.parse(
+    new TextDecoder().decode(await gunzip(await slice(locOffset, locLength)))
+  );
+
+  const points: MapPoint[] = [];
+  for (const [name, [offset, length, count]] of wanted) {
+    const buffer = await gunzip(await slice(offset, length));
+    decodeShape(buffer, count, year, name, locations, manifest.countries, points);
+  }
+  return points;
+}
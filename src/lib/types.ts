@@ -28,6 +28,7 @@ export interface MapPoint {
   shape: string | null;
   occurred: string | null;
   location: string | null;
+  country_code?: string | null; // ISO-2 from country_attribution.py, 'ZZ' if outside every country
 }
 
 export interface YearCount {
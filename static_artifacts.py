@@ -0,0 +1,102 @@
+"""
+Signal 626 - Per-year static artifacts
+=======================================
+
+Shared build loop for the files served from public/ that hold one binary per
+year plus a manifest (export_point_packs.py, cluster_index.py,
+heatmap_grids.py):
+
+    {year}.bin      the year's artifact, built by the calling script
+    manifest.json   version, build parameters, and per year its file, build
+                    timestamp, count, bytes, sha1 and member offsets
+
+A manifest built with another version or other parameters is discarded, so
+every year is rebuilt. Years whose bytes come out identical are not
+rewritten; years that no longer have points are removed. Files are replaced
+atomically, so the site never serves a half-written year.
+
+Usage:
+    manifest = load_manifest(out_dir, VERSION, {'radius': radius})
+    counts = build_years(out_dir, manifest, split_years(points), years, build, 'built_at')
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rollup_stats import changed_years, utc_now
+from sighting_points import Points
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def write_atomic(path: str, data: bytes):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load_manifest(out_dir: str, version: int, params: dict) -> dict:
+    """The manifest in out_dir if it matches version and params, else a fresh one."""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == version and all(manifest.get(k) == v for k, v in params.items()):
+            return manifest
+        logger.warning(f"{path} was built with a different version or parameters, rebuilding every year")
+    return {'version': version, **params, 'years': {}}
+
+
+def changed_since_build(client, manifest: dict, stamp_key: str) -> List[int]:
+    """Years whose rollup was refreshed after the manifest last built them (see changed_years)."""
+    return changed_years(client, {int(y): entry[stamp_key] for y, entry in manifest['years'].items()})
+
+
+def build_years(out_dir: str, manifest: dict, groups: Dict[int, Points], years: Optional[List[int]],
+                build: Callable[[Points], Tuple[bytes, dict]], stamp_key: str) -> Dict[str, float]:
+    """Build, skip or remove each year in scope, then write the manifest.
+
+    Scope is the given years, or (None) every year with points plus every
+    year already in the manifest. build returns a year's bytes and its
+    manifest entry (which must include 'sha1'); stamp_key names the entry's
+    build timestamp. Returns counts of years written / unchanged / removed,
+    total bytes and the seconds spent in build.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    started = utc_now()
+    scope = set(groups) | {int(y) for y in manifest['years']} if years is None else set(years)
+
+    counts = {'written': 0, 'unchanged': 0, 'removed': 0, 'bytes': 0, 'seconds': 0.0}
+    for year in sorted(scope):
+        key = str(year)
+        path = os.path.join(out_dir, f"{year}.bin")
+        old = manifest['years'].get(key)
+        if year not in groups:
+            if old is not None:
+                del manifest['years'][key]
+                if os.path.exists(path):
+                    os.remove(path)
+                counts['removed'] += 1
+            continue
+
+        start = time.perf_counter()
+        blob, meta = build(groups[year])
+        counts['seconds'] += time.perf_counter() - start
+        counts['bytes'] += len(blob)
+        if old and old.get('sha1') == meta['sha1'] and os.path.exists(path):
+            counts['unchanged'] += 1
+        else:
+            write_atomic(path, blob)
+            counts['written'] += 1
+        manifest['years'][key] = {'file': f"{year}.bin", stamp_key: started, **meta}
+
+    manifest['generated_at'] = utc_now()
+    manifest['years'] = dict(sorted(manifest['years'].items(), key=lambda kv: int(kv[0])))
+    write_atomic(os.path.join(out_dir, MANIFEST_NAME), json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+    return counts
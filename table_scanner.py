@@ -0,0 +1,173 @@
+"""
+Signal 626 - Partitioned table scanner
+=======================================
+
+Reads nuforc_sightings by primary key instead of OFFSET. The id space is cut
+into partitions and each partition is paged by keyset:
+
+    WHERE id > last_id AND id <= partition_hi [AND filters] ORDER BY id LIMIT n
+
+Every page is one index range scan however deep into the table it is, and
+rows that change underneath the scan can't shift later pages, so no row is
+returned twice. Several partitions are fetched concurrently by worker
+threads; results are handed over through a bounded queue, so a slow consumer
+holds back the fetchers instead of buffering the whole table.
+
+Usage:
+    scanner = TableScanner(client, 'id, location',
+                           filters=lambda q: q.is_('latitude', 'null'))
+    for row in scanner:
+        ...
+"""
+
+import logging
+import queue
+import threading
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000  # Supabase default max rows per request
+
+
+class Page(NamedTuple):
+    """All matching rows with lo < id <= hi, in id order."""
+    lo: int
+    hi: int
+    rows: list
+
+
+class _Done:
+    pass
+
+
+class TableScanner:
+    """Concurrent keyset scan over the id column of a table."""
+
+    def __init__(self, client, columns: str = '*', filters: Optional[Callable] = None,
+                 table: str = 'nuforc_sightings', page_size: int = PAGE_SIZE,
+                 workers: int = 4, partitions: Optional[int] = None,
+                 id_range: Optional[Tuple[int, int]] = None, prefetch: Optional[int] = None,
+                 after: Optional[int] = None):
+        """
+        Args:
+            client: Supabase client.
+            columns: Columns to select; 'id' is added if missing.
+            filters: Applied to every page query, e.g.
+                ``lambda q: q.is_('latitude', 'null')``.
+            page_size: Rows per request.
+            workers: Partitions fetched concurrently.
+            partitions: Number of id ranges (default 4 per worker, so a
+                sparse range doesn't leave the others idle).
+            id_range: (lo, hi] to scan instead of the table's full id span.
+            prefetch: Pages buffered ahead of the consumer (default 2 per worker).
+            after: Only scan ids above this (e.g. a resume checkpoint).
+        """
+        if columns != '*' and 'id' not in [c.strip() for c in columns.split(',')]:
+            columns = 'id, ' + columns
+        self.client = client
+        self.columns = columns
+        self.filters = filters
+        self.table = table
+        self.page_size = page_size
+        self.workers = max(1, workers)
+        self.partitions = partitions or self.workers * 4
+        self.id_range = id_range
+        self.prefetch = prefetch or self.workers * 2
+        self.after = after
+
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        """Return (lo, hi] covering every id to scan, or None if there are none."""
+        if self.id_range:
+            lo, hi = self.id_range
+        else:
+            first = self.client.table(self.table).select('id').order('id').limit(1).execute()
+            if not first.data:
+                return None
+            last = self.client.table(self.table).select('id').order('id', desc=True).limit(1).execute()
+            lo, hi = first.data[0]['id'] - 1, last.data[0]['id']
+        if self.after is not None:
+            lo = max(lo, self.after)
+        return (lo, hi) if lo < hi else None
+
+    def split(self, lo: int, hi: int) -> List[Tuple[int, int]]:
+        """Cut (lo, hi] into up to self.partitions contiguous ranges."""
+        count = max(1, min(self.partitions, hi - lo))
+        step = -(-(hi - lo) // count)
+        return [(start, min(start + step, hi)) for start in range(lo, hi, step)]
+
+    def scan_range(self, lo: int, hi: int) -> Iterator[Page]:
+        """Page through (lo, hi] sequentially."""
+        last = lo
+        while last < hi:
+            query = self.client.table(self.table).select(self.columns)
+            if self.filters:
+                query = self.filters(query)
+            rows = query.gt('id', last).lte('id', hi).order('id').limit(self.page_size).execute().data or []
+            if len(rows) < self.page_size:
+                yield Page(last, hi, rows)
+                return
+            yield Page(last, rows[-1]['id'], rows)
+            last = rows[-1]['id']
+
+    def pages(self, bounds: Optional[Tuple[int, int]] = None) -> Iterator[Page]:
+        """Yield pages from all partitions as they arrive (not in id order).
+
+        Together the pages cover ``bounds`` (default self.bounds()) exactly.
+        """
+        bounds = bounds or self.bounds()
+        if bounds is None:
+            return
+        ranges = queue.Queue()
+        for r in self.split(*bounds):
+            ranges.put(r)
+
+        out = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker():
+            try:
+                while not stop.is_set():
+                    try:
+                        lo, hi = ranges.get_nowait()
+                    except queue.Empty:
+                        break
+                    for page in self.scan_range(lo, hi):
+                        if not put(page):
+                            return
+            except Exception as e:
+                put(e)
+            finally:
+                put(_Done)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+
+        running = len(threads)
+        try:
+            while running:
+                item = out.get()
+                if item is _Done:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+
+    def __iter__(self) -> Iterator[dict]:
+        for page in self.pages():
+            yield from page.rows
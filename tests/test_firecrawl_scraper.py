@@ -0,0 +1,75 @@
+"""Failure paths of FirecrawlScraperV2.fetch_one (no network, no Supabase)."""
+
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The scraper imports the Firecrawl SDK at module level; only fetch_one's
+# handling of its results is exercised here
+if 'firecrawl' not in sys.modules:
+    try:
+        import firecrawl  # noqa: F401
+    except ImportError:
+        sys.modules['firecrawl'] = types.SimpleNamespace(Firecrawl=object)
+
+import firecrawl_scraper_v2  # noqa: E402
+
+
+class FakeFirecrawl:
+    def __init__(self, markdown=None, error=None):
+        self.markdown = markdown
+        self.error = error
+
+    def scrape(self, url):
+        if self.error:
+            raise self.error
+        return types.SimpleNamespace(markdown=self.markdown)
+
+
+def make_scraper(firecrawl) -> firecrawl_scraper_v2.FirecrawlScraperV2:
+    scraper = firecrawl_scraper_v2.FirecrawlScraperV2.__new__(firecrawl_scraper_v2.FirecrawlScraperV2)
+    scraper.firecrawl = firecrawl
+    scraper.scraped_ids = set()
+    scraper.failed_ids = set()
+    scraper.ids_lock = threading.Lock()
+    scraper.success = 0
+    scraper.blocked = 0
+    return scraper
+
+
+def fetch_with_timeout(scraper, sighting_id, timeout=5.0):
+    """Run fetch_one in a thread so a deadlock fails the test instead of hanging it."""
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(record=scraper.fetch_one(sighting_id)), daemon=True)
+    worker.start()
+    worker.join(timeout)
+    assert not worker.is_alive(), 'fetch_one did not return (deadlock?)'
+    return result['record']
+
+
+@pytest.mark.parametrize('firecrawl, blocked', [
+    (FakeFirecrawl(markdown='Access denied by Wordfence'), 1),
+    (FakeFirecrawl(markdown=None), 0),
+    (FakeFirecrawl(error=RuntimeError('HTTP 500')), 0),
+])
+def test_fetch_failure_marks_id_failed(firecrawl, blocked):
+    scraper = make_scraper(firecrawl)
+    assert fetch_with_timeout(scraper, 4242) is None
+    assert scraper.failed_ids == {4242}
+    assert scraper.blocked == blocked
+    assert scraper.success == 0
+
+
+def test_unparseable_page_marks_id_failed(monkeypatch):
+    monkeypatch.setattr(firecrawl_scraper_v2, 'parse_markdown', lambda sighting_id, markdown: None)
+    scraper = make_scraper(FakeFirecrawl(markdown='# Not a sighting page'))
+    assert fetch_with_timeout(scraper, 7) is None
+    assert scraper.failed_ids == {7}
+    # The lock is released again, so a later failure can be recorded too
+    assert fetch_with_timeout(scraper, 8) is None
+    assert scraper.failed_ids == {7, 8}
@@ -0,0 +1,236 @@
+"""
+Signal 626 - Concurrent batch upsert writer
+============================================
+
+Shared write path for the geocoders, the Hugging Face importer and the
+Firecrawl scraper. Rows from any producer are collected into batches and up
+to `in_flight` batches are upserted at once on a thread pool. Every request
+goes through the one Supabase client, whose HTTP session keeps its
+connections alive, so concurrent batches reuse pooled connections instead of
+reconnecting. add() blocks while all slots are busy, so a fast producer
+can't queue unbounded work.
+
+A failed batch is never dropped wholesale or retried row by row:
+
+    transient errors   (HTTP 429/5xx, serialization failure, deadlock, too
+                        many connections, network errors) are retried with
+                        jittered exponential backoff
+    other errors       the batch is split in half and each half retried
+                        (a statement timeout often clears at half the size);
+                        a bad row is isolated in O(log n) extra requests;
+                        rows that fail on their own are appended to a
+                        dead-letter JSONL file with the error text
+
+Usage:
+    with BatchWriter(client, batch_size=500, in_flight=8) as writer:
+        for row in rows:
+            writer.add(row)
+    logger.info(writer.stats.summary())
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Iterable, List, Optional
+
+try:
+    import httpx
+    _TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+except ImportError:
+    _TRANSPORT_ERRORS = (ConnectionError, TimeoutError)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEAD_LETTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dead_letter.jsonl')
+
+# HTTP statuses and Postgres SQLSTATEs worth retrying unchanged:
+# serialization_failure, deadlock_detected, too_many_connections
+TRANSIENT_CODES = {'429', '500', '502', '503', '504', '40001', '40P01', '53300'}
+
+
+def is_transient(error: Exception) -> bool:
+    """True if retrying the same request later can succeed."""
+    if isinstance(error, _TRANSPORT_ERRORS):
+        return True
+    # postgrest.APIError carries the SQLSTATE, or the HTTP status when the
+    # body wasn't JSON (e.g. a gateway 502)
+    return str(getattr(error, 'code', '')) in TRANSIENT_CODES
+
+
+class WriterStats:
+    """Row counts and per-batch latencies (seconds)."""
+
+    def __init__(self):
+        self.batches = 0
+        self.rows = 0
+        self.failed_rows = 0
+        self.retries = 0
+        self.splits = 0
+        self.latencies: List[float] = []
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self) -> str:
+        return (f"{self.rows:,} rows in {self.batches} batches, {self.failed_rows} failed "
+                f"({self.retries} retries, {self.splits} splits) | "
+                f"batch latency p50 {1000 * self.percentile(50):.0f} ms, "
+                f"p99 {1000 * self.percentile(99):.0f} ms")
+
+
+class BatchWriter:
+    """Upsert rows in batches with several batches in flight."""
+
+    def __init__(self, client, table: str = 'nuforc_sightings', batch_size: int = 500,
+                 in_flight: int = 8, on_conflict: str = 'id',
+                 on_written: Optional[Callable[[list], None]] = None,
+                 on_rejected: Optional[Callable[[list], None]] = None,
+                 dead_letter: Optional[str] = DEFAULT_DEAD_LETTER_PATH,
+                 max_retries: int = 5, backoff: float = 0.5, max_backoff: float = 30.0):
+        """
+        Args:
+            client: Supabase client (shared by all writer threads).
+            batch_size: Rows per upsert request.
+            in_flight: Max batches being written at once.
+            on_written: Called from a writer thread with the rows of each
+                batch that were stored.
+            on_rejected: Called with rows given up on (after they are
+                dead-lettered).
+            dead_letter: JSONL file receiving rows that can't be written
+                (None to only log them).
+            max_retries: Attempts per request on transient errors.
+            backoff: Base delay (seconds), doubled per attempt up to
+                max_backoff, with full jitter.
+        """
+        self.client = client
+        self.table = table
+        self.batch_size = batch_size
+        self.on_conflict = on_conflict
+        self.on_written = on_written
+        self.on_rejected = on_rejected
+        self.dead_letter = dead_letter
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = WriterStats()
+        self.dead_letter_lock = threading.Lock()
+
+        self.pool = ThreadPoolExecutor(max_workers=max(1, in_flight), thread_name_prefix='upsert')
+        self.slots = threading.BoundedSemaphore(max(1, in_flight))
+        self.lock = threading.Lock()
+        self.pending: list = []
+        self.futures = set()
+
+    def add(self, row: dict):
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) < self.batch_size:
+                return
+            batch, self.pending = self.pending, []
+        self._submit(batch)
+
+    def add_many(self, rows: Iterable[dict]):
+        for row in rows:
+            self.add(row)
+
+    def flush(self):
+        """Send the partial batch and wait until everything added so far is written."""
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if batch:
+            self._submit(batch)
+        with self.lock:
+            futures = list(self.futures)
+        wait(futures)
+
+    def close(self):
+        self.flush()
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _submit(self, batch: list):
+        self.slots.acquire()
+        future = self.pool.submit(self._write, batch)
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(self._done)
+
+    def _done(self, future):
+        with self.lock:
+            self.futures.discard(future)
+        self.slots.release()
+        if future.exception():
+            logger.error(f"Writer thread error: {future.exception()}")
+
+    def _upsert(self, rows: list):
+        self.client.table(self.table).upsert(rows, on_conflict=self.on_conflict).execute()
+
+    def _upsert_with_retry(self, rows: list):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._upsert(rows)
+                return
+            except Exception as e:
+                if attempt == self.max_retries or not is_transient(e):
+                    raise
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                logger.warning(f"Transient upsert error ({len(rows)} rows), retry {attempt + 1} "
+                               f"in {delay:.1f}s: {e}")
+                with self.lock:
+                    self.stats.retries += 1
+                time.sleep(delay)
+
+    def _write_bisect(self, rows: list) -> list:
+        """Write rows, splitting on failure. Returns the rows that were stored."""
+        try:
+            self._upsert_with_retry(rows)
+            return rows
+        except Exception as e:
+            if is_transient(e):
+                # Still failing after backoff: splitting won't help
+                logger.error(f"Upsert failed after {self.max_retries} retries ({len(rows)} rows): {e}")
+                self._reject(rows, e)
+                return []
+            if len(rows) == 1:
+                logger.error(f"Rejected row {rows[0].get('id')}: {e}")
+                self._reject(rows, e)
+                return []
+            with self.lock:
+                self.stats.splits += 1
+            mid = len(rows) // 2
+            return self._write_bisect(rows[:mid]) + self._write_bisect(rows[mid:])
+
+    def _reject(self, rows: list, error: Exception):
+        if self.dead_letter:
+            now = time.strftime('%Y-%m-%dT%H:%M:%S')
+            with self.dead_letter_lock, open(self.dead_letter, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({'table': self.table, 'error': str(error), 'at': now, 'row': row},
+                                       default=str) + '\n')
+        if self.on_rejected:
+            self.on_rejected(rows)
+
+    def _write(self, batch: list):
+        start = time.perf_counter()
+        written = self._write_bisect(batch)
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.stats.batches += 1
+            self.stats.rows += len(written)
+            self.stats.failed_rows += len(batch) - len(written)
+            self.stats.latencies.append(elapsed)
+        if self.on_written and written:
+            self.on_written(written)